@@ -14,7 +14,7 @@ import json
 import random
 import tempfile
 import io
-from typing import List, AsyncGenerator, Tuple, Optional, Dict, Any
+from typing import List, AsyncGenerator, Callable, Tuple, Optional, Dict, Any
 from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
@@ -29,12 +29,16 @@ from groq import Groq, AsyncGroq
 from openai import AsyncOpenAI
 
 from .config import config
+from .llm_cache import LLMResponseCache
+from .token_budget import get_token_packer
 from .prompts import (
     prompts as ds_prompts,  # daily_standup prompt helper (original name: prompts)
     # weekly_interview prompt helpers:
-    build_stage_prompt, build_conversation_prompt, build_evaluation_prompt,
+    build_stage_prompt, build_conversation_prompt, build_evaluation_prompt, build_round_digest_prompt,
+    build_stage_evaluation_prompt,
     ACKNOWLEDGMENT_PHRASES, TRANSITION_PHRASES, ENCOURAGEMENT_PHRASES,
     CLARIFICATION_PROMPTS, GENTLE_REDIRECT_PROMPTS, SCORING_PROMPT_TEMPLATE,
+    STRUCTURED_EVALUATION_INSTRUCTIONS,
     # weekend_mocktest templates:
     PromptTemplates
 )
@@ -77,6 +81,16 @@ def _ds_parse_summary_into_fragments(summary: str) -> Dict[str, str]:
     return fragments
 
 
+def _ds_parse_base_questions(text: str) -> List[str]:
+    """Numbered questions from a base_questions_prompt reply"""
+    questions = []
+    for line in text.split('\n'):
+        match = re.match(r'^\s*\d+[.)]\s*(.+)', line)
+        if match and match.group(1).strip():
+            questions.append(match.group(1).strip().strip('"'))
+    return questions
+
+
 class DS_SessionStage(Enum):
     GREETING = "greeting"
     TECHNICAL = "technical"
@@ -196,13 +210,15 @@ class DS_FragmentManager:
     def __init__(self, client_manager: DS_SharedClientManager, session_data: DS_SessionData):
         self.client_manager = client_manager
         self.session_data = session_data
+        self.snapshot = None
 
     @property
     def openai_client(self):
         return self.client_manager.openai_client
 
-    def initialize_fragments(self, summary: str) -> bool:
-        self.session_data.fragments = _ds_parse_summary_into_fragments(summary)
+    def initialize_fragments(self, summary: str, fragments: Optional[Dict[str, str]] = None) -> bool:
+        # Pre-parsed fragments come from a shared summary snapshot; copy so the session owns its dict
+        self.session_data.fragments = dict(fragments) if fragments is not None else _ds_parse_summary_into_fragments(summary)
         self.session_data.fragment_keys = list(self.session_data.fragments.keys())
         self.session_data.concept_question_counts = {k: 0 for k in self.session_data.fragment_keys}
         self.session_data.questions_per_concept = max(
@@ -214,6 +230,13 @@ class DS_FragmentManager:
                     f"target {self.session_data.questions_per_concept}/concept")
         return True
 
+    def initialize_from_snapshot(self, snapshot) -> bool:
+        """Initialize from a SummarySnapshot, parsing the summary once per snapshot version"""
+        self.snapshot = snapshot
+        return self.initialize_fragments(
+            snapshot.data, snapshot.derive("ds_fragments", _ds_parse_summary_into_fragments)
+        )
+
     def get_active_fragment(self) -> Tuple[str, str]:
         if not self.session_data.fragment_keys:
             return "General", self.session_data.fragments.get("General", "No content available")
@@ -247,6 +270,19 @@ class DS_FragmentManager:
                 return False
         return True
 
+    def get_base_questions(self, concept: str) -> List[str]:
+        """Pre-generated questions for a concept, once the background job has attached them"""
+        if self.snapshot is None:
+            return []
+        return self.snapshot.get_derived("ds_base_questions", {}).get(concept, [])
+
+    def get_opening_question(self, concept: str) -> Optional[str]:
+        """A pre-generated question if nothing has been asked on this concept yet"""
+        if self.session_data.concept_question_counts.get(concept, 0) > 0:
+            return None
+        questions = self.get_base_questions(concept)
+        return random.choice(questions) if questions else None
+
     def get_concept_conversation_history(self, concept: str, window_size: int = 5) -> str:
         entries = [ex for ex in reversed(self.session_data.exchanges) if ex.concept == concept and ex.user_response]
         last_entries = list(reversed(entries[:window_size]))
@@ -347,6 +383,56 @@ class DS_OptimizedConversationManager:
     def openai_client(self):
         return self.client_manager.openai_client
 
+    def pregenerate_base_questions(self, snapshot) -> Optional[asyncio.Task]:
+        """Start the base-question job for a summary snapshot unless it already ran or is running"""
+        if not config.BASE_QUESTIONS_PREGENERATE:
+            return None
+        if snapshot.get_derived("ds_base_questions") is not None:
+            return None
+        task = snapshot.get_derived("ds_base_questions_task")
+        if task is None:
+            task = asyncio.create_task(self._generate_base_questions(snapshot))
+            snapshot.set_derived("ds_base_questions_task", task)
+        return task
+
+    async def _generate_base_questions(self, snapshot):
+        """
+        One base_questions_prompt call per fragment, in parallel; attached to the snapshot.
+        If nothing was generated, the task entry is cleared so a later session retries.
+        """
+        try:
+            return await self._run_base_questions(snapshot)
+        except Exception as e:
+            logger.warning(f"[DS] Base question pre-generation failed: {e}")
+            return {}
+        finally:
+            if snapshot.get_derived("ds_base_questions") is None:
+                snapshot.set_derived("ds_base_questions_task", None)
+
+    async def _run_base_questions(self, snapshot):
+        fragments = snapshot.derive("ds_fragments", _ds_parse_summary_into_fragments)
+        loop = asyncio.get_event_loop()
+        start = time.time()
+
+        async def generate(concept: str, content: str) -> Tuple[str, List[str]]:
+            try:
+                text = await loop.run_in_executor(
+                    ds_shared_clients.executor, self._sync_openai_call, ds_prompts.base_questions_prompt(content)
+                )
+                return concept, _ds_parse_base_questions(text)
+            except Exception as e:
+                logger.warning(f"[DS] Base questions failed for '{concept}': {e}")
+                return concept, []
+
+        results = await asyncio.gather(*(generate(c, content) for c, content in fragments.items()))
+        base_questions = {concept: questions for concept, questions in results if questions}
+        if not base_questions:
+            raise Exception(f"no base questions generated for {len(fragments)} concepts")
+        snapshot.set_derived("ds_base_questions", base_questions)
+        logger.info(f"[DS] Pre-generated base questions for {len(base_questions)}/{len(fragments)} concepts "
+                    f"in {time.time() - start:.1f}s")
+        return base_questions
+
     def _sync_openai_call(self, prompt: str) -> str:
         try:
             resp = self.openai_client.chat.completions.create(
@@ -389,6 +475,13 @@ class DS_OptimizedConversationManager:
                     return await loop.run_in_executor(ds_shared_clients.executor, self._sync_openai_call, prompt)
 
                 current_concept_title, current_concept_content = fm.get_active_fragment()
+
+                # First question on a concept comes from the pre-generated set: no LLM call
+                opening_question = fm.get_opening_question(current_concept_title)
+                if opening_question:
+                    fm.add_question(opening_question, current_concept_title, False)
+                    return opening_question
+
                 history = fm.get_concept_conversation_history(current_concept_title)
                 last_q = session_data.exchanges[-1].ai_message if session_data.exchanges else ""
                 questions_for_concept = session_data.concept_question_counts.get(current_concept_title, 0)
@@ -400,7 +493,8 @@ class DS_OptimizedConversationManager:
                     previous_question=last_q,
                     user_response=user_input,
                     current_question_number=session_data.question_index + 1,
-                    questions_for_concept=questions_for_concept
+                    questions_for_concept=questions_for_concept,
+                    planned_questions=fm.get_base_questions(current_concept_title)
                 )
                 loop = asyncio.get_event_loop()
                 response = await loop.run_in_executor(ds_shared_clients.executor, self._sync_openai_call, prompt)
@@ -530,6 +624,14 @@ class WI_InterviewSession:
     concept_question_counts: Dict[str, int] = field(default_factory=dict)
     followup_questions: int = 0
 
+    # Rolling round digests: stage -> {"text": digest, "covered": answered exchanges summarized}
+    round_digests: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    digest_tasks: Dict[str, Any] = field(default_factory=dict)
+
+    # Partial evaluations: stage -> {"notes": str, "scores": {...}, "covered": answered exchanges}
+    stage_evaluations: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    stage_eval_tasks: Dict[str, Any] = field(default_factory=dict)
+
     def add_exchange(self, ai_message: str, user_response: str = "", quality: float = 0.0,
                      concept: str = "", is_followup: bool = False):
         ex = WI_ConversationExchange(
@@ -565,6 +667,38 @@ class WI_InterviewSession:
                 parts.append(f"Candidate: {ex.user_response}")
         return "\n".join(parts)
 
+    def get_round_exchanges(self, stage: str, answered_only: bool = True) -> List[WI_ConversationExchange]:
+        return [ex for ex in self.exchanges
+                if ex.stage.value == stage and (ex.user_response or not answered_only)]
+
+    def get_compact_history(self, limit: int = 5) -> str:
+        """Round digests followed by the last few raw turns"""
+        digests = [
+            f"{stage.title()} round summary: {self.round_digests[stage]['text']}"
+            for stage in config.ROUND_NAMES if stage in self.round_digests
+        ]
+        recent = self.get_conversation_history(limit)
+        return "\n".join(digests + [recent]) if digests else recent
+
+    def get_compact_log(self, include_stage_notes: bool = False) -> str:
+        """Evaluation log: digests (or stage notes) for finished rounds, raw exchanges for everything they don't cover"""
+        parts = []
+        for stage in config.ROUND_NAMES:
+            answered = self.get_round_exchanges(stage)
+            notes = self.stage_evaluations.get(stage) if include_stage_notes else None
+            digest = self.round_digests.get(stage)
+            if notes:
+                parts.append(f"[{stage.upper()} ROUND NOTES] {notes['notes']}\n")
+                answered = answered[notes["covered"]:]
+            elif digest:
+                parts.append(f"[{stage.upper()} ROUND SUMMARY] {digest['text']}\n")
+                answered = answered[digest["covered"]:]
+            parts.extend(
+                f"[{stage.upper()}] Interviewer: {ex.ai_message}\nCandidate: {ex.user_response}\n"
+                for ex in answered
+            )
+        return "\n".join(parts)
+
 
 class WI_SharedClientManager:
     """Weekly-interview async clients (OpenAI + Groq)"""
@@ -600,6 +734,50 @@ class WI_SharedClientManager:
 # global WI shared clients
 wi_shared_clients = WI_SharedClientManager()
 
+# Opt-in cache for the deterministic (low temperature) evaluation calls.
+# Built on first use: the optional Redis tier connects (and pings) when constructed.
+_wi_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_wi_response_cache() -> Optional[LLMResponseCache]:
+    """Weekly interview response cache, or None when LLM_CACHE_ENABLED is off"""
+    global _wi_response_cache
+    if _wi_response_cache is None and config.LLM_CACHE_ENABLED:
+        _wi_response_cache = LLMResponseCache(
+            namespace="weekly_interview",
+            max_entries=config.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=config.LLM_CACHE_TTL_SECONDS,
+            redis_url=config.LLM_CACHE_REDIS_URL or None
+        )
+    return _wi_response_cache
+
+
+async def _wi_cached_completion(client: AsyncOpenAI, cacheable_finish: bool = True,
+                                usable: Optional[Callable[[str], bool]] = None, **request: Any) -> str:
+    """
+    chat.completions.create through the response cache. Truncated replies, and
+    replies that usable(content) rejects (the caller could not parse them), are
+    not cached.
+    """
+    async def _call() -> Dict[str, str]:
+        resp = await client.chat.completions.create(**request)
+        choice = resp.choices[0]
+        return {"content": choice.message.content or "", "finish_reason": choice.finish_reason or ""}
+
+    cache = get_wi_response_cache()
+    if cache is None:
+        return (await _call())["content"]
+    key = cache.make_key(
+        request["model"], request["messages"], request.get("temperature"), request.get("max_tokens"),
+        response_format=request.get("response_format")
+    )
+    result = await cache.aget_or_call(
+        key, _call,
+        cacheable=lambda r: (bool(r["content"]) and (not cacheable_finish or r["finish_reason"] == "stop")
+                             and (usable is None or usable(r["content"])))
+    )
+    return result["content"]
+
 import time
 from typing import Dict, Optional, Any, List
 from core.config import config  # unified config
@@ -607,6 +785,15 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+def _wi_fragment_content(summaries) -> Tuple[str, ...]:
+    """Summary texts long enough to become interview fragments"""
+    all_content: List[str] = []
+    for summary in summaries:
+        content = summary.get("summary", "")
+        if content and len(content) > config.MIN_CONTENT_LENGTH:
+            all_content.append(content)
+    return tuple(all_content)
+
 class WI_EnhancedInterviewFragmentManager:
     """Simplified fragment manager for interview content (WI version; same behavior as old weekly-interview)"""
 
@@ -616,18 +803,14 @@ class WI_EnhancedInterviewFragmentManager:
         self.fragments: Dict[str, Dict[str, Any]] = {}
         self.used_concepts = set()  # kept for parity; not strictly used by the flow
 
-    def initialize_fragments(self, summaries: List[Dict[str, Any]]) -> bool:
+    def initialize_fragments(self, summaries: List[Dict[str, Any]], contents: Optional[Tuple[str, ...]] = None) -> bool:
         """Initialize fragments from 7-day summaries"""
         try:
             if not summaries:
                 return False
 
             # Process summaries into fragments (identical to old weekly-interview)
-            all_content: List[str] = []
-            for summary in summaries:
-                content = summary.get("summary", "")
-                if content and len(content) > config.MIN_CONTENT_LENGTH:
-                    all_content.append(content)
+            all_content = list(contents if contents is not None else _wi_fragment_content(summaries))
 
             if not all_content:
                 return False
@@ -652,6 +835,10 @@ class WI_EnhancedInterviewFragmentManager:
             logger.error(f"[WI] Fragment initialization failed: {e}")
             return False
 
+    def initialize_from_snapshot(self, snapshot) -> bool:
+        """Initialize from a SummarySnapshot, filtering fragment content once per snapshot version"""
+        return self.initialize_fragments(snapshot.data, snapshot.derive("wi_fragment_content", _wi_fragment_content))
+
     def get_next_concept(self, stage: WI_InterviewStage) -> Optional[str]:
         """Get next concept for questioning (same round-robin selection as old)"""
         try:
@@ -735,10 +922,252 @@ class WI_OptimizedAudioProcessor:
             raise Exception(f"Audio transcription failed: {e}")
 
 
+class WI_RoundSummarizer:
+    """Compresses each finished interview round into a short digest in the background"""
+    def __init__(self, client_manager: WI_SharedClientManager):
+        self.client_manager = client_manager
+
+    def schedule(self, session: WI_InterviewSession, stage: WI_InterviewStage):
+        if stage.value in session.round_digests or stage.value in session.digest_tasks:
+            return
+        session.digest_tasks[stage.value] = asyncio.create_task(self.summarize_round(session, stage))
+
+    async def summarize_round(self, session: WI_InterviewSession, stage: WI_InterviewStage) -> Optional[str]:
+        try:
+            answered = session.get_round_exchanges(stage.value)
+            if not answered:
+                return None
+            round_log = "\n".join(
+                f"Interviewer: {ex.ai_message}\nCandidate: {ex.user_response}" for ex in answered
+            )
+            await self.client_manager.initialize()
+            resp = await self.client_manager.openai_client.chat.completions.create(
+                model=config.OPENAI_MODEL,
+                messages=[{"role": "user", "content": build_round_digest_prompt(stage.value, round_log)}],
+                temperature=0.1,
+                max_tokens=config.ROUND_DIGEST_MAX_TOKENS
+            )
+            digest = (resp.choices[0].message.content or "").strip()
+            if not digest:
+                raise Exception("OpenAI returned empty digest")
+            session.round_digests[stage.value] = {"text": digest, "covered": len(answered)}
+            logger.info(f"[WI] Session {session.session_id}: {stage.value} round digested "
+                        f"({len(answered)} exchanges -> {len(digest)} chars)")
+            return digest
+        except Exception as e:
+            # Raw exchanges stay in use for this round
+            logger.warning(f"[WI] Round digest failed for {stage.value}: {e}")
+            return None
+        finally:
+            session.digest_tasks.pop(stage.value, None)
+
+
+_WI_SCORE_KEYS = ["technical_score", "communication_score", "behavioral_score", "overall_score"]
+_WI_SCORES_SCHEMA = {
+    "type": "object",
+    "properties": {key: {"type": "number"} for key in _WI_SCORE_KEYS},
+    "required": list(_WI_SCORE_KEYS),
+    "additionalProperties": False,
+}
+
+
+def _wi_report_schema(text_field: str) -> Dict[str, Any]:
+    """JSON schema for a narrative field plus the four 1-10 scores"""
+    return {
+        "type": "object",
+        "properties": {text_field: {"type": "string"}, **_WI_SCORES_SCHEMA["properties"]},
+        "required": [text_field, *_WI_SCORE_KEYS],
+        "additionalProperties": False,
+    }
+
+
+def _wi_weighted_overall(scores: Dict[str, float]) -> float:
+    w = config.EVALUATION_CRITERIA
+    return round(
+        scores["technical_score"] * w["technical_weight"] +
+        scores["communication_score"] * w["communication_weight"] +
+        scores["behavioral_score"] * w["behavioral_weight"] +
+        scores["overall_score"] * w["overall_presentation"], 1
+    )
+
+
+class WI_EvaluationEngine:
+    """
+    Schema-constrained evaluation calls: one request returns the narrative and
+    the four scores together. If the scores don't parse, only the scores are
+    re-asked; a usable narrative is never regenerated.
+    """
+    def __init__(self, client_manager: WI_SharedClientManager):
+        self.client_manager = client_manager
+
+    async def _structured_call(self, messages: List[Dict[str, str]], name: str,
+                               schema: Dict[str, Any], max_tokens: int) -> str:
+        await self.client_manager.initialize()
+        return await _wi_cached_completion(
+            self.client_manager.openai_client,
+            model=config.OPENAI_MODEL,
+            messages=messages,
+            temperature=0.1,
+            max_tokens=max_tokens,
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": name, "strict": True, "schema": schema},
+            },
+            # Replies that need the recovery/re-ask paths are never cached
+            usable=self._has_valid_scores
+        )
+
+    @classmethod
+    def _has_valid_scores(cls, raw: str) -> bool:
+        try:
+            data = json.loads(raw)
+            if not isinstance(data, dict):
+                return False
+            cls._validate_scores(data)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _validate_scores(data: Dict[str, Any]) -> Dict[str, float]:
+        scores: Dict[str, float] = {}
+        for key in _WI_SCORE_KEYS:
+            val = data.get(key)
+            if not isinstance(val, (int, float)):
+                raise Exception(f"Missing {key} in structured scores")
+            if not (0 <= val <= 10):
+                raise Exception(f"Invalid value for {key}: {val}")
+            scores[key] = float(val)
+        return scores
+
+    @staticmethod
+    def _recover_text(raw: str, text_field: str) -> str:
+        """Salvage the narrative from a truncated/malformed JSON reply"""
+        m = re.search(rf'"{text_field}"\s*:\s*"((?:[^"\\]|\\.)*)', raw, re.DOTALL)
+        if not m:
+            return ""
+        try:
+            return json.loads(f'"{m.group(1)}"').strip()
+        except ValueError:
+            return m.group(1).replace("\\n", "\n").strip()
+
+    async def score_only(self, transcript: str) -> Dict[str, float]:
+        """Targeted re-ask: scores only, no narrative"""
+        transcript = get_token_packer().pack(
+            "evaluation", {"conversation_log": transcript}, keep={"conversation_log": "tail"}
+        )["conversation_log"]
+        raw = await self._structured_call(
+            [
+                {"role": "system", "content": "You are scoring an interview on a 1-10 scale."},
+                {"role": "user", "content": f"{SCORING_PROMPT_TEMPLATE}\n\nConversation:\n{transcript}"}
+            ],
+            name="interview_scores",
+            schema=_WI_SCORES_SCHEMA,
+            max_tokens=100
+        )
+        try:
+            return self._validate_scores(json.loads(raw))
+        except ValueError as e:
+            raise Exception(f"Score re-ask returned invalid JSON: {e}")
+
+    async def evaluate(self, messages: List[Dict[str, str]], text_field: str,
+                       transcript: str, max_tokens: int) -> Tuple[str, Dict[str, float]]:
+        """One structured call for narrative + scores; re-ask only the scores if they don't parse"""
+        raw = await self._structured_call(messages, f"interview_{text_field}", _wi_report_schema(text_field), max_tokens)
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            data = None
+
+        text = (data.get(text_field) or "").strip() if isinstance(data, dict) else self._recover_text(raw, text_field)
+        if not text:
+            raise Exception(f"Structured evaluation returned no {text_field}")
+        try:
+            if not isinstance(data, dict):
+                raise Exception("reply was not valid JSON")
+            scores = self._validate_scores(data)
+        except Exception as e:
+            logger.warning(f"[WI] Structured scores unusable ({e}); re-asking scores only")
+            scores = await self.score_only(transcript)
+        return text, scores
+
+
+class WI_StageEvaluator:
+    """Evaluates and scores each scored round in the background as soon as it closes; the notes also serve as its digest"""
+    def __init__(self, client_manager: WI_SharedClientManager, engine: WI_EvaluationEngine):
+        self.client_manager = client_manager
+        self.engine = engine
+
+    def schedule(self, session: WI_InterviewSession, stage: WI_InterviewStage):
+        if stage.value not in config.STAGE_SCORE_WEIGHTS:
+            return
+        if stage.value in session.stage_evaluations or stage.value in session.stage_eval_tasks:
+            return
+        session.stage_eval_tasks[stage.value] = asyncio.create_task(self.evaluate_stage(session, stage))
+
+    async def wait_pending(self, session: WI_InterviewSession):
+        pending = list(session.stage_eval_tasks.values())
+        if not pending:
+            return
+        done, not_done = await asyncio.wait(pending, timeout=config.STAGE_EVAL_WAIT_SECONDS)
+        if not_done:
+            logger.warning(f"[WI] {len(not_done)} stage evaluation(s) still running after "
+                           f"{config.STAGE_EVAL_WAIT_SECONDS}s; falling back for those rounds")
+
+    async def evaluate_stage(self, session: WI_InterviewSession, stage: WI_InterviewStage) -> Optional[Dict[str, Any]]:
+        try:
+            answered = session.get_round_exchanges(stage.value)
+            if not answered:
+                return None
+            round_log = "\n".join(
+                f"Interviewer: {ex.ai_message}\nCandidate: {ex.user_response}" for ex in answered
+            )
+            notes, scores = await self.engine.evaluate(
+                [
+                    {"role": "system", "content": "You are an experienced interviewer taking notes on one interview round."},
+                    {"role": "user", "content": build_stage_evaluation_prompt(session.student_name, stage.value, round_log)}
+                ],
+                text_field="notes",
+                transcript=round_log,
+                max_tokens=config.STAGE_EVAL_MAX_TOKENS
+            )
+            result = {"notes": notes, "scores": scores, "covered": len(answered)}
+            session.stage_evaluations[stage.value] = result
+            # The notes cover what a digest would, so scored rounds need no separate digest call
+            session.round_digests.setdefault(stage.value, {"text": notes, "covered": len(answered)})
+            logger.info(f"[WI] Session {session.session_id}: {stage.value} round evaluated ({len(answered)} exchanges)")
+            return result
+        except Exception as e:
+            logger.warning(f"[WI] Stage evaluation failed for {stage.value}: {e}")
+            return None
+        finally:
+            session.stage_eval_tasks.pop(stage.value, None)
+
+    def merge_scores(self, session: WI_InterviewSession) -> Optional[Dict[str, float]]:
+        """Weighted merge of per-round scores; None when no round was scored"""
+        available = {s: ev["scores"] for s, ev in session.stage_evaluations.items()
+                     if s in config.STAGE_SCORE_WEIGHTS}
+        if not available:
+            return None
+        merged: Dict[str, float] = {}
+        for key in _WI_SCORE_KEYS:
+            weights = {s: config.STAGE_SCORE_WEIGHTS[s].get(key, 0.0) for s in available}
+            total = sum(weights.values())
+            if total > 0:
+                value = sum(available[s][key] * w for s, w in weights.items()) / total
+            else:
+                value = sum(sc[key] for sc in available.values()) / len(available)
+            merged[key] = round(value, 1)
+        merged["weighted_overall"] = _wi_weighted_overall(merged)
+        return merged
+
+
 class WI_OptimizedConversationManager:
     """Weekly-interview natural conversation flow (async OpenAI)"""
     def __init__(self, client_manager: WI_SharedClientManager):
         self.client_manager = client_manager
+        self.evaluation_engine = WI_EvaluationEngine(client_manager)
+        self.stage_evaluator = WI_StageEvaluator(client_manager, self.evaluation_engine)
 
     def _should_ask_followup(self, user_response: str, session: WI_InterviewSession) -> bool:
         if not user_response or len(user_response.split()) < 5:
@@ -777,7 +1206,7 @@ class WI_OptimizedConversationManager:
                 next_concept = session.fragment_manager.get_next_concept(session.current_stage)
                 session.current_concept = next_concept
 
-            conversation_history = session.get_conversation_history(3)
+            conversation_history = session.get_compact_history(3)
             stage_prompt = build_stage_prompt(session.current_stage.value, session.content_context)
             full_prompt = build_conversation_prompt(
                 stage=session.current_stage.value,
@@ -802,70 +1231,76 @@ class WI_OptimizedConversationManager:
             logger.error(f"[WI] Response generation failed: {e}")
             raise Exception(f"AI Response Generation Failed: {e}")
 
+    def _evaluation_prompt(self, session: WI_InterviewSession, conversation_log: str) -> str:
+        return build_evaluation_prompt(
+            student_name=session.student_name,
+            duration=(time.time() - session.created_at) / 60,
+            stages_completed=[s for s, c in session.questions_per_round.items() if c > 0],
+            conversation_log=conversation_log,
+            content_context=session.content_context
+        )
+
+    async def _generate_narrative(self, session: WI_InterviewSession, conversation_log: str) -> str:
+        content = await _wi_cached_completion(
+            self.client_manager.openai_client,
+            cacheable_finish=False,
+            model=config.OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": "You are an experienced interviewer providing detailed feedback."},
+                {"role": "user", "content": self._evaluation_prompt(session, conversation_log)}
+            ],
+            temperature=0.1,
+            max_tokens=800
+        )
+        evaluation = content.strip()
+        if not evaluation:
+            raise Exception("OpenAI returned empty evaluation")
+        return evaluation
+
     async def generate_fast_evaluation(self, session: WI_InterviewSession) -> Tuple[str, Dict[str, float]]:
+        """
+        Final report from the per-round partials computed during the interview.
+        Rounds without a finished partial (always the last one) are scored
+        concurrently with the single narrative call. With no partials at all,
+        one structured call returns the narrative and the scores together.
+        """
         try:
             await self.client_manager.initialize()
-            conversation_log = "\n".join([
-                f"[{ex.stage.value.upper()}] Interviewer: {ex.ai_message}\nCandidate: {ex.user_response}\n"
-                for ex in session.exchanges if ex.user_response
-            ])
+            await self.stage_evaluator.wait_pending(session)
+
+            unscored = [
+                WI_InterviewStage(s) for s in config.STAGE_SCORE_WEIGHTS
+                if s not in session.stage_evaluations and s not in session.stage_eval_tasks
+                and session.get_round_exchanges(s)
+            ]
+            conversation_log = session.get_compact_log(include_stage_notes=True)
             if not conversation_log:
                 raise Exception("No conversation data for evaluation")
 
-            evaluation_prompt = build_evaluation_prompt(
-                student_name=session.student_name,
-                duration=(time.time() - session.created_at) / 60,
-                stages_completed=[s for s, c in session.questions_per_round.items() if c > 0],
-                conversation_log=conversation_log,
-                content_context=session.content_context
-            )
-            ev = await self.client_manager.openai_client.chat.completions.create(
-                model=config.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are an experienced interviewer providing detailed feedback."},
-                    {"role": "user", "content": evaluation_prompt}
-                ],
-                temperature=0.1,
-                max_tokens=800
-            )
-            evaluation = ev.choices[0].message.content.strip()
-            if not evaluation:
-                raise Exception("OpenAI returned empty evaluation")
+            if not session.stage_evaluations and not session.stage_eval_tasks:
+                evaluation, scores = await self.evaluation_engine.evaluate(
+                    [
+                        {"role": "system", "content": "You are an experienced interviewer providing detailed feedback and scores."},
+                        {"role": "user", "content": f"{self._evaluation_prompt(session, conversation_log)}\n\n"
+                                                    f"{SCORING_PROMPT_TEMPLATE}\n\n{STRUCTURED_EVALUATION_INSTRUCTIONS}"}
+                    ],
+                    text_field="evaluation",
+                    transcript=conversation_log,
+                    max_tokens=1000
+                )
+                scores["weighted_overall"] = _wi_weighted_overall(scores)
+                return evaluation, scores
 
-            scoring = await self.client_manager.openai_client.chat.completions.create(
-                model=config.OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are scoring an interview on a 1-10 scale."},
-                    {"role": "user", "content": f"{SCORING_PROMPT_TEMPLATE}\n\nConversation:\n{conversation_log}"}
-                ],
-                temperature=0.1,
-                max_tokens=200
-            )
-            score_text = scoring.choices[0].message.content or ""
-            import re as _re
-            patterns = {
-                "technical_score": r"technical.*?(\d+(?:\.\d+)?)",
-                "communication_score": r"communication.*?(\d+(?:\.\d+)?)",
-                "behavioral_score": r"behavioral.*?(\d+(?:\.\d+)?)",
-                "overall_score": r"overall.*?(\d+(?:\.\d+)?)"
-            }
-            scores: Dict[str, float] = {}
-            low = score_text.lower()
-            for key, pat in patterns.items():
-                m = _re.search(pat, low)
-                if not m:
-                    raise Exception(f"Could not extract {key} from scoring text")
-                val = float(m.group(1))
-                if not (0 <= val <= 10):
-                    raise Exception(f"Invalid value for {key}: {val}")
-                scores[key] = val
-            w = config.EVALUATION_CRITERIA
-            scores["weighted_overall"] = round(
-                scores["technical_score"] * w["technical_weight"] +
-                scores["communication_score"] * w["communication_weight"] +
-                scores["behavioral_score"] * w["behavioral_weight"] +
-                scores["overall_score"] * w["overall_presentation"], 1
+            evaluation, *_ = await asyncio.gather(
+                self._generate_narrative(session, conversation_log),
+                *[self.stage_evaluator.evaluate_stage(session, stage) for stage in unscored]
             )
+
+            scores = self.stage_evaluator.merge_scores(session)
+            if scores is None:
+                logger.warning("[WI] No stage scores available; re-asking scores for the full conversation")
+                scores = await self.evaluation_engine.score_only(conversation_log)
+                scores["weighted_overall"] = _wi_weighted_overall(scores)
             return evaluation, scores
         except Exception as e:
             logger.error(f"[WI] Evaluation failed: {e}")
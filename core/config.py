@@ -59,6 +59,13 @@ class Config:
     MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "SuperDB")
     MYSQL_USER = os.getenv("MYSQL_USER", "sa")
     MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "Welcome@123")
+    # Connection pool shared by all sub-apps (see core/mysql_pool.py)
+    MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "10"))
+    MYSQL_POOL_TIMEOUT = float(os.getenv("MYSQL_POOL_TIMEOUT", "10"))
+    MYSQL_POOL_PING_AFTER_SECONDS = float(os.getenv("MYSQL_POOL_PING_AFTER_SECONDS", "30"))
+    MYSQL_POOL_MAX_LIFETIME_SECONDS = float(os.getenv("MYSQL_POOL_MAX_LIFETIME_SECONDS", "3600"))
+    # In-process student directory (core/student_directory.py)
+    STUDENT_DIRECTORY_TTL_SECONDS = float(os.getenv("STUDENT_DIRECTORY_TTL_SECONDS", "900"))
 
     @property
     def mysql_connection_config(self) -> dict:
@@ -120,6 +127,8 @@ class Config:
         os.getenv("ESTIMATED_SECONDS_PER_QUESTION", "180")
     )
     BASE_QUESTIONS_PER_CHUNK = int(os.getenv("BASE_QUESTIONS_PER_CHUNK", "3"))
+    # Pre-generate BASE_QUESTIONS_PER_CHUNK opening questions per fragment for each summary version
+    BASE_QUESTIONS_PREGENERATE = os.getenv("BASE_QUESTIONS_PREGENERATE", "true").lower() == "true"
 
     # =========================================================================
     # WEEKEND MOCKTEST SETTINGS
@@ -139,6 +148,11 @@ class Config:
     SUMMARIES_LIMIT = int(os.getenv("SUMMARIES_LIMIT", "10"))
     CONTENT_SLICE_FRACTION = float(os.getenv("CONTENT_SLICE_FRACTION", "0.4"))
     MIN_CONTENT_LENGTH = int(os.getenv("MIN_CONTENT_LENGTH", "200"))
+    # Summaries written without summary_len are backfilled at most this often (core/summary_index.py)
+    SUMMARY_LEN_BACKFILL_INTERVAL = int(os.getenv("SUMMARY_LEN_BACKFILL_INTERVAL", "60"))
+    # Shared summary snapshots (core/summary_snapshot.py): version probe interval and forced reload age
+    SUMMARY_SNAPSHOT_PROBE_SECONDS = float(os.getenv("SUMMARY_SNAPSHOT_PROBE_SECONDS", "5"))
+    SUMMARY_SNAPSHOT_MAX_AGE_SECONDS = float(os.getenv("SUMMARY_SNAPSHOT_MAX_AGE_SECONDS", "300"))
 
     MIN_INTERVIEW_FRAGMENTS = int(os.getenv("MIN_INTERVIEW_FRAGMENTS", "6"))
     MAX_INTERVIEW_FRAGMENTS = int(os.getenv("MAX_INTERVIEW_FRAGMENTS", "12"))
@@ -151,6 +165,7 @@ class Config:
 
     ROUND_NAMES = ["greeting", "technical", "communication", "hr"]
     TOTAL_ROUNDS = len(ROUND_NAMES)
+    ROUND_DIGEST_MAX_TOKENS = int(os.getenv("ROUND_DIGEST_MAX_TOKENS", "180"))
 
     # =========================================================================
     # TTS CONFIG (merged)
@@ -205,6 +220,33 @@ class Config:
     GROQ_TEMPERATURE = float(os.getenv("GROQ_TEMPERATURE", "0.7"))
     GROQ_MAX_TOKENS = int(os.getenv("GROQ_MAX_TOKENS", "3000"))
 
+    # =========================================================================
+    # PROMPT TOKEN BUDGETS (section content only, template text excluded)
+    # =========================================================================
+    PROMPT_TOKEN_BUDGETS = {
+        "stage": int(os.getenv("STAGE_PROMPT_TOKEN_BUDGET", "500")),
+        "conversation": int(os.getenv("CONVERSATION_PROMPT_TOKEN_BUDGET", "700")),
+        "evaluation": int(os.getenv("EVALUATION_PROMPT_TOKEN_BUDGET", "2500")),
+        "digest": int(os.getenv("DIGEST_PROMPT_TOKEN_BUDGET", "1500")),
+        "stage_evaluation": int(os.getenv("STAGE_EVALUATION_PROMPT_TOKEN_BUDGET", "1500")),
+    }
+    PROMPT_SECTION_SHARES = {
+        "stage": {"content_context": 1.0},
+        "conversation": {"user_response": 0.2, "content_context": 0.3, "conversation_history": 0.5},
+        "evaluation": {"conversation_log": 0.8, "content_context": 0.2},
+        "digest": {"round_log": 1.0},
+        "stage_evaluation": {"round_log": 1.0},
+    }
+    TOKEN_COUNT_CACHE_SIZE = int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "4096"))
+
+    # =========================================================================
+    # LLM RESPONSE CACHE (deterministic evaluation/scoring calls only)
+    # =========================================================================
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+    LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "21600"))
+    LLM_CACHE_REDIS_URL = os.getenv("LLM_CACHE_REDIS_URL", os.getenv("REDIS_URL", ""))
+
     # =========================================================================
     # WEBSOCKET / SESSION CONFIG
     # =========================================================================
@@ -218,9 +260,19 @@ class Config:
     # =========================================================================
     THREAD_POOL_MAX_WORKERS = int(os.getenv("THREAD_POOL_MAX_WORKERS", "4"))
     MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+    # Warm connections kept by the shared Motor client (summary reads, result writes)
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+    MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
     MONGO_SERVER_SELECTION_TIMEOUT = int(
         os.getenv("MONGO_SERVER_SELECTION_TIMEOUT", "5000")
     )
+    # Write-behind result journal (core/result_journal.py)
+    RESULT_JOURNAL_ENABLED = os.getenv("RESULT_JOURNAL_ENABLED", "true").lower() == "true"
+    RESULT_JOURNAL_DIR = Path(os.getenv("RESULT_JOURNAL_DIR", str(CURRENT_DIR / "journal")))
+    RESULT_JOURNAL_COMPRESS = os.getenv("RESULT_JOURNAL_COMPRESS", "false").lower() == "true"
+    RESULT_JOURNAL_BATCH_SIZE = int(os.getenv("RESULT_JOURNAL_BATCH_SIZE", "200"))
+    RESULT_JOURNAL_FLUSH_INTERVAL = float(os.getenv("RESULT_JOURNAL_FLUSH_INTERVAL", "1.0"))
+    RESULT_JOURNAL_FSYNC_INTERVAL = float(os.getenv("RESULT_JOURNAL_FSYNC_INTERVAL", "0.005"))
 
     # =========================================================================
     # CONVERSATION
@@ -255,6 +307,18 @@ class Config:
         "overall_presentation": 0.10,
     }
 
+    # How much each round's partial scores count towards each final score
+    STAGE_SCORE_WEIGHTS = {
+        "technical": {"technical_score": 0.7, "communication_score": 0.3,
+                      "behavioral_score": 0.2, "overall_score": 1.0},
+        "communication": {"technical_score": 0.2, "communication_score": 0.5,
+                          "behavioral_score": 0.3, "overall_score": 1.0},
+        "hr": {"technical_score": 0.1, "communication_score": 0.2,
+               "behavioral_score": 0.5, "overall_score": 1.0},
+    }
+    STAGE_EVAL_MAX_TOKENS = int(os.getenv("STAGE_EVAL_MAX_TOKENS", "350"))
+    STAGE_EVAL_WAIT_SECONDS = float(os.getenv("STAGE_EVAL_WAIT_SECONDS", "10"))
+
     # =========================================================================
     # VALIDATION
     # =========================================================================
@@ -24,19 +24,17 @@ class ContentService:
         try:
             logger.info(f"🔍 Generating interview content context from last {config.RECENT_SUMMARIES_DAYS} days")
             
-            # Fetch recent summaries with enhanced filtering
-            summaries = await self.db_manager.get_recent_summaries_fast(
+            # Fetch recent summaries with enhanced filtering (shared snapshot)
+            snapshot = await self.db_manager.get_recent_summaries_snapshot(
                 days=config.RECENT_SUMMARIES_DAYS,
                 limit=config.SUMMARIES_LIMIT
             )
             
-            if not summaries:
+            if not snapshot.data:
                 raise Exception("No summaries available for content generation")
             
-            logger.info(f"📊 Processing {len(summaries)} summaries for interview context")
-            
-            # Process summaries into interview-ready content
-            processed_content = self._process_summaries_for_interview(summaries)
+            # Process summaries into interview-ready content, once per snapshot version
+            processed_content = snapshot.derive("interview_context", self._process_summaries_for_interview)
             
             # Validate content quality
             content_quality = self._validate_content_quality(processed_content)
@@ -54,6 +52,7 @@ class ContentService:
     def _process_summaries_for_interview(self, summaries: List[Dict[str, Any]]) -> str:
         """Process summaries into interview-optimized content"""
         try:
+            logger.info(f"📊 Processing {len(summaries)} summaries for interview context")
             content_parts = []
             
             for i, summary_doc in enumerate(summaries, 1):
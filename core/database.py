@@ -8,7 +8,7 @@ This merges the three previous database.py implementations from:
 - weekly_interview
 
 Handles:
-- MySQL connections
+- MySQL connections (pooled, see core/mysql_pool.py)
 - MongoDB connections (async + sync)
 - Summaries, test results, interview results, session results
 
@@ -28,9 +28,18 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from urllib.parse import quote_plus
 
 import pymongo
-from pymongo import MongoClient
 
 from .config import config
+from .mysql_pool import get_mysql_pool, close_mysql_pools, PoolTimeoutError
+from .student_directory import get_student_directory
+from .summary_index import (
+    min_length_filter, aensure_summary_indexes, abackfill_summary_len, BackfillThrottle
+)
+from .summary_snapshot import SummarySnapshot, get_summary_snapshot_cache
+from .result_store import ResultStore, get_result_store
+from .result_journal import (
+    ResultJournal, get_result_journal, close_result_journal, upsert_many_by_key
+)
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +54,10 @@ class DatabaseManager:
         self.client_manager = client_manager
         self._mongo_client = None
         self._mongo_db = None
+        self._sync_mongo_client = None
+        self._mysql_pool = None
+        self._summary_indexes_ready = False
+        self._summary_backfill = BackfillThrottle(config.SUMMARY_LEN_BACKFILL_INTERVAL)
 
         # weekend_mocktest style mongo client
         self.mongo_client = None
@@ -80,19 +93,39 @@ class DatabaseManager:
     # ------------------------------------------------------------------------
     # MYSQL CONNECTION
     # ------------------------------------------------------------------------
-    def get_mysql_connection(self):
-        """Get MySQL connection using environment configuration"""
-        try:
+    @property
+    def mysql_pool(self):
+        """Process-wide MySQL pool (shared with the other sub-apps)"""
+        if self._mysql_pool is None:
             db_config = self.mysql_config
-            conn = mysql.connector.connect(
+            self._mysql_pool = get_mysql_pool(
+                host=db_config['HOST'],
+                port=db_config['PORT'],
                 user=db_config['USER'],
                 password=db_config['PASSWORD'],
-                host=db_config['HOST'],
                 database=db_config['NAME'],
-                port=db_config['PORT'],
-                connection_timeout=5
+                connection_timeout=5,
+                pool_size=config.MYSQL_POOL_SIZE,
+                checkout_timeout=config.MYSQL_POOL_TIMEOUT,
+                ping_after_seconds=config.MYSQL_POOL_PING_AFTER_SECONDS,
+                max_lifetime_seconds=config.MYSQL_POOL_MAX_LIFETIME_SECONDS
             )
-            return conn
+        return self._mysql_pool
+
+    @property
+    def student_directory(self):
+        """Cached tbl_Student IDs/names shared by all sub-apps"""
+        return get_student_directory(self.mysql_pool, config.STUDENT_DIRECTORY_TTL_SECONDS)
+
+    def get_mysql_connection(self):
+        """Check out a pooled MySQL connection; conn.close() returns it to the pool"""
+        db_config = self.mysql_config
+        try:
+            return self.mysql_pool.get_connection()
+
+        except PoolTimeoutError as e:
+            logger.error(f"❌ MySQL pool exhausted: {e}")
+            raise Exception(f"MySQL connection failed: {e}")
 
         except mysql.connector.Error as err:
             if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
@@ -114,14 +147,11 @@ class DatabaseManager:
     async def get_mongo_client(self) -> AsyncIOMotorClient:
         """Get MongoDB client with connection pooling"""
         if self._mongo_client is None:
-            mongo_cfg = self.mongo_config
-            username = quote_plus(mongo_cfg['username'])
-            password = quote_plus(mongo_cfg['password'])
-            mongo_uri = f"mongodb://{username}:{password}@{mongo_cfg['host']}:{mongo_cfg['port']}/{mongo_cfg['auth_source']}"
-
             self._mongo_client = AsyncIOMotorClient(
-                mongo_uri,
+                self._mongo_uri(),
                 maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+                minPoolSize=config.MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=config.MONGO_MAX_IDLE_TIME_MS,
                 serverSelectionTimeoutMS=config.MONGO_SERVER_SELECTION_TIMEOUT
             )
 
@@ -135,6 +165,12 @@ class DatabaseManager:
 
         return self._mongo_client
 
+    def _mongo_uri(self) -> str:
+        mongo_cfg = self.mongo_config
+        username = quote_plus(mongo_cfg['username'])
+        password = quote_plus(mongo_cfg['password'])
+        return f"mongodb://{username}:{password}@{mongo_cfg['host']}:{mongo_cfg['port']}/{mongo_cfg['auth_source']}"
+
     async def get_mongo_db(self):
         """Get MongoDB database instance"""
         if self._mongo_db is None:
@@ -146,67 +182,98 @@ class DatabaseManager:
     # DAILY_STANDUP SPECIFIC
     # ------------------------------------------------------------------------
     async def get_student_info_fast(self) -> Tuple[int, str, str, str]:
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self.client_manager.executor,
-            self._sync_get_student_info
-        )
-
-    def _sync_get_student_info(self) -> Tuple[int, str, str, str]:
+        # Served from the student directory; MySQL is only hit before it has loaded
         try:
-            conn = self.get_mysql_connection()
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("""
-                SELECT ID, First_Name, Last_Name 
-                FROM tbl_Student 
-                WHERE ID IS NOT NULL AND First_Name IS NOT NULL AND Last_Name IS NOT NULL
-                ORDER BY RAND()
-                LIMIT 1
-            """)
-            row = cursor.fetchone()
-            cursor.close()
-            conn.close()
-
-            if not row:
-                raise Exception("No valid student records found in tbl_Student")
-
-            session_key = f"SESSION_{int(time.time())}"
-            return (row['ID'], row['First_Name'], row['Last_Name'], session_key)
-
+            row = await self.student_directory.arandom_student()
+            return self._student_tuple(row)
         except Exception as e:
             logger.error(f"❌ Error fetching student info: {e}")
             raise
 
-    async def get_summary_fast(self) -> str:
-        """Fetch summary from MongoDB (daily_standup style)"""
+    def _sync_get_student_info(self) -> Tuple[int, str, str, str]:
         try:
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(
-                self.client_manager.executor,
-                self._sync_get_summary
-            )
+            return self._student_tuple(self.student_directory.random_student())
         except Exception as e:
+            logger.error(f"❌ Error fetching student info: {e}")
             raise
 
-    def _sync_get_summary(self) -> str:
-        mongo_cfg = self.mongo_config
-        username = quote_plus(mongo_cfg['username'])
-        password = quote_plus(mongo_cfg['password'])
-        mongo_uri = f"mongodb://{username}:{password}@{mongo_cfg['host']}:{mongo_cfg['port']}/{mongo_cfg['auth_source']}"
+    @staticmethod
+    def _student_tuple(row: Optional[Dict[str, Any]]) -> Tuple[int, str, str, str]:
+        if not row:
+            raise Exception("No valid student records found in tbl_Student")
 
-        client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
-        db = client[mongo_cfg['database']]
-        collection = db[config.SUMMARIES_COLLECTION]
-        doc = collection.find_one(
-            {"summary": {"$exists": True, "$ne": None, "$ne": ""}},
+        session_key = f"SESSION_{int(time.time())}"
+        return (row['ID'], row['First_Name'], row['Last_Name'], session_key)
+
+    async def get_summary_fast(self) -> str:
+        """Latest summary (daily_standup style), served from the shared snapshot"""
+        return (await self.get_summary_snapshot()).data
+
+    async def get_summary_snapshot(self) -> SummarySnapshot:
+        """Snapshot of the latest summary; derived fragments are memoized on it"""
+        collection, cache = await self._summary_snapshots()
+        return await cache.get("latest", lambda: self._fetch_latest_summary(collection))
+
+    async def _fetch_latest_summary(self, collection) -> str:
+        doc = await collection.find_one(
+            {"summary": {"$exists": True, "$nin": [None, ""]}},
+            {"summary": 1},
             sort=[("_id", -1)]
         )
-        client.close()
 
         if not doc or not doc.get("summary"):
             raise Exception("No valid summary found")
         return doc["summary"].strip()
 
+    async def save_session_result_fast(self, session_data, evaluation: str, score: float) -> bool:
+        """Save a finished standup session to RESULTS_COLLECTION"""
+        try:
+            counts = dict(session_data.concept_question_counts)
+            doc = {
+                "test_id": session_data.test_id,
+                "session_id": session_data.session_id,
+                "student_id": session_data.student_id,
+                "student_name": session_data.student_name,
+                "session_key": session_data.session_key,
+                "timestamp": time.time(),
+                "created_at": session_data.created_at,
+                "duration_minutes": round((time.time() - session_data.created_at) / 60, 1),
+                "conversation_log": [
+                    {
+                        "timestamp": ex.timestamp,
+                        "stage": ex.stage.value,
+                        "ai_message": ex.ai_message,
+                        "user_response": ex.user_response,
+                        "transcript_quality": ex.transcript_quality,
+                        "concept": ex.concept,
+                        "is_followup": ex.is_followup,
+                    }
+                    for ex in session_data.exchanges
+                ],
+                "evaluation": evaluation,
+                "score": score,
+                "total_exchanges": len(session_data.exchanges),
+                "questions_per_concept": counts,
+                "followup_questions": session_data.followup_questions,
+                "fragments_covered": len([c for c, count in counts.items() if count > 0]),
+                "total_fragments": len(session_data.fragment_keys),
+            }
+            saved = await self._save_result(config.RESULTS_COLLECTION, doc)
+            logger.info(f"💾 Session result saved: {session_data.session_id}")
+            return saved
+        except Exception as e:
+            logger.error(f"❌ Session result save failed: {e}")
+            return False
+
+    async def get_session_result_fast(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Full standup result by session_id (falls back to test_id)"""
+        journal = self._result_journal(config.RESULTS_COLLECTION)
+        pending = journal.pending(session_id) if journal else None
+        if pending:
+            return pending
+        store = await self._result_store(config.RESULTS_COLLECTION)
+        return await store.get("session_id", session_id) or await store.get("test_id", session_id)
+
     # ------------------------------------------------------------------------
     # WEEKEND MOCKTEST SPECIFIC
     # ------------------------------------------------------------------------
@@ -252,72 +319,58 @@ class DatabaseManager:
     # WEEKLY INTERVIEW SPECIFIC
     # ------------------------------------------------------------------------
     async def get_recent_summaries_fast(self, days: int = None, limit: int = None) -> List[Dict[str, Any]]:
-        """Weekly Interview: fetch recent summaries with 7-day filter"""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            self.client_manager.executor,
-            self._sync_get_recent_summaries,
-            days or config.RECENT_SUMMARIES_DAYS,
-            limit or config.SUMMARIES_LIMIT
-        )
+        """Weekly Interview: 7-day summaries with smart filtering, served from the shared snapshot"""
+        return list((await self.get_recent_summaries_snapshot(days, limit)).data)
+
+    async def get_recent_summaries_snapshot(self, days: int = None, limit: int = None) -> SummarySnapshot:
+        """Snapshot of the 7-day summary set (a tuple of read-only documents)"""
+        days = days or config.RECENT_SUMMARIES_DAYS
+        limit = limit or config.SUMMARIES_LIMIT
+        collection, cache = await self._summary_snapshots()
+        return await cache.get(("recent", days, limit), lambda: self._fetch_recent_summaries(collection, days, limit))
 
-    def _sync_get_recent_summaries(self, days: int, limit: int) -> List[Dict[str, Any]]:
-        """Synchronous 7-day summaries retrieval with smart filtering"""
+    async def _fetch_recent_summaries(self, collection, days: int, limit: int) -> tuple:
         try:
-            from pymongo import MongoClient
-            
-            client = MongoClient(config.mongodb_connection_string, serverSelectionTimeoutMS=5000)
-            db = client[config.MONGODB_DATABASE]
-            collection = db[config.SUMMARIES_COLLECTION]
+            # Reloads only happen when the collection changed, so pick up new summaries' summary_len now
+            await self._maintain_summary_len(collection, force=True)
             
             # Calculate 7-day window
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             start_timestamp = start_date.timestamp()
             
-            # Multiple query strategies for maximum 7-day coverage
+            # Strategies in priority order; length filters use the indexed summary_len field
             query_strategies = [
                 {
                     "name": "timestamp_based_7day",
                     "filter": {
-                        "summary": {"$exists": True, "$ne": "", "$type": "string"},
-                        "timestamp": {"$gte": start_timestamp},
-                        "$expr": {"$gt": [{"$strLenCP": "$summary"}, config.MIN_CONTENT_LENGTH]}
+                        **min_length_filter(config.MIN_CONTENT_LENGTH),
+                        "timestamp": {"$gte": start_timestamp}
                     },
                     "sort": [("timestamp", -1)]
                 },
                 {
                     "name": "date_based_7day", 
                     "filter": {
-                        "summary": {"$exists": True, "$ne": "", "$type": "string"},
-                        "date": {"$gte": start_date.strftime("%Y-%m-%d")},
-                        "$expr": {"$gt": [{"$strLenCP": "$summary"}, config.MIN_CONTENT_LENGTH]}
+                        **min_length_filter(config.MIN_CONTENT_LENGTH),
+                        "date": {"$gte": start_date.strftime("%Y-%m-%d")}
                     },
                     "sort": [("date", -1)]
                 },
                 {
                     "name": "recent_quality_summaries",
-                    "filter": {
-                        "summary": {"$exists": True, "$ne": "", "$type": "string"},
-                        "$expr": {"$gt": [{"$strLenCP": "$summary"}, config.MIN_CONTENT_LENGTH * 2]}
-                    },
+                    "filter": min_length_filter(config.MIN_CONTENT_LENGTH * 2),
                     "sort": [("_id", -1)]
                 },
                 {
                     "name": "fallback_any_summaries",
-                    "filter": {
-                        "summary": {"$exists": True, "$ne": "", "$type": "string"}
-                    },
+                    "filter": min_length_filter(0),
                     "sort": [("_id", -1)]
                 }
             ]
             
-            summaries = []
-            
-            for strategy in query_strategies:
+            async def run_strategy(strategy: Dict[str, Any]) -> List[Dict[str, Any]]:
                 try:
-                    logger.info(f"🔍 Trying strategy: {strategy['name']}")
-                    
                     cursor = collection.find(
                         strategy["filter"],
                         {
@@ -328,18 +381,23 @@ class DatabaseManager:
                             "_id": 1
                         }
                     ).sort(strategy["sort"]).limit(limit)
-                    
-                    summaries = list(cursor)
-                    
-                    if summaries:
-                        logger.info(f"✅ Retrieved {len(summaries)} summaries using {strategy['name']}")
-                        break
-                        
+                    return await cursor.to_list(length=limit)
                 except Exception as e:
                     logger.warning(f"⚠️ Strategy {strategy['name']} failed: {e}")
-                    continue
+                    return []
             
-            client.close()
+            # All strategies run concurrently; the highest-priority non-empty result wins
+            tasks = [asyncio.create_task(run_strategy(strategy)) for strategy in query_strategies]
+            summaries = []
+            try:
+                for strategy, task in zip(query_strategies, tasks):
+                    summaries = await task
+                    if summaries:
+                        logger.info(f"✅ Retrieved {len(summaries)} summaries using {strategy['name']}")
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
             
             if not summaries:
                 raise Exception("No valid summaries found in database for 7-day interview processing")
@@ -351,21 +409,126 @@ class DatabaseManager:
                 logger.info(f"📄 Sample summary ({sample_length} chars): {first_summary[:sample_length]}...")
                 logger.info(f"📊 Total summaries for interview: {len(summaries)}")
             
-            return summaries
+            return tuple(summaries)
             
         except Exception as e:
-            logger.error(f"❌ Sync 7-day summary retrieval error: {e}")
+            logger.error(f"❌ 7-day summary retrieval error: {e}")
             raise Exception(f"MongoDB 7-day summary retrieval failed: {e}")
 
 
+    async def _maintain_summary_len(self, collection, force: bool = False):
+        """Create the summary_len indexes once, and pick up summaries written without the field"""
+        try:
+            if not self._summary_indexes_ready:
+                await aensure_summary_indexes(collection)
+                self._summary_indexes_ready = True
+            if self._summary_backfill.due() or force:
+                await abackfill_summary_len(collection)
+        except Exception as e:
+            logger.warning(f"⚠️ summary_len maintenance failed: {e}")
+
+    async def save_interview_result_fast(self, interview_data: Dict[str, Any]) -> bool:
+        """Save an interview result (or its error state) to INTERVIEW_RESULTS_COLLECTION"""
+        try:
+            saved = await self._save_result(config.INTERVIEW_RESULTS_COLLECTION, interview_data)
+            logger.info(f"💾 Interview result saved: {interview_data.get('test_id')}")
+            return saved
+        except Exception as e:
+            logger.error(f"❌ Interview result save failed: {e}")
+            return False
+
+    async def get_interview_result_fast(self, test_id: str) -> Optional[Dict[str, Any]]:
+        """Full interview result by test_id (falls back to session_id)"""
+        journal = self._result_journal(config.INTERVIEW_RESULTS_COLLECTION)
+        pending = journal.pending(test_id) if journal else None
+        if pending:
+            return pending
+        store = await self._result_store(config.INTERVIEW_RESULTS_COLLECTION)
+        return await store.get("test_id", test_id) or await store.get("session_id", test_id)
+
+    async def list_student_results(self, student_id: Any, kind: str = "standup", limit: int = 20,
+                                   before: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Newest-first results for a student without conversation logs or evaluation text"""
+        collection = config.INTERVIEW_RESULTS_COLLECTION if kind == "interview" else config.RESULTS_COLLECTION
+        store = await self._result_store(collection)
+        return await store.list_for_student(student_id, limit, before)
+
+    async def _result_store(self, collection_name: str) -> ResultStore:
+        db = await self.get_mongo_db()
+        return get_result_store(db[collection_name])
+
+    async def _save_result(self, collection_name: str, doc: Dict[str, Any]) -> bool:
+        """Journaled write-behind save; falls back to a direct Motor upsert if the journal fails"""
+        doc = {**doc}
+        doc.setdefault("timestamp", time.time())
+        journal = self._result_journal(collection_name)
+        if journal:
+            try:
+                await journal.aappend(doc)
+                return True
+            except Exception as e:
+                logger.warning(f"⚠️ Journal write failed, saving directly: {e}")
+        store = await self._result_store(collection_name)
+        return await store.save(doc)
+
+    def start_result_journals(self):
+        """Open both result journals now, so records left by a crash are replayed at startup"""
+        for collection_name in (config.RESULTS_COLLECTION, config.INTERVIEW_RESULTS_COLLECTION):
+            self._result_journal(collection_name)
+
+    def _result_journal(self, collection_name: str) -> Optional[ResultJournal]:
+        if not config.RESULT_JOURNAL_ENABLED:
+            return None
+        # Lookups right after a save: standup results by session_id, interview results by test_id
+        key_field = "session_id" if collection_name == config.RESULTS_COLLECTION else "test_id"
+        # Upserts on the key, like ResultStore.save: a retried save replaces the earlier document
+        return get_result_journal(
+            config.RESULT_JOURNAL_DIR,
+            collection_name,
+            lambda docs: upsert_many_by_key(self._sync_results_collection(collection_name), docs, key_field),
+            key_field=key_field,
+            batch_size=config.RESULT_JOURNAL_BATCH_SIZE,
+            flush_interval_seconds=config.RESULT_JOURNAL_FLUSH_INTERVAL,
+            fsync_interval_seconds=config.RESULT_JOURNAL_FSYNC_INTERVAL,
+            compress=config.RESULT_JOURNAL_COMPRESS
+        )
+
+    def _sync_results_collection(self, collection_name: str):
+        """pymongo collection for the journal's flusher thread (Motor is bound to the event loop)"""
+        if self._sync_mongo_client is None:
+            self._sync_mongo_client = pymongo.MongoClient(
+                self._mongo_uri(),
+                maxPoolSize=4,
+                serverSelectionTimeoutMS=config.MONGO_SERVER_SELECTION_TIMEOUT
+            )
+        return self._sync_mongo_client[self.mongo_config["database"]][collection_name]
+
+    async def _summary_snapshots(self):
+        db = await self.get_mongo_db()
+        collection = db[config.SUMMARIES_COLLECTION]
+        return collection, get_summary_snapshot_cache(
+            collection, config.SUMMARY_SNAPSHOT_PROBE_SECONDS, config.SUMMARY_SNAPSHOT_MAX_AGE_SECONDS
+        )
+
     # ------------------------------------------------------------------------
     # COMMON UTILITIES
     # ------------------------------------------------------------------------
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """MySQL pool checkout/wait metrics and student directory state"""
+        return {**self.mysql_pool.get_stats(), "student_directory": self.student_directory.get_stats()}
+
     async def close_connections(self):
+        # Flush journaled results before the clients go away
+        for collection_name in (config.RESULTS_COLLECTION, config.INTERVIEW_RESULTS_COLLECTION):
+            await asyncio.to_thread(close_result_journal, config.RESULT_JOURNAL_DIR, collection_name)
+        if self._sync_mongo_client:
+            self._sync_mongo_client.close()
+            self._sync_mongo_client = None
         if self._mongo_client:
             self._mongo_client.close()
         if self.mongo_client:
             self.mongo_client.close()
+        close_mysql_pools()
         logger.info("🔌 Database connections closed")
 
 
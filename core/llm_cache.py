@@ -0,0 +1,212 @@
+# core/llm_cache.py
+"""
+Response cache for deterministic LLM calls
+==========================================
+
+Evaluation/scoring prompts run at low temperature and are frequently re-sent
+verbatim (client retries after a timeout, double submits). This cache sits
+around the provider call and returns the stored result instead of paying for
+the same completion again.
+
+- Keyed by a content hash of (model, messages, temperature, max_tokens) plus
+  any extra request options, namespaced per app.
+- Opt-in per call site: nothing is cached unless the caller goes through
+  get_or_call()/aget_or_call().
+- Local LRU with TTL; optionally shared across workers through Redis when
+  a redis URL is configured and the redis package is installed.
+- Concurrent identical requests are coalesced: one caller hits the provider,
+  the rest wait for its result. Failures are never cached.
+
+Values must be JSON-serializable (the Redis tier stores JSON).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    import redis
+    HAVE_REDIS = True
+except Exception:
+    HAVE_REDIS = False
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LLMResponseCache:
+    """Content-hash LRU/TTL cache with in-flight request coalescing."""
+
+    def __init__(self, namespace: str, max_entries: int = 1024, ttl_seconds: int = 3600,
+                 redis_url: Optional[str] = None):
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_async: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "redis_hits": 0}
+
+        self._redis = None
+        if redis_url:
+            if not HAVE_REDIS:
+                logger.warning(f"[LLM-CACHE] redis not installed; {namespace} cache is local only")
+            else:
+                try:
+                    self._redis = redis.Redis.from_url(redis_url, socket_timeout=1, socket_connect_timeout=1)
+                    self._redis.ping()
+                    logger.info(f"[LLM-CACHE] {namespace} cache shared via Redis")
+                except Exception as e:
+                    logger.warning(f"[LLM-CACHE] Redis unavailable ({e}); {namespace} cache is local only")
+                    self._redis = None
+
+    # ------------------------------------------------------------------------
+    # KEYS
+    # ------------------------------------------------------------------------
+    def make_key(self, model: str, messages: List[Dict[str, Any]], temperature: float,
+                 max_tokens: int, **extra: Any) -> str:
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature,
+             "max_tokens": max_tokens, "extra": extra},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return f"llmcache:{self.namespace}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    # ------------------------------------------------------------------------
+    # STORAGE
+    # ------------------------------------------------------------------------
+    def get(self, key: str) -> Any:
+        """Cached value or None"""
+        value = self._get_local(key)
+        if value is not _MISSING:
+            self.stats["hits"] += 1
+            return value
+        value = self._get_redis(key)
+        if value is not _MISSING:
+            self.stats["redis_hits"] += 1
+            self._set_local(key, value)
+            return value
+        return None
+
+    def set(self, key: str, value: Any):
+        self._set_local(key, value)
+        if self._redis is not None:
+            try:
+                self._redis.set(key, json.dumps(value, default=str), ex=self.ttl_seconds)
+            except Exception as e:
+                logger.warning(f"[LLM-CACHE] Redis write failed: {e}")
+
+    def _get_local(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def _set_local(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_redis(self, key: str) -> Any:
+        if self._redis is None:
+            return _MISSING
+        try:
+            raw = self._redis.get(key)
+            return _MISSING if raw is None else json.loads(raw)
+        except Exception as e:
+            logger.warning(f"[LLM-CACHE] Redis read failed: {e}")
+            return _MISSING
+
+    # ------------------------------------------------------------------------
+    # CALL WRAPPERS
+    # ------------------------------------------------------------------------
+    def get_or_call(self, key: str, fn: Callable[[], Any],
+                    cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Return the cached value for key, or run fn once (other threads wait for it)."""
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = Future()
+        if not owner:
+            self.stats["coalesced"] += 1
+            return pending.result()
+
+        self.stats["misses"] += 1
+        try:
+            value = fn()
+            if value is not None and (cacheable is None or cacheable(value)):
+                self.set(key, value)
+            pending.set_result(value)
+            return value
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def aget_or_call(self, key: str, coro_fn: Callable[[], Awaitable[Any]],
+                           cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Async variant of get_or_call; concurrent tasks share one provider call."""
+        cached = self._get_local(key)
+        if cached is not _MISSING:
+            self.stats["hits"] += 1
+            return cached
+        if self._redis is not None:
+            cached = await asyncio.to_thread(self._get_redis, key)
+            if cached is not _MISSING:
+                self.stats["redis_hits"] += 1
+                self._set_local(key, cached)
+                return cached
+
+        pending = self._inflight_async.get(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        pending = self._inflight_async[key] = asyncio.get_running_loop().create_future()
+        self.stats["misses"] += 1
+        try:
+            value = await coro_fn()
+            if value is not None and (cacheable is None or cacheable(value)):
+                if self._redis is not None:
+                    await asyncio.to_thread(self.set, key, value)
+                else:
+                    self._set_local(key, value)
+            pending.set_result(value)
+            return value
+        except BaseException as e:
+            pending.set_exception(e)
+            # Waiters get the error; don't warn about an un-retrieved exception when there are none
+            pending.exception()
+            raise
+        finally:
+            self._inflight_async.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._entries), "shared": self._redis is not None}
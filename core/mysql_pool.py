@@ -0,0 +1,295 @@
+# core/mysql_pool.py
+"""
+Pooled MySQL access
+===================
+
+Every student lookup used to open a fresh mysql.connector connection (TCP
+handshake + authentication) and close it right after. This module keeps a
+bounded pool of live connections instead, shared by every sub-app in the
+process that talks to the same server/database:
+
+- Connections are reused LIFO so the hottest ones stay warm. A connection idle
+  longer than ping_after_seconds is pinged before reuse, and one older than
+  max_lifetime_seconds is replaced, so server-side timeouts never surface as
+  query errors.
+- Checkout blocks (up to checkout_timeout) when all connections are in use.
+- Connections run with autocommit, so a reused connection never serves reads
+  from an old transaction snapshot.
+- PooledConnection.close() returns the connection to the pool, so existing
+  "conn = get_connection(); ...; conn.close()" call sites keep working.
+- An async facade runs queries on a dedicated executor sized to the pool.
+- Checkout/wait/health-check counters are exposed through get_stats().
+
+The module is config-agnostic: callers pass connection settings in.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import mysql.connector
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """No connection became available within the checkout timeout."""
+
+
+class PooledConnection:
+    """Proxy around a raw connection; close() hands it back to the pool."""
+
+    __slots__ = ("_pool", "_raw", "_created_at", "_released")
+
+    def __init__(self, pool: "MySQLPool", raw, created_at: float):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._released = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def close(self, discard: bool = False):
+        if not self._released:
+            self._released = True
+            self._pool._release(self._raw, self._created_at, discard)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # A failed query may have left the connection unusable; let the pool check it
+        self.close(discard=exc_type is not None and not self._pool._alive(self._raw))
+        return False
+
+
+class MySQLPool:
+    """Bounded, health-checked pool of mysql.connector connections."""
+
+    def __init__(self, connect_kwargs: Dict[str, Any], pool_size: int = 10,
+                 checkout_timeout: float = 10.0, ping_after_seconds: float = 30.0,
+                 max_lifetime_seconds: float = 3600.0, name: str = "mysql"):
+        self.name = name
+        self.pool_size = pool_size
+        self.checkout_timeout = checkout_timeout
+        self.ping_after_seconds = ping_after_seconds
+        self.max_lifetime_seconds = max_lifetime_seconds
+        self._connect_kwargs = {**connect_kwargs, "autocommit": True}
+
+        self._idle: deque = deque()  # (raw, created_at, last_used)
+        self._open = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix=f"{name}-pool")
+        self.stats = {
+            "checkouts": 0, "waits": 0, "timeouts": 0, "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0, "connections_created": 0, "connections_recycled": 0,
+            "health_check_failures": 0, "connect_failures": 0
+        }
+        logger.info(f"[MYSQL-POOL] {name} pool ready (size {pool_size})")
+
+    # ------------------------------------------------------------------------
+    # CHECKOUT / RETURN
+    # ------------------------------------------------------------------------
+    def get_connection(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Check out a healthy connection, waiting up to timeout if the pool is exhausted."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._open < self.pool_size:
+                    self._open += 1
+                    entry = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    raise PoolTimeoutError(f"{self.name} pool exhausted ({self.pool_size} connections in use)")
+                if not waited:
+                    waited = True
+                    self.stats["waits"] += 1
+                self._cond.wait(remaining)
+
+            wait_seconds = time.monotonic() - started
+            self.stats["checkouts"] += 1
+            self.stats["wait_seconds_total"] += wait_seconds
+            self.stats["wait_seconds_max"] = max(self.stats["wait_seconds_max"], wait_seconds)
+            self._in_use += 1
+
+        try:
+            raw, created_at = self._prepare(entry)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return PooledConnection(self, raw, created_at)
+
+    def _prepare(self, entry: Optional[Tuple]) -> Tuple[Any, float]:
+        """Reuse an idle connection if it is still healthy, otherwise open a new one."""
+        if entry is not None:
+            raw, created_at, last_used = entry
+            now = time.monotonic()
+            if now - created_at > self.max_lifetime_seconds:
+                self.stats["connections_recycled"] += 1
+                self._close_raw(raw)
+            elif now - last_used > self.ping_after_seconds and not self._alive(raw):
+                self.stats["health_check_failures"] += 1
+                self._close_raw(raw)
+            else:
+                return raw, created_at
+
+        try:
+            raw = mysql.connector.connect(**self._connect_kwargs)
+        except Exception:
+            self.stats["connect_failures"] += 1
+            raise
+        self.stats["connections_created"] += 1
+        return raw, time.monotonic()
+
+    def _release(self, raw, created_at: float, discard: bool = False):
+        if not discard:
+            try:
+                if raw.in_transaction:
+                    raw.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard:
+                self._open -= 1
+            else:
+                self._idle.append((raw, created_at, time.monotonic()))
+            self._cond.notify()
+
+        if discard:
+            self._close_raw(raw)
+
+    @staticmethod
+    def _alive(raw) -> bool:
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        conn = self.get_connection(timeout)
+        with conn:
+            yield conn
+
+    # ------------------------------------------------------------------------
+    # QUERY HELPERS (sync)
+    # ------------------------------------------------------------------------
+    def fetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchone()
+            finally:
+                cursor.close()
+
+    def fetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        with self.connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    def health_check(self) -> bool:
+        """Check out a connection and ping the server."""
+        try:
+            with self.connection() as conn:
+                return self._alive(conn._raw)
+        except Exception as e:
+            logger.warning(f"[MYSQL-POOL] {self.name} health check failed: {e}")
+            return False
+
+    # ------------------------------------------------------------------------
+    # ASYNC FACADE
+    # ------------------------------------------------------------------------
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking DB function on the pool's executor."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def afetch_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        return await self.run(self.fetch_one, query, params)
+
+    async def afetch_all(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        return await self.run(self.fetch_all, query, params)
+
+    # ------------------------------------------------------------------------
+    # LIFECYCLE / METRICS
+    # ------------------------------------------------------------------------
+    def close_idle(self):
+        """Close idle connections; the pool stays usable and reconnects on demand."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for raw, _, _ in idle:
+            self._close_raw(raw)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            checkouts = self.stats["checkouts"]
+            return {
+                **self.stats,
+                "wait_seconds_avg": round(self.stats["wait_seconds_total"] / checkouts, 4) if checkouts else 0.0,
+                "pool_size": self.pool_size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle)
+            }
+
+
+_pools: Dict[tuple, MySQLPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_mysql_pool(host: str, port: Any, user: str, password: str, database: str,
+                   connection_timeout: int = 10, **options: Any) -> MySQLPool:
+    """Shared pool per (host, port, user, database); the first caller's pool options win."""
+    key = (host, str(port), user, database)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = MySQLPool(
+                {"host": host, "port": int(port), "user": user, "password": password,
+                 "database": database, "connection_timeout": connection_timeout},
+                name=f"mysql:{database}", **options
+            )
+        return pool
+
+
+def close_mysql_pools():
+    """Close idle connections in every pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_idle()
@@ -15,6 +15,7 @@ from __future__ import annotations
 
 from typing import List, Dict, Any
 from .config import config
+from .token_budget import get_token_packer
 # ---- Reusable boundary policy appended to Daily Standup prompts ----
 BOUNDARY_POLICY = f"""
 BOUNDARIES:
@@ -140,13 +141,18 @@ Make each transition unique. Think like a real curious colleague."""
     @staticmethod
     def dynamic_followup_response(current_concept_title: str, concept_content: str, 
                              history: str, previous_question: str, user_response: str,
-                             current_question_number: int, questions_for_concept: int) -> str:
+                             current_question_number: int, questions_for_concept: int,
+                             planned_questions: List[str] = None) -> str:
+        planned = ""
+        if planned_questions:
+            planned = "\n**Questions you prepared on this topic** (reuse or adapt one if it fits):\n" + \
+                "\n".join(f"- {q}" for q in planned_questions) + "\n"
         core = f"""You're a friendly team lead having standup chat with your team member. Keep it normal and conversational.
 
 **Topic**: {current_concept_title}
 **They said**: "{user_response}"
 **Your last question**: "{previous_question}"
-
+{planned}
 **RULES:**
 1. Talk like a NORMAL person - no weird fancy phrases
 2. Use SIMPLE English that sounds natural
@@ -845,6 +851,40 @@ Score: Overall interview performance
 
 Provide realistic scores that reflect genuine interview performance. Most candidates score between 6-8, with exceptional performance reaching 9-10."""
 
+ROUND_DIGEST_PROMPT_TEMPLATE = """INTERVIEW ROUND DIGEST
+
+ROUND: {stage}
+
+EXCHANGES:
+{round_log}
+
+Summarize this interview round for the hiring team in at most 5 short bullet points. Capture:
+- Topics and questions covered
+- What the candidate actually said (specific projects, technologies, examples)
+- Strengths and weaknesses visible in their answers
+- Clarity and confidence of their communication
+
+Use ONLY what is in the exchanges. Be factual and concise."""
+
+STAGE_EVALUATION_PROMPT_TEMPLATE = """INTERVIEW ROUND EVALUATION
+
+CANDIDATE: {student_name}
+ROUND: {stage}
+
+EXCHANGES:
+{round_log}
+
+As Sarah, write your notes on THIS ROUND ONLY for the hiring team:
+- 3-5 bullet points on what the candidate demonstrated (specific projects, technologies, examples)
+- One line on their strongest moment and one on their weakest
+
+Then score the candidate's performance in this round on a 1-10 scale for technical, communication, behavioral and overall presentation.
+
+Use ONLY what is in the exchanges. Most candidates score between 6-8.
+Return JSON with "notes" (your notes as plain text) and the four numeric scores."""
+
+STRUCTURED_EVALUATION_INSTRUCTIONS = """Return JSON with "evaluation" (the complete written evaluation above, markdown allowed) and the numeric scores "technical_score", "communication_score", "behavioral_score" and "overall_score"."""
+
 ACKNOWLEDGMENT_PHRASES = [
     "That's interesting,",
     "I see,",
@@ -919,30 +959,54 @@ def build_stage_prompt(stage: str, content_context: str = "") -> str:
     }
     base_prompt = stage_prompts.get(stage, TECHNICAL_INTERVIEWER_PROMPT)
     if content_context:
+        packed = get_token_packer().pack("stage", {"content_context": content_context})
         base_prompt += (
-            f"\n\nCANDIDATE'S RECENT WORK CONTEXT:\n{content_context}\n\n"
+            f"\n\nCANDIDATE'S RECENT WORK CONTEXT:\n{packed['content_context']}\n\n"
             "Use this context to ask relevant, personalized questions about their actual work and projects."
         )
     return base_prompt
 
 def build_conversation_prompt(stage: str, user_response: str, content_context: str, conversation_history: str) -> str:
-    trimmed_context = content_context[:500] + "..." if len(content_context) > 500 else content_context
-    trimmed_history = conversation_history[-1000:] if len(conversation_history) > 1000 else conversation_history
+    packed = get_token_packer().pack(
+        "conversation",
+        {
+            "user_response": user_response,
+            "content_context": content_context,
+            "conversation_history": conversation_history,
+        },
+        keep={"conversation_history": "tail"},
+    )
     return CONVERSATION_PROMPT_TEMPLATE.format(
         stage=stage,
-        user_response=user_response,
-        content_context=trimmed_context,
-        conversation_history=trimmed_history
+        user_response=packed["user_response"],
+        content_context=packed["content_context"],
+        conversation_history=packed["conversation_history"]
     )
 
 def build_evaluation_prompt(student_name: str, duration: float, stages_completed: list, conversation_log: str, content_context: str) -> str:
-    trimmed_context = content_context[:800] + "..." if len(content_context) > 800 else content_context
+    packed = get_token_packer().pack(
+        "evaluation",
+        {"conversation_log": conversation_log, "content_context": content_context},
+        keep={"conversation_log": "tail"},
+    )
     return EVALUATION_PROMPT_TEMPLATE.format(
         student_name=student_name,
         duration=f"{duration:.1f}",
         stages_completed=", ".join(stages_completed),
-        conversation_log=conversation_log,
-        content_context=trimmed_context
+        conversation_log=packed["conversation_log"],
+        content_context=packed["content_context"]
+    )
+
+def build_round_digest_prompt(stage: str, round_log: str) -> str:
+    packed = get_token_packer().pack("digest", {"round_log": round_log}, keep={"round_log": "tail"})
+    return ROUND_DIGEST_PROMPT_TEMPLATE.format(stage=stage, round_log=packed["round_log"])
+
+def build_stage_evaluation_prompt(student_name: str, stage: str, round_log: str) -> str:
+    packed = get_token_packer().pack("stage_evaluation", {"round_log": round_log}, keep={"round_log": "tail"})
+    return STAGE_EVALUATION_PROMPT_TEMPLATE.format(
+        student_name=student_name,
+        stage=stage,
+        round_log=packed["round_log"]
     )
 
 def validate_prompts() -> bool:
@@ -954,7 +1018,9 @@ def validate_prompts() -> bool:
         HR_BEHAVIORAL_INTERVIEWER_PROMPT,
         CONVERSATION_PROMPT_TEMPLATE,
         EVALUATION_PROMPT_TEMPLATE,
-        SCORING_PROMPT_TEMPLATE
+        SCORING_PROMPT_TEMPLATE,
+        ROUND_DIGEST_PROMPT_TEMPLATE,
+        STAGE_EVALUATION_PROMPT_TEMPLATE
     ]
     for i, prompt in enumerate(prompts_to_check):
         if not prompt or len(prompt.strip()) < 50:
@@ -973,8 +1039,9 @@ __all__ = [
     "SYSTEM_CONTEXT_BASE", "GREETING_INTERVIEWER_PROMPT", "TECHNICAL_INTERVIEWER_PROMPT",
     "COMMUNICATION_INTERVIEWER_PROMPT", "HR_BEHAVIORAL_INTERVIEWER_PROMPT",
     "CONVERSATION_PROMPT_TEMPLATE", "EVALUATION_PROMPT_TEMPLATE", "SCORING_PROMPT_TEMPLATE",
+    "ROUND_DIGEST_PROMPT_TEMPLATE", "STAGE_EVALUATION_PROMPT_TEMPLATE", "STRUCTURED_EVALUATION_INSTRUCTIONS",
     "ACKNOWLEDGMENT_PHRASES", "TRANSITION_PHRASES", "ENCOURAGEMENT_PHRASES",
     "CLARIFICATION_PROMPTS", "GENTLE_REDIRECT_PROMPTS",
     "build_stage_prompt", "build_conversation_prompt", "build_evaluation_prompt",
-    "validate_prompts",
+    "build_round_digest_prompt", "build_stage_evaluation_prompt", "validate_prompts",
 ]
\ No newline at end of file
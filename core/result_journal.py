@@ -0,0 +1,443 @@
+# core/result_journal.py
+"""
+Write-behind result journal
+===========================
+
+Result saves used to write to MongoDB on the request path (a synchronous
+insert_one in the mock test, inline saves at the end of voice sessions), so
+database latency under exam-time bursts landed directly on students. Results
+now go through a local journal instead:
+
+- append() adds the document to an append-only segment file. A writer thread
+  group-commits: everything appended within fsync_interval_seconds is written
+  and fsynced together, then the callers' futures resolve. A save is durable
+  once its future resolves, without waiting on the database.
+- Segments are JSONL, or (compress=True, needs `zstandard`) one zstd frame per
+  commit batch. A segment is rotated at segment_bytes.
+- A flusher thread bulk-inserts durable records with the sink (insert_many),
+  up to batch_size per round trip or every flush_interval_seconds. A failed
+  flush is retried with backoff; the records stay in the journal meanwhile.
+- A segment is deleted once it is closed and all of its records are flushed.
+- On start, leftover segments (crash, or a database outage across a restart)
+  are replayed through the sink, so sinks must be idempotent:
+  - insert_many_ignoring_duplicates() relies on the journal-assigned _id (or
+    a unique key): a record inserted just before a crash is a duplicate-key
+    no-op on replay.
+  - upsert_many_by_key() replaces on the journal's key field, so replays and
+    repeated saves of the same session collapse into one document.
+- pending(key) returns a record that is not in the database yet, so reads
+  right after a save still see it.
+
+The module is config-agnostic: callers pass the directory, sink and timings in.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+    HAVE_ZSTD = True
+except Exception:
+    HAVE_ZSTD = False
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def insert_many_ignoring_duplicates(collection, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Unordered insert_many where duplicate keys (already-flushed records) count as success.
+
+    Returns the documents that were newly inserted, for callers that maintain
+    derived data and must not count a replayed record twice.
+    """
+    from pymongo.errors import BulkWriteError
+    try:
+        collection.insert_many(docs, ordered=False)
+        return docs
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+            raise
+        duplicates = {error.get("index") for error in errors}
+        return [doc for i, doc in enumerate(docs) if i not in duplicates]
+
+
+def upsert_many_by_key(collection, docs: List[Dict[str, Any]], key_field: str):
+    """Ordered bulk ReplaceOne(upsert=True) on key_field; the last save of a key wins.
+
+    The journal-assigned _id is dropped from the replacement so an existing
+    document keeps its own. Records without the key are upserted on that _id.
+    """
+    from pymongo import ReplaceOne
+    operations = []
+    for doc in docs:
+        if doc.get(key_field) is not None:
+            replacement = {name: value for name, value in doc.items() if name != "_id"}
+            operations.append(ReplaceOne({key_field: doc[key_field]}, replacement, upsert=True))
+        else:
+            operations.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True))
+    if operations:
+        collection.bulk_write(operations, ordered=True)
+
+
+class ResultJournal:
+    """Durable local journal with a background bulk flusher."""
+
+    def __init__(self, directory: Any, name: str, sink: Callable[[List[Dict[str, Any]]], Any],
+                 key_field: str = "test_id", batch_size: int = 200, flush_interval_seconds: float = 1.0,
+                 fsync_interval_seconds: float = 0.005, segment_bytes: int = 4 * 1024 * 1024,
+                 compress: bool = False, retry_max_seconds: float = 30.0):
+        self.directory = Path(directory)
+        self.name = name
+        self.sink = sink
+        self.key_field = key_field
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.fsync_interval_seconds = fsync_interval_seconds
+        self.segment_bytes = segment_bytes
+        self.retry_max_seconds = retry_max_seconds
+        if compress and not HAVE_ZSTD:
+            logger.warning(f"⚠️ Journal {name}: zstandard not installed, writing uncompressed segments")
+        self.compress = compress and HAVE_ZSTD
+        self._compressor = zstandard.ZstdCompressor() if self.compress else None
+
+        self._lock = threading.Lock()
+        self._has_incoming = threading.Condition(self._lock)
+        self._has_durable = threading.Condition(self._lock)
+        self._incoming: List[Tuple[Dict[str, Any], Future]] = []
+        self._durable: Deque[Tuple[int, Dict[str, Any]]] = deque()  # (segment seq, record), flush order
+        self._by_key: Dict[Any, Dict[str, Any]] = {}
+        self._unflushed: Dict[int, int] = {}  # segment seq -> records not yet in the database
+        self._closed: set = set()
+        self._paths: Dict[int, Path] = {}
+
+        self._seq = 0
+        self._file = None
+        self._file_size = 0
+        self._stopping = False
+        self._writer_done = False
+        self._threads: List[threading.Thread] = []
+        self.stats = {"appended": 0, "commits": 0, "flushed": 0, "flushes": 0, "flush_failures": 0,
+                      "write_failures": 0, "replayed": 0, "segments_deleted": 0}
+
+    # ------------------------------------------------------------------------
+    # LIFECYCLE
+    # ------------------------------------------------------------------------
+    def start(self) -> "ResultJournal":
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._replay()
+        for target, label in ((self._writer_loop, "writer"), (self._flusher_loop, "flusher")):
+            thread = threading.Thread(target=target, name=f"journal-{self.name}-{label}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"📒 Result journal {self.name} started ({self.directory}, "
+                    f"{'zstd' if self.compress else 'jsonl'})")
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """Commit what was appended, make one last flush attempt, and close the segment."""
+        with self._lock:
+            self._stopping = True
+            self._has_incoming.notify_all()
+            self._has_durable.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._closed.add(self._seq)
+            deletable = self._deletable_segments()
+            remaining = len(self._durable)
+        self._delete_segments(deletable)
+        if remaining:
+            logger.warning(f"⚠️ Journal {self.name} stopped with {remaining} unflushed records (replayed on next start)")
+        logger.info(f"📒 Result journal {self.name} stopped")
+
+    # ------------------------------------------------------------------------
+    # APPEND / LOOKUP
+    # ------------------------------------------------------------------------
+    def append(self, doc: Dict[str, Any]) -> Future:
+        """Queue a record; the future resolves once it is fsynced to the journal."""
+        record = {**doc}
+        record.setdefault("_id", uuid.uuid4().hex)
+        future: Future = Future()
+        with self._lock:
+            if self._stopping:
+                raise RuntimeError(f"Journal {self.name} is stopped")
+            self._incoming.append((record, future))
+            if record.get(self.key_field) is not None:
+                self._by_key[record[self.key_field]] = record
+            self.stats["appended"] += 1
+            self._has_incoming.notify()
+        return future
+
+    async def aappend(self, doc: Dict[str, Any]):
+        """Append and wait for durability without blocking the event loop."""
+        await asyncio.wrap_future(self.append(doc))
+
+    def pending(self, key: Any) -> Optional[Dict[str, Any]]:
+        """A record with key_field == key that has not reached the database yet."""
+        with self._lock:
+            record = self._by_key.get(key)
+        if record is None:
+            return None
+        return {k: v for k, v in record.items() if k != "_id"}
+
+    # ------------------------------------------------------------------------
+    # WRITER (group commit)
+    # ------------------------------------------------------------------------
+    def _writer_loop(self):
+        while True:
+            with self._lock:
+                while not self._incoming and not self._stopping:
+                    self._has_incoming.wait()
+                if not self._incoming:
+                    self._writer_done = True
+                    self._has_durable.notify_all()
+                    return
+                stopping = self._stopping
+
+            # Let concurrent appends join this commit
+            if not stopping and self.fsync_interval_seconds > 0:
+                time.sleep(self.fsync_interval_seconds)
+
+            with self._lock:
+                batch, self._incoming = self._incoming, []
+
+            records = [record for record, _ in batch]
+            try:
+                self._write(records)
+            except Exception as e:
+                self.stats["write_failures"] += 1
+                logger.error(f"❌ Journal {self.name} write failed: {e}")
+                with self._lock:
+                    for record in records:
+                        if self._by_key.get(record.get(self.key_field)) is record:
+                            del self._by_key[record[self.key_field]]
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for _, future in batch:
+                future.set_result(True)
+
+    def _write(self, records: List[Dict[str, Any]]):
+        data = "".join(json.dumps(record, default=str, separators=(",", ":")) + "\n" for record in records).encode("utf-8")
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+
+        if self._file is None:
+            path = self._segment_path(self._seq)
+            self._file = open(path, "ab")
+            self._paths[self._seq] = path
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file_size += len(data)
+        self.stats["commits"] += 1
+
+        with self._lock:
+            seq = self._seq
+            self._durable.extend((seq, record) for record in records)
+            self._unflushed[seq] = self._unflushed.get(seq, 0) + len(records)
+            if self._file_size >= self.segment_bytes:
+                self._file.close()
+                self._file = None
+                self._file_size = 0
+                self._closed.add(seq)
+                self._seq += 1
+            self._has_durable.notify()
+
+    # ------------------------------------------------------------------------
+    # FLUSHER (bulk insert)
+    # ------------------------------------------------------------------------
+    def _flusher_loop(self):
+        failures = 0
+        while True:
+            with self._lock:
+                deadline = time.monotonic() + self.flush_interval_seconds
+                while len(self._durable) < self.batch_size and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._has_durable.wait(remaining)
+                if not self._durable:
+                    if self._stopping and self._writer_done:
+                        return
+                    if self._stopping:
+                        self._has_durable.wait(0.05)
+                    continue
+                batch = [self._durable[i] for i in range(min(self.batch_size, len(self._durable)))]
+                stopping = self._stopping
+
+            try:
+                self.sink([record for _, record in batch])
+            except Exception as e:
+                failures += 1
+                self.stats["flush_failures"] += 1
+                logger.warning(f"⚠️ Journal {self.name} flush of {len(batch)} records failed ({failures}): {e}")
+                if stopping:
+                    return
+                with self._lock:
+                    # Backoff, cut short by stop()
+                    self._has_durable.wait(min(self.retry_max_seconds, 0.5 * 2 ** min(failures, 6)))
+                continue
+
+            failures = 0
+            with self._lock:
+                for _ in batch:
+                    self._durable.popleft()
+                for seq, record in batch:
+                    self._unflushed[seq] -= 1
+                    if self._by_key.get(record.get(self.key_field)) is record:
+                        del self._by_key[record[self.key_field]]
+                deletable = self._deletable_segments()
+            self.stats["flushed"] += len(batch)
+            self.stats["flushes"] += 1
+            self._delete_segments(deletable)
+
+    def _deletable_segments(self) -> List[int]:
+        """Closed segments whose records are all in the database (caller holds the lock)."""
+        done = [seq for seq in self._closed if self._unflushed.get(seq, 0) == 0]
+        for seq in done:
+            self._closed.discard(seq)
+            self._unflushed.pop(seq, None)
+        return done
+
+    def _delete_segments(self, seqs: List[int]):
+        for seq in seqs:
+            path = self._paths.pop(seq, None)
+            if path is None:
+                continue
+            try:
+                path.unlink()
+                self.stats["segments_deleted"] += 1
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"⚠️ Journal {self.name} could not delete {path.name}: {e}")
+
+    # ------------------------------------------------------------------------
+    # SEGMENTS / REPLAY
+    # ------------------------------------------------------------------------
+    def _segment_path(self, seq: int) -> Path:
+        suffix = ".jsonl.zst" if self.compress else ".jsonl"
+        return self.directory / f"{self.name}-{seq:08d}{suffix}"
+
+    def _existing_segments(self) -> List[Tuple[int, Path]]:
+        segments = []
+        for path in self.directory.glob(f"{self.name}-*.jsonl*"):
+            number = path.name[len(self.name) + 1:].split(".", 1)[0]
+            if number.isdigit():
+                segments.append((int(number), path))
+        return sorted(segments)
+
+    def _replay(self):
+        """Queue records from leftover segments for flushing; new writes go to a fresh segment."""
+        segments = self._existing_segments()
+        replayed = 0
+        for seq, path in segments:
+            self._seq = max(self._seq, seq + 1)
+            try:
+                records = self._read_segment(path)
+            except Exception as e:
+                # Left on disk untouched for manual recovery
+                logger.error(f"❌ Journal {self.name} cannot read {path.name}: {e}")
+                continue
+            for record in records:
+                self._durable.append((seq, record))
+                if record.get(self.key_field) is not None:
+                    self._by_key[record[self.key_field]] = record
+            self._unflushed[seq] = len(records)
+            self._closed.add(seq)
+            self._paths[seq] = path
+            replayed += len(records)
+
+        self.stats["replayed"] = replayed
+        if replayed:
+            logger.info(f"🔁 Journal {self.name}: replaying {replayed} records from {len(segments)} segments")
+        self._delete_segments(self._deletable_segments())
+
+    @staticmethod
+    def _read_segment(path: Path) -> List[Dict[str, Any]]:
+        raw = path.read_bytes()
+        if path.name.endswith(".zst"):
+            if not HAVE_ZSTD:
+                raise RuntimeError("zstandard is required to read compressed segments")
+            data = bytearray()
+            reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(raw), read_across_frames=True)
+            try:
+                while True:
+                    chunk = reader.read(65536)
+                    if not chunk:
+                        break
+                    data += chunk
+            except zstandard.ZstdError:
+                pass  # torn final frame from a crash mid-write; that commit never resolved
+            raw = bytes(data)
+
+        records = []
+        for line in raw.split(b"\n"):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # torn final line
+        return records
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "incoming": len(self._incoming),
+                "unflushed": len(self._durable),
+                "segments": len(self._paths),
+                "compressed": self.compress
+            }
+
+
+_journals: Dict[Tuple[str, str], ResultJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_result_journal(directory: Any, name: str, sink: Callable[[List[Dict[str, Any]]], Any],
+                       **options: Any) -> ResultJournal:
+    """One started journal per (directory, name); the first caller's sink and options win."""
+    key = (str(directory), name)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = _journals[key] = ResultJournal(directory, name, sink, **options).start()
+        return journal
+
+
+def close_result_journal(directory: Any, name: str, timeout: float = 10.0):
+    """Stop one journal (final commit + flush attempt) and drop it from the registry."""
+    with _journals_lock:
+        journal = _journals.pop((str(directory), name), None)
+    if journal is not None:
+        journal.stop(timeout)
+
+
+def close_result_journals(timeout: float = 10.0):
+    """Stop every journal (final commit + flush attempt)."""
+    with _journals_lock:
+        journals = list(_journals.values())
+        _journals.clear()
+    for journal in journals:
+        journal.stop(timeout)
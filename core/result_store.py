@@ -0,0 +1,91 @@
+# core/result_store.py
+"""
+Async session result store
+==========================
+
+Daily standup and weekly interview results are written and read on the pooled
+Motor client, so saves at session end and PDF downloads never block the event
+loop on a synchronous driver.
+
+- Indexes: session_id, test_id and (student_id, timestamp desc), created once
+  per collection on first use.
+- save() upserts on session_id, so a retried or error-state save replaces the
+  earlier document instead of adding a duplicate.
+- get() returns the newest full document for a session_id or test_id.
+- list_for_student() uses LIST_PROJECTION, which leaves out the conversation
+  log and evaluation text, for list views.
+
+The module is config-agnostic: callers pass the Motor collection in.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RESULT_INDEXES = [
+    [("session_id", 1)],
+    [("test_id", 1)],
+    [("student_id", 1), ("timestamp", -1)],
+]
+
+# Heavy fields left out of list views
+HEAVY_FIELDS = ("conversation_log", "evaluation", "error_details")
+LIST_PROJECTION = {"_id": 0, **{name: 0 for name in HEAVY_FIELDS}}
+
+
+class ResultStore:
+    """Motor-backed store for one results collection."""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self._indexes_ready = False
+
+    async def ensure_indexes(self):
+        if self._indexes_ready:
+            return
+        try:
+            for keys in RESULT_INDEXES:
+                await self.collection.create_index(keys)
+            self._indexes_ready = True
+        except Exception as e:
+            # Reads and writes still work without the indexes; retried on next use
+            logger.warning(f"⚠️ Result index creation failed for {self.collection.name}: {e}")
+
+    async def save(self, doc: Dict[str, Any]) -> bool:
+        """Upsert a result document on session_id; returns True when it was written."""
+        if not doc.get("session_id"):
+            raise ValueError("Result document requires a session_id")
+        await self.ensure_indexes()
+        doc = {**doc}
+        doc.setdefault("timestamp", time.time())
+        result = await self.collection.replace_one({"session_id": doc["session_id"]}, doc, upsert=True)
+        return bool(result.acknowledged)
+
+    async def get(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """Newest full result where field == value."""
+        await self.ensure_indexes()
+        return await self.collection.find_one({field: value}, {"_id": 0}, sort=[("timestamp", -1)])
+
+    async def list_for_student(self, student_id: Any, limit: int = 20,
+                               before: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Newest-first result summaries for a student, without heavy fields."""
+        await self.ensure_indexes()
+        query: Dict[str, Any] = {"student_id": student_id}
+        if before is not None:
+            query["timestamp"] = {"$lt": before}
+        cursor = self.collection.find(query, LIST_PROJECTION).sort("timestamp", -1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+
+_stores: Dict[str, ResultStore] = {}
+
+
+def get_result_store(collection) -> ResultStore:
+    """One store per collection, so index creation runs once per process."""
+    name = collection.full_name
+    store = _stores.get(name)
+    if store is None:
+        store = _stores[name] = ResultStore(collection)
+    return store
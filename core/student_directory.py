@@ -0,0 +1,176 @@
+# core/student_directory.py
+"""
+In-process student directory
+============================
+
+Session start used to pick a student with
+"SELECT ... FROM tbl_Student ... ORDER BY RAND() LIMIT 1", which sorts the
+whole table on every call. The directory keeps IDs and names in compact
+arrays instead, loaded with primary-key range scans and refreshed on a TTL:
+
+- random_student() / get_student() are O(1) lookups on the loaded snapshot.
+- A stale snapshot keeps serving while one background thread reloads it.
+- Before the first load (or if it failed), picks fall back to an indexed
+  range query: a random ID between MIN(ID) and MAX(ID), then the first row at
+  or after it (wrapping around), instead of a full sort.
+
+The module is config-agnostic: callers pass the pool and TTL in.
+"""
+
+import logging
+import random
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from .mysql_pool import MySQLPool
+
+logger = logging.getLogger(__name__)
+
+_VALID_STUDENT = "ID IS NOT NULL AND First_Name IS NOT NULL AND Last_Name IS NOT NULL"
+
+
+class StudentDirectory:
+    """TTL-refreshed snapshot of tbl_Student IDs and names."""
+
+    def __init__(self, pool: MySQLPool, ttl_seconds: float = 900.0, page_size: int = 5000):
+        self.pool = pool
+        self.ttl_seconds = ttl_seconds
+        self.page_size = page_size
+        # Snapshot is swapped as one tuple: (ids, first_names, last_names, position_by_id, loaded_at)
+        self._snapshot: Optional[Tuple[array, List[str], List[str], Dict[int, int], float]] = None
+        self._id_bounds: Optional[Tuple[int, int]] = None
+        self._refresh_lock = threading.Lock()
+        self.stats = {"refreshes": 0, "refresh_failures": 0, "cache_hits": 0, "range_queries": 0}
+
+    # ------------------------------------------------------------------------
+    # LOADING
+    # ------------------------------------------------------------------------
+    def refresh(self) -> int:
+        """Reload the directory with primary-key range pages; returns the student count."""
+        ids = array("q")
+        first_names: List[str] = []
+        last_names: List[str] = []
+        last_id = -1
+        try:
+            while True:
+                rows = self.pool.fetch_all(
+                    f"SELECT ID, First_Name, Last_Name FROM tbl_Student "
+                    f"WHERE ID > %s AND {_VALID_STUDENT} ORDER BY ID LIMIT %s",
+                    (last_id, self.page_size)
+                )
+                for row in rows:
+                    ids.append(int(row["ID"]))
+                    first_names.append(row["First_Name"])
+                    last_names.append(row["Last_Name"])
+                if len(rows) < self.page_size:
+                    break
+                last_id = ids[-1]
+        except Exception as e:
+            self.stats["refresh_failures"] += 1
+            logger.warning(f"[STUDENTS] Directory refresh failed: {e}")
+            raise
+
+        position_by_id = {student_id: i for i, student_id in enumerate(ids)}
+        self._snapshot = (ids, first_names, last_names, position_by_id, time.monotonic())
+        if ids:
+            self._id_bounds = (ids[0], ids[-1])
+        self.stats["refreshes"] += 1
+        logger.info(f"[STUDENTS] Directory loaded: {len(ids)} students")
+        return len(ids)
+
+    async def arefresh(self) -> int:
+        return await self.pool.run(self.refresh)
+
+    def _refresh_in_background(self):
+        """Start one reload thread unless one is already running."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        def worker():
+            try:
+                self.refresh()
+            except Exception:
+                pass
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=worker, name="student-directory-refresh", daemon=True).start()
+
+    def _current(self):
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() - snapshot[4] > self.ttl_seconds:
+            self._refresh_in_background()
+        return snapshot if snapshot and snapshot[0] else None
+
+    # ------------------------------------------------------------------------
+    # PICKS
+    # ------------------------------------------------------------------------
+    def random_student(self) -> Optional[Dict[str, object]]:
+        """Random student: O(1) from the snapshot, indexed range query when not loaded."""
+        snapshot = self._current()
+        if snapshot is not None:
+            ids, first_names, last_names, _, _ = snapshot
+            i = random.randrange(len(ids))
+            self.stats["cache_hits"] += 1
+            return {"ID": ids[i], "First_Name": first_names[i], "Last_Name": last_names[i]}
+        return self._random_from_db()
+
+    def get_student(self, student_id: int) -> Optional[Dict[str, object]]:
+        """Student by ID: dict lookup in the snapshot, primary-key query when not loaded."""
+        snapshot = self._current()
+        if snapshot is not None:
+            ids, first_names, last_names, position_by_id, _ = snapshot
+            i = position_by_id.get(int(student_id))
+            if i is not None:
+                self.stats["cache_hits"] += 1
+                return {"ID": ids[i], "First_Name": first_names[i], "Last_Name": last_names[i]}
+        self.stats["range_queries"] += 1
+        return self.pool.fetch_one(
+            f"SELECT ID, First_Name, Last_Name FROM tbl_Student WHERE ID = %s AND {_VALID_STUDENT}",
+            (int(student_id),)
+        )
+
+    async def arandom_student(self) -> Optional[Dict[str, object]]:
+        """Async pick; only touches the executor when the snapshot is not loaded."""
+        snapshot = self._current()
+        if snapshot is not None:
+            return self.random_student()
+        return await self.pool.run(self._random_from_db)
+
+    def _random_from_db(self) -> Optional[Dict[str, object]]:
+        """Random pivot in [MIN(ID), MAX(ID)], then the first valid row at or after it."""
+        self.stats["range_queries"] += 1
+        if self._id_bounds is None:
+            bounds = self.pool.fetch_one(f"SELECT MIN(ID) AS lo, MAX(ID) AS hi FROM tbl_Student WHERE {_VALID_STUDENT}")
+            if not bounds or bounds["lo"] is None:
+                return None
+            self._id_bounds = (int(bounds["lo"]), int(bounds["hi"]))
+
+        lo, hi = self._id_bounds
+        pivot = random.randint(lo, hi)
+        query = (f"SELECT ID, First_Name, Last_Name FROM tbl_Student "
+                 f"WHERE ID >= %s AND {_VALID_STUDENT} ORDER BY ID LIMIT 1")
+        return self.pool.fetch_one(query, (pivot,)) or self.pool.fetch_one(query, (lo,))
+
+    def get_stats(self) -> Dict[str, object]:
+        snapshot = self._snapshot
+        return {
+            **self.stats,
+            "students": len(snapshot[0]) if snapshot else 0,
+            "age_seconds": round(time.monotonic() - snapshot[4], 1) if snapshot else None
+        }
+
+
+_directories: Dict[int, StudentDirectory] = {}
+_directories_lock = threading.Lock()
+
+
+def get_student_directory(pool: MySQLPool, ttl_seconds: float = 900.0) -> StudentDirectory:
+    """One directory per pool, so every sub-app on the same database shares it."""
+    with _directories_lock:
+        directory = _directories.get(id(pool))
+        if directory is None:
+            directory = _directories[id(pool)] = StudentDirectory(pool, ttl_seconds)
+        return directory
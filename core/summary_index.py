@@ -0,0 +1,134 @@
+# core/summary_index.py
+"""
+Indexed summary length
+======================
+
+Summary reads used to filter on {"$expr": {"$gt": [{"$strLenCP": "$summary"}, N]}},
+which no index can serve, so every query scanned the whole collection. Summaries
+now carry a maintained `summary_len` field (code points, same as $strLenCP) with
+compound indexes on (summary_len, timestamp) and (summary_len, date), and length
+filters become plain range predicates.
+
+- Summaries are written by external pipelines, not by this repo, so the field
+  is set by backfill_summary_len(): a single server-side update over documents
+  that lack it. Readers run it at most once per interval (BackfillThrottle), and
+  it is index-backed, so it is cheap when nothing is missing.
+- One-off migration for existing data:
+
+      python -m core.summary_index --uri mongodb://... --database ml_notes
+      python -m core.summary_index --dry-run
+
+The helpers are config-agnostic and work with pymongo or Motor collections.
+"""
+
+import argparse
+import logging
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_LEN_FIELD = "summary_len"
+
+SUMMARY_INDEXES = [
+    [(SUMMARY_LEN_FIELD, 1), ("timestamp", -1)],
+    [(SUMMARY_LEN_FIELD, 1), ("date", -1)],
+]
+
+# Only string summaries get a length; anything else stays out of length-filtered queries
+MISSING_SUMMARY_LEN = {SUMMARY_LEN_FIELD: {"$exists": False}, "summary": {"$type": "string"}}
+SET_SUMMARY_LEN = [{"$set": {SUMMARY_LEN_FIELD: {"$strLenCP": "$summary"}}}]
+
+
+def min_length_filter(min_length: int) -> Dict[str, Any]:
+    """Indexed replacement for the $strLenCP > min_length predicate."""
+    return {SUMMARY_LEN_FIELD: {"$gt": min_length}}
+
+
+# ----------------------------------------------------------------------------
+# SYNC (pymongo)
+# ----------------------------------------------------------------------------
+def ensure_summary_indexes(collection) -> List[str]:
+    return [collection.create_index(keys) for keys in SUMMARY_INDEXES]
+
+
+def backfill_summary_len(collection) -> int:
+    """Set summary_len on every document that lacks it; returns the number updated."""
+    result = collection.update_many(MISSING_SUMMARY_LEN, SET_SUMMARY_LEN)
+    if result.modified_count:
+        logger.info(f"[SUMMARIES] summary_len set on {result.modified_count} documents")
+    return result.modified_count
+
+
+# ----------------------------------------------------------------------------
+# ASYNC (Motor)
+# ----------------------------------------------------------------------------
+async def aensure_summary_indexes(collection) -> List[str]:
+    return [await collection.create_index(keys) for keys in SUMMARY_INDEXES]
+
+
+async def abackfill_summary_len(collection) -> int:
+    result = await collection.update_many(MISSING_SUMMARY_LEN, SET_SUMMARY_LEN)
+    if result.modified_count:
+        logger.info(f"[SUMMARIES] summary_len set on {result.modified_count} documents")
+    return result.modified_count
+
+
+class BackfillThrottle:
+    """Lets a reader run the incremental backfill at most once per interval."""
+
+    def __init__(self, interval_seconds: float = 60.0):
+        self.interval_seconds = interval_seconds
+        self._last = None
+        self._lock = threading.Lock()
+
+    def due(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            if self._last is not None and now - self._last < self.interval_seconds:
+                return False
+            self._last = now
+            return True
+
+
+# ----------------------------------------------------------------------------
+# MIGRATION COMMAND
+# ----------------------------------------------------------------------------
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill summary_len and create summary indexes")
+    parser.add_argument("--uri", help="MongoDB URI (defaults to the app configuration)")
+    parser.add_argument("--database", help="Database name (defaults to the app configuration)")
+    parser.add_argument("--collection", default=None, help="Summaries collection (default: summaries)")
+    parser.add_argument("--dry-run", action="store_true", help="Only count documents missing summary_len")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    import pymongo
+
+    uri, database, collection_name = args.uri, args.database, args.collection
+    if not (uri and database and collection_name):
+        from .config import config
+        uri = uri or config.mongodb_connection_string
+        database = database or config.MONGODB_DATABASE
+        collection_name = collection_name or config.SUMMARIES_COLLECTION
+
+    client = pymongo.MongoClient(uri, serverSelectionTimeoutMS=10000)
+    try:
+        collection = client[database][collection_name]
+        missing = collection.count_documents(MISSING_SUMMARY_LEN)
+        logger.info(f"{missing} of {collection.estimated_document_count()} summaries lack {SUMMARY_LEN_FIELD}")
+        if args.dry_run:
+            return 0
+
+        updated = backfill_summary_len(collection)
+        names = ensure_summary_indexes(collection)
+        logger.info(f"✅ Backfilled {updated} summaries; indexes: {', '.join(names)}")
+        return 0
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
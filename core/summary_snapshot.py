@@ -0,0 +1,179 @@
+# core/summary_snapshot.py
+"""
+Versioned summary snapshots
+===========================
+
+Every daily standup used to fetch the latest summary, and every weekly interview
+the same 7-day set, straight from MongoDB, then re-parse them into fragments.
+Summaries change a few times a day, so sessions now share snapshots instead:
+
+- A cheap version probe (newest _id plus the collection's estimated count)
+  runs at most once per probe interval. While it is unchanged, sessions get
+  the cached snapshot without touching the summary queries.
+- A snapshot is reloaded when the version moves, or after max_age_seconds
+  regardless, which covers in-place edits and the sliding 7-day window.
+  When an age-only reload returns the same data, the derived artifacts are
+  carried over rather than rebuilt.
+- Reloads are single-flight: concurrent session starts await one load.
+- If a reload fails, the previous snapshot keeps serving.
+- snapshot.derive(name, fn) memoizes derived artifacts such as parsed
+  fragments or the processed interview context, so each is built once per
+  version and data. Artifacts built asynchronously (pre-generated questions) are
+  attached with set_derived() and read with get_derived().
+
+Snapshot data and derived artifacts are shared between sessions: treat them
+as read-only and copy before mutating.
+
+The module is config-agnostic: callers pass the collection and timings in.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+async def summary_version(collection) -> tuple:
+    """Newest _id and estimated document count: both index/metadata reads."""
+    latest = await collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+    count = await collection.estimated_document_count()
+    return (latest["_id"] if latest else None, count)
+
+
+class SummarySnapshot:
+    """Summary data loaded at one collection version, plus memoized derivations."""
+
+    __slots__ = ("key", "version", "data", "loaded_at", "_derived")
+
+    def __init__(self, key: Hashable, version: Any, data: Any):
+        self.key = key
+        self.version = version
+        self.data = data
+        self.loaded_at = time.monotonic()
+        self._derived: Dict[str, Any] = {}
+
+    def derive(self, name: str, fn: Callable[[Any], Any]) -> Any:
+        """fn(data), computed once per snapshot."""
+        if name not in self._derived:
+            self._derived[name] = fn(self.data)
+        return self._derived[name]
+
+    def get_derived(self, name: str, default: Any = None) -> Any:
+        """An artifact attached so far, without computing it."""
+        return self._derived.get(name, default)
+
+    def set_derived(self, name: str, value: Any):
+        """Attach an artifact built elsewhere (e.g. by a background job)."""
+        self._derived[name] = value
+
+
+class SummarySnapshotCache:
+    """Snapshots keyed by query, invalidated by a shared version probe."""
+
+    def __init__(self, probe: Callable[[], Awaitable[Any]], probe_interval_seconds: float = 5.0,
+                 max_age_seconds: float = 300.0):
+        self._probe = probe
+        self.probe_interval_seconds = probe_interval_seconds
+        self.max_age_seconds = max_age_seconds
+        self._version: Any = None
+        self._probed_at: Optional[float] = None
+        self._probe_task: Optional[asyncio.Future] = None
+        self._snapshots: Dict[Hashable, SummarySnapshot] = {}
+        self._loads: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"hits": 0, "loads": 0, "shared_loads": 0, "probes": 0,
+                      "probe_failures": 0, "load_failures": 0, "stale_served": 0, "derived_kept": 0}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> SummarySnapshot:
+        """Current snapshot for key; loader() runs only when it is missing or out of date."""
+        version = await self._current_version()
+        snapshot = self._snapshots.get(key)
+        if (snapshot is not None and version is not None and snapshot.version == version
+                and time.monotonic() - snapshot.loaded_at <= self.max_age_seconds):
+            self.stats["hits"] += 1
+            return snapshot
+
+        task = self._loads.get(key)
+        if task is None:
+            task = self._loads[key] = asyncio.ensure_future(self._load(key, loader, version))
+            task.add_done_callback(lambda done: self._loads.pop(key, None) if self._loads.get(key) is done else None)
+        else:
+            self.stats["shared_loads"] += 1
+        # Shielded so one cancelled session does not cancel the load for everyone else
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], version: Any) -> SummarySnapshot:
+        try:
+            data = await loader()
+        except Exception as e:
+            self.stats["load_failures"] += 1
+            stale = self._snapshots.get(key)
+            if stale is None:
+                raise
+            self.stats["stale_served"] += 1
+            logger.warning(f"⚠️ Summary snapshot {key!r} reload failed, serving previous: {e}")
+            return stale
+
+        snapshot = SummarySnapshot(key, version, data)
+        previous = self._snapshots.get(key)
+        if previous is not None and version is not None and previous.version == version and previous.data == data:
+            # Age-only reload of identical data: keep the derivations, and share the dict so
+            # background jobs still running against the previous snapshot land here too
+            snapshot._derived = previous._derived
+            self.stats["derived_kept"] += 1
+        self._snapshots[key] = snapshot
+        self.stats["loads"] += 1
+        logger.info(f"📦 Summary snapshot {key!r} loaded at version {version!r}")
+        return snapshot
+
+    async def _current_version(self) -> Any:
+        """Probe result, refreshed at most once per interval and shared by concurrent callers."""
+        if self._probed_at is not None and time.monotonic() - self._probed_at < self.probe_interval_seconds:
+            return self._version
+        if self._probe_task is None:
+            self._probe_task = asyncio.ensure_future(self._run_probe())
+        return await asyncio.shield(self._probe_task)
+
+    async def _run_probe(self) -> Any:
+        try:
+            self._version = await self._probe()
+            self.stats["probes"] += 1
+        except Exception as e:
+            # Unknown version: snapshots are reloaded (or served stale if that fails too)
+            self.stats["probe_failures"] += 1
+            logger.warning(f"⚠️ Summary version probe failed: {e}")
+            self._version = None
+        self._probed_at = time.monotonic()
+        self._probe_task = None
+        return self._version
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one snapshot (or all) so the next get() reloads."""
+        if key is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            **self.stats,
+            "version": repr(self._version),
+            "snapshots": {repr(key): round(now - s.loaded_at, 1) for key, s in self._snapshots.items()}
+        }
+
+
+_caches: Dict[str, SummarySnapshotCache] = {}
+
+
+def get_summary_snapshot_cache(collection, probe_interval_seconds: float = 5.0,
+                               max_age_seconds: float = 300.0) -> SummarySnapshotCache:
+    """One cache per summaries collection, so every sub-app in the process shares it."""
+    name = collection.full_name
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches[name] = SummarySnapshotCache(
+            lambda: summary_version(collection), probe_interval_seconds, max_age_seconds
+        )
+    return cache
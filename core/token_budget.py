@@ -0,0 +1,191 @@
+# core/token_budget.py
+"""
+Token-budgeted prompt packing
+=============================
+
+Prompt builders used to trim their inputs by raw character counts, which made
+the number of input tokens per LLM call unpredictable. This module packs prompt
+sections into a fixed token budget instead:
+
+- Each call type ("stage", "conversation", "evaluation", ...) has a total budget
+  (config.PROMPT_TOKEN_BUDGETS) split across its sections
+  (config.PROMPT_SECTION_SHARES). Budget left over by short sections is handed to
+  the sections that need it.
+- Sections are trimmed on sentence/line boundaries, keeping either the head
+  (context) or the tail (history) of the text.
+- Token counts and trimmed results are cached per fragment, so the content
+  context re-sent on every turn is only tokenized once.
+
+tiktoken is used when available; otherwise counts fall back to a
+~4 characters/token estimate so prompt building never fails.
+"""
+
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .config import config
+
+try:
+    import tiktoken
+    HAVE_TIKTOKEN = True
+except Exception:
+    HAVE_TIKTOKEN = False
+
+logger = logging.getLogger(__name__)
+
+# Sentence ends, or line breaks (transcript lines are their own units)
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|\n+')
+_ELLIPSIS = "..."
+
+
+class TokenBudgetPacker:
+    """Counts tokens and trims prompt sections to a per-call-type token budget."""
+
+    def __init__(self, model: Optional[str] = None, cache_size: int = None):
+        self.model = model or config.OPENAI_MODEL
+        cache_size = cache_size or getattr(config, "TOKEN_COUNT_CACHE_SIZE", 4096)
+        self._encoding = self._load_encoding(self.model)
+        # Per-instance caches keyed by fragment text
+        self.count_tokens = lru_cache(maxsize=cache_size)(self._count_tokens)
+        self.trim = lru_cache(maxsize=cache_size)(self._trim)
+
+    @staticmethod
+    def _load_encoding(model: str):
+        if not HAVE_TIKTOKEN:
+            logger.warning("[TOKENS] tiktoken not installed; using character estimate")
+            return None
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            try:
+                return tiktoken.get_encoding("o200k_base")
+            except Exception as e:
+                logger.warning(f"[TOKENS] Default encoding unavailable ({e}); using character estimate")
+                return None
+        except Exception as e:
+            logger.warning(f"[TOKENS] Encoding for {model} unavailable ({e}); using character estimate")
+            return None
+
+    # ------------------------------------------------------------------------
+    # COUNTING
+    # ------------------------------------------------------------------------
+    def _count_tokens(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / 4)
+
+    # ------------------------------------------------------------------------
+    # TRIMMING
+    # ------------------------------------------------------------------------
+    @staticmethod
+    def split_sentences(text: str) -> List[str]:
+        return [text[start:end].strip() for start, end in TokenBudgetPacker.sentence_spans(text)]
+
+    @staticmethod
+    def sentence_spans(text: str) -> List[Tuple[int, int]]:
+        """(start, end) offsets of each non-blank sentence, separators excluded."""
+        spans = []
+        start = 0
+        for match in _SENTENCE_BOUNDARY.finditer(text):
+            if text[start:match.start()].strip():
+                spans.append((start, match.start()))
+            start = match.end()
+        if text[start:].strip():
+            spans.append((start, len(text)))
+        return spans
+
+    def _hard_cut(self, text: str, max_tokens: int, keep: str) -> str:
+        """Cut a single oversized sentence at a token (or character) offset."""
+        if max_tokens <= 0:
+            return ""
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            kept = tokens[:max_tokens] if keep == "head" else tokens[-max_tokens:]
+            return self._encoding.decode(kept)
+        chars = max_tokens * 4
+        return text[:chars] if keep == "head" else text[-chars:]
+
+    def _trim(self, text: str, max_tokens: int, keep: str = "head") -> str:
+        """
+        Trim text to max_tokens on sentence boundaries.
+        keep="head" keeps the beginning (context), keep="tail" keeps the end (history).
+        """
+        if not text or max_tokens <= 0:
+            return ""
+        if self.count_tokens(text) <= max_tokens:
+            return text
+
+        spans = self.sentence_spans(text)
+        if keep == "tail":
+            spans.reverse()
+
+        budget = max_tokens - self.count_tokens(_ELLIPSIS)
+        used = 0
+        kept = 0
+        for start, end in spans:
+            # +1 for the separator that follows it
+            cost = self.count_tokens(text[start:end]) + 1
+            if used + cost > budget:
+                break
+            used += cost
+            kept += 1
+
+        if not kept:
+            start, end = spans[0]
+            cut = self._hard_cut(text[start:end], budget, keep)
+            return _ELLIPSIS + cut if keep == "tail" else cut + _ELLIPSIS
+
+        # Kept sentences are a contiguous run, so slice the original text and keep its separators
+        if keep == "tail":
+            return _ELLIPSIS + text[spans[kept - 1][0]:]
+        return text[:spans[kept - 1][1]] + _ELLIPSIS
+
+    # ------------------------------------------------------------------------
+    # PACKING
+    # ------------------------------------------------------------------------
+    def allocate(self, call_type: str, sections: Dict[str, str]) -> Dict[str, int]:
+        """Split the call type's total budget across sections, redistributing slack."""
+        total = config.PROMPT_TOKEN_BUDGETS[call_type]
+        shares = config.PROMPT_SECTION_SHARES[call_type]
+        weights = {name: shares.get(name, 0.0) for name in sections}
+        weight_sum = sum(weights.values()) or 1.0
+
+        budgets = {name: int(total * w / weight_sum) for name, w in weights.items()}
+        needs = {name: self.count_tokens(text or "") for name, text in sections.items()}
+
+        # Sections that fit hand their unused budget to the ones that overflow
+        slack = sum(max(budgets[n] - needs[n], 0) for n in sections)
+        overflowing = {n: weights[n] for n in sections if needs[n] > budgets[n]}
+        over_sum = sum(overflowing.values())
+        if slack and over_sum:
+            for name in sections:
+                if name not in overflowing:
+                    budgets[name] = needs[name]
+            for name, w in overflowing.items():
+                budgets[name] += int(slack * w / over_sum)
+        return budgets
+
+    def pack(self, call_type: str, sections: Dict[str, str],
+             keep: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Return sections trimmed to the call type's budget."""
+        keep = keep or {}
+        budgets = self.allocate(call_type, sections)
+        return {
+            name: self.trim(text or "", budgets[name], keep.get(name, "head"))
+            for name, text in sections.items()
+        }
+
+
+_token_packer: Optional[TokenBudgetPacker] = None
+
+
+def get_token_packer() -> TokenBudgetPacker:
+    global _token_packer
+    if _token_packer is None:
+        _token_packer = TokenBudgetPacker()
+    return _token_packer
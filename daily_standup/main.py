@@ -62,9 +62,10 @@ class UltraFastSessionManager:
         test_id = f"standup_{int(time.time())}"
         try:
             student_info_task = asyncio.create_task(self.db_manager.get_student_info_fast())
-            summary_task = asyncio.create_task(self.db_manager.get_summary_fast())
+            summary_task = asyncio.create_task(self.db_manager.get_summary_snapshot())
             student_id, first_name, last_name, session_key = await student_info_task
-            summary = await summary_task
+            summary_snapshot = await summary_task
+            summary = summary_snapshot.data
 
             if not summary or len(summary.strip()) < 50:
                 raise Exception("Invalid summary retrieved from database")
@@ -91,9 +92,11 @@ class UltraFastSessionManager:
             session_data.awaiting_user = False  # Track if we’re waiting for user’s final reply
 
             fragment_manager = SummaryManager(shared_clients, session_data)
-            if not fragment_manager.initialize_fragments(summary):
+            if not fragment_manager.initialize_from_snapshot(summary_snapshot):
                 raise Exception("Failed to initialize fragments from summary")
             session_data.summary_manager = fragment_manager
+            # No-op once this summary version's base questions exist or are being generated
+            self.conversation_manager.pregenerate_base_questions(summary_snapshot)
 
             # ⬇️ PIN ONE REFERENCE VOICE FOR THIS SESSION
             self.tts_processor.start_session(session_data.session_id)
@@ -439,6 +442,8 @@ async def startup_event():
             conn = db_manager.get_mysql_connection()
             conn.close()
             logger.info("MySQL connection test successful")
+            students = await db_manager.student_directory.arefresh()
+            logger.info("Student directory loaded: %s students", students)
         except Exception as e:
             logger.error("MySQL connection test failed: %s", e)
             raise Exception(f"MySQL connection failed: {e}")
@@ -446,10 +451,19 @@ async def startup_event():
         try:
             await db_manager.get_mongo_client()
             logger.info("MongoDB connection test successful")
+            # Replays results a previous run journaled but never flushed
+            session_manager.db_manager.start_result_journals()
         except Exception as e:
             logger.error("MongoDB connection test failed: %s", e)
             raise Exception(f"MongoDB connection failed: {e}")
 
+        try:
+            snapshot = await db_manager.get_summary_snapshot()
+            session_manager.conversation_manager.pregenerate_base_questions(snapshot)
+        except Exception as e:
+            # Sessions still work without pre-generated questions; the first one retries
+            logger.warning("Base question pre-generation not started: %s", e)
+
         logger.info("All database connections verified")
     except Exception as e:
         logger.error("Startup failed: %s", e)
@@ -0,0 +1,17 @@
+# tests/conftest.py
+import os
+import sys
+import types
+from pathlib import Path
+
+# Config modules validate these on import; tests never reach the real services
+for _name in ("GROQ_API_KEY", "OPENAI_API_KEY", "MONGO_USER", "MONGO_PASSWORD"):
+    os.environ.setdefault(_name, "test")
+os.environ.setdefault("LLM_CACHE_REDIS_URL", "")
+
+# weekend_mocktest/__init__.py builds the FastAPI app, whose routes connect to
+# MongoDB on import. Register the bare package so its modules import on their own.
+if "weekend_mocktest" not in sys.modules:
+    _package = types.ModuleType("weekend_mocktest")
+    _package.__path__ = [str(Path(__file__).resolve().parent.parent / "weekend_mocktest")]
+    sys.modules["weekend_mocktest"] = _package
@@ -0,0 +1,74 @@
+# tests/test_base_questions.py
+import asyncio
+
+from core.ai_services import DS_OptimizedConversationManager
+from core.summary_snapshot import SummarySnapshot
+
+SUMMARY = "1. Docker networking\nBridge and host networks.\n2. Kafka consumers\nConsumer groups and offsets."
+
+
+def make_manager(reply):
+    manager = DS_OptimizedConversationManager.__new__(DS_OptimizedConversationManager)
+
+    def call(prompt):
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    manager._sync_openai_call = call
+    return manager
+
+
+def test_base_questions_are_attached_to_snapshot():
+    snapshot = SummarySnapshot("latest", 1, SUMMARY)
+    manager = make_manager("1. How do bridge networks isolate containers?\n2. When would you use host networking?")
+
+    async def run():
+        return await manager.pregenerate_base_questions(snapshot)
+
+    result = asyncio.run(run())
+    assert set(result) == {"1. Docker networking", "2. Kafka consumers"}
+    assert snapshot.get_derived("ds_base_questions") == result
+
+
+def test_failed_job_stores_nothing_and_can_retry():
+    snapshot = SummarySnapshot("latest", 1, SUMMARY)
+
+    async def run(manager):
+        return await manager.pregenerate_base_questions(snapshot)
+
+    assert asyncio.run(run(make_manager(RuntimeError("OpenAI API failed")))) == {}
+    assert snapshot.get_derived("ds_base_questions") is None
+    assert snapshot.get_derived("ds_base_questions_task") is None
+
+    # The next session start runs the job again
+    assert asyncio.run(run(make_manager("1. What is a consumer group?")))
+    assert snapshot.get_derived("ds_base_questions")
+
+
+def test_age_only_reload_does_not_regenerate():
+    from core.summary_snapshot import SummarySnapshotCache
+
+    async def probe():
+        return 1
+
+    async def loader():
+        return SUMMARY
+
+    cache = SummarySnapshotCache(probe, probe_interval_seconds=0.0, max_age_seconds=0.0)
+    calls = []
+    manager = make_manager("1. How do bridge networks isolate containers?")
+    reply = manager._sync_openai_call
+    manager._sync_openai_call = lambda prompt: calls.append(prompt) or reply(prompt)
+
+    async def run():
+        first = await cache.get("latest", loader)
+        await manager.pregenerate_base_questions(first)
+        await asyncio.sleep(0.001)
+        second = await cache.get("latest", loader)
+        return second, manager.pregenerate_base_questions(second)
+
+    second, task = asyncio.run(run())
+    assert task is None
+    assert len(calls) == 2
+    assert set(second.get_derived("ds_base_questions")) == {"1. Docker networking", "2. Kafka consumers"}
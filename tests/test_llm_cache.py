@@ -0,0 +1,92 @@
+# tests/test_llm_cache.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.llm_cache import LLMResponseCache
+
+
+def make_cache():
+    return LLMResponseCache(namespace="test", max_entries=8, ttl_seconds=60)
+
+
+def test_key_depends_on_request_content():
+    cache = make_cache()
+    messages = [{"role": "user", "content": "evaluate"}]
+    assert cache.make_key("m", messages, 0.1, 100) == cache.make_key("m", list(messages), 0.1, 100)
+    assert cache.make_key("m", messages, 0.1, 100) != cache.make_key("m", messages, 0.2, 100)
+
+
+def test_concurrent_async_callers_share_one_call():
+    cache = make_cache()
+    calls = []
+
+    async def provider():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"content": "ok"}
+
+    async def run():
+        return await asyncio.gather(*[cache.aget_or_call("k", provider) for _ in range(5)])
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result == {"content": "ok"} for result in results)
+    assert cache.stats["coalesced"] == 4
+
+
+def test_concurrent_threads_share_one_call():
+    cache = make_cache()
+    calls = []
+    results = []
+
+    def provider():
+        calls.append(1)
+        time.sleep(0.05)
+        return "ok"
+
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_call("k", provider))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == ["ok"] * 5
+
+
+def test_failures_are_not_cached():
+    cache = make_cache()
+
+    async def failing():
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.aget_or_call("k", failing))
+    assert cache.get("k") is None
+
+
+def test_rejected_results_are_not_cached():
+    cache = make_cache()
+
+    async def provider():
+        return {"parse_fallback": True}
+
+    result = asyncio.run(cache.aget_or_call("k", provider, cacheable=lambda r: not r["parse_fallback"]))
+    assert result == {"parse_fallback": True}
+    assert cache.get("k") is None
+
+
+def test_interview_cache_is_built_lazily():
+    from core import ai_services
+    # Importing the module must not construct the cache (and connect to Redis)
+    assert ai_services._wi_response_cache is None
+
+
+def test_structured_replies_without_valid_scores_are_unusable():
+    from core.ai_services import WI_EvaluationEngine
+    valid = '{"technical_score": 7, "communication_score": 6, "behavioral_score": 8, "overall_score": 7}'
+    assert WI_EvaluationEngine._has_valid_scores(valid)
+    assert not WI_EvaluationEngine._has_valid_scores('{"technical_score": 7}')
+    assert not WI_EvaluationEngine._has_valid_scores('{"evaluation": "trunc')
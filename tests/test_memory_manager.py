@@ -0,0 +1,61 @@
+# tests/test_memory_manager.py
+import threading
+import time
+
+import pytest
+
+from weekend_mocktest.core.config import config
+from weekend_mocktest.core.utils import MemoryManager
+
+QUESTIONS = [{"question": f"Question {i}", "options": None} for i in range(1, 4)]
+
+
+@pytest.fixture
+def manager():
+    manager = MemoryManager()
+    yield manager
+    manager.stop()
+
+
+def test_due_tests_expire_and_rescheduled_entries_are_skipped(manager):
+    expired = manager.create_test("dev", QUESTIONS)
+    rescheduled = manager.create_test("dev", QUESTIONS)
+    past = time.time() - config.TEST_SESSION_TIMEOUT - 1
+    manager.reset_clock(expired, past)
+    manager.reset_clock(rescheduled, past)
+    # Moved back into the future: its earlier heap entry is now stale
+    manager.reset_clock(rescheduled, time.time())
+
+    manager.cleanup_expired_data()
+    assert manager.get_test(expired) is None
+    assert manager.get_test(rescheduled) is not None
+    assert manager.stats["tests_expired"] == 1
+
+
+def test_expiry_thread_wakes_for_an_earlier_deadline(manager):
+    test_id = manager.create_test("dev", QUESTIONS)
+    manager.reset_clock(test_id, time.time() - config.TEST_SESSION_TIMEOUT + 0.2)
+    deadline = time.time() + 5
+    while manager.get_test(test_id) is not None and time.time() < deadline:
+        time.sleep(0.05)
+    assert manager.get_test(test_id) is None
+
+
+def test_question_cache_expires(manager):
+    manager.cache_questions("dev:today", QUESTIONS)
+    assert manager.get_cached_questions("dev:today") == QUESTIONS
+    manager.question_cache["dev:today"]["expires_at"] = time.time() - 1
+    assert manager.get_cached_questions("dev:today") is None
+
+
+def test_concurrent_submissions_advance_once(manager):
+    test_id = manager.create_test("dev", QUESTIONS)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.submit_answer(test_id, 1, "answer")))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results.count(True) == 1
+    assert manager.get_test(test_id)["current_question"] == 2
@@ -0,0 +1,119 @@
+# tests/test_mocktest_batch_submission.py
+import asyncio
+import time
+
+import pytest
+from pydantic import ValidationError
+
+# test_service imports the MongoDB/SQL Server database layer
+pytest.importorskip("pyodbc", exc_type=ImportError)
+
+from weekend_mocktest.core.config import config
+from weekend_mocktest.core.utils import memory_manager
+from weekend_mocktest.models.schemas import SubmitAnswersBatchRequest
+from weekend_mocktest.services import test_service
+
+TIME_LIMIT = config.DEV_TIME_LIMIT
+GRACE = config.BATCH_SUBMIT_GRACE_SECONDS
+SKEW = config.BATCH_CLOCK_SKEW_SECONDS
+
+
+@pytest.fixture
+def service():
+    # Validation paths only; no AI or database clients
+    return test_service.TestService.__new__(test_service.TestService)
+
+
+@pytest.fixture
+def started_test():
+    """Full-delivery dev test with three questions; returns (test_id, started_at)"""
+    questions = [{"question": f"Question {i} text", "options": None} for i in range(1, 4)]
+    test_id = memory_manager.create_test("dev", questions, delivery_mode="full")
+    yield test_id, memory_manager.get_test(test_id)["started_at"]
+    memory_manager.cleanup_test(test_id)
+
+
+def start_at(test_id, started_at):
+    memory_manager.reset_clock(test_id, started_at)
+    return memory_manager.get_test(test_id)
+
+
+def answer(question_number, submitted_at, text="print('answer')"):
+    return {"question_number": question_number, "answer": text, "submitted_at": submitted_at}
+
+
+# ---- server-side deadline ---------------------------------------------------
+
+def test_on_time_batch_passes(service, started_test):
+    test_id, _ = started_test
+    started_at = time.time() - 30
+    test_data = start_at(test_id, started_at)
+    service._validate_batch_timing(test_id, test_data, [answer(1, started_at + 10), answer(2, started_at + 20)])
+
+
+def test_backdated_batch_after_deadline_is_rejected(service, started_test):
+    test_id, _ = started_test
+    # Started long ago; client claims it answered quickly
+    started_at = time.time() - (3 * TIME_LIMIT + GRACE + SKEW + 60)
+    test_data = start_at(test_id, started_at)
+    backdated = [answer(n, started_at + n) for n in (1, 2, 3)]
+    with pytest.raises(ValueError, match="after the time limit"):
+        service._validate_batch_timing(test_id, test_data, backdated)
+
+
+def test_late_checkpoint_is_rejected(service, started_test):
+    test_id, _ = started_test
+    started_at = time.time() - (2 * TIME_LIMIT + GRACE + SKEW + 60)
+    test_data = start_at(test_id, started_at)
+    # First checkpoint was accepted in time
+    assert memory_manager.submit_answer(test_id, 1, "print('one')", submitted_at=started_at + 10)
+    with pytest.raises(ValueError, match="after the time limit for question 2"):
+        service._validate_batch_timing(test_id, test_data, [answer(2, started_at + 20)])
+
+
+def test_client_timestamp_checks_still_apply(service, started_test):
+    test_id, _ = started_test
+    started_at = time.time() - 30
+    test_data = start_at(test_id, started_at)
+    with pytest.raises(ValueError, match="in the future"):
+        service._validate_batch_timing(test_id, test_data, [answer(1, time.time() + 3600)])
+    with pytest.raises(ValueError, match="out of order"):
+        service._validate_batch_timing(test_id, test_data, [answer(1, started_at - 3600)])
+
+
+# ---- request validation -----------------------------------------------------
+
+def test_request_accepts_camel_case_keys():
+    request = SubmitAnswersBatchRequest.model_validate({
+        "testId": "t-1",
+        "answers": [{"questionNumber": "2", "answer": "B", "submittedAt": 12.5}]
+    })
+    assert request.answers[0].question_number == 2
+    assert request.answers[0].submitted_at == 12.5
+
+
+@pytest.mark.parametrize("item", [
+    {"answer": "A", "submitted_at": 1.0},
+    {"question_number": None, "answer": "A", "submitted_at": 1.0},
+    {"question_number": "two", "answer": "A", "submitted_at": 1.0},
+    {"question_number": 0, "answer": "A", "submitted_at": 1.0},
+    {"question_number": 1, "answer": "A", "submitted_at": "soon"},
+])
+def test_request_rejects_malformed_items(item):
+    with pytest.raises(ValidationError):
+        SubmitAnswersBatchRequest.model_validate({"test_id": "t-1", "answers": [item]})
+
+
+def test_request_rejects_duplicate_question_numbers():
+    with pytest.raises(ValidationError, match="Duplicate question numbers"):
+        SubmitAnswersBatchRequest.model_validate({
+            "test_id": "t-1",
+            "answers": [answer(1, 1.0), answer(1, 2.0)]
+        })
+
+
+def test_service_rejects_question_number_beyond_test(service, started_test):
+    test_id, started_at = started_test
+    with pytest.raises(ValueError, match="Invalid question number"):
+        asyncio.run(service.submit_answers_batch(test_id, [answer(4, started_at + 1)]))
+    assert memory_manager.get_test_answers(test_id) == []
@@ -0,0 +1,31 @@
+# tests/test_mocktest_pagination.py
+import pytest
+
+from weekend_mocktest.core.utils import PaginationUtils
+
+
+def test_cursor_round_trip():
+    position = {"t": 1792405768.25, "id": "0b9c1e6a-test"}
+    cursor = PaginationUtils.encode_cursor(position)
+    assert "=" not in cursor
+    assert PaginationUtils.decode_cursor(cursor) == position
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "WzEsMl0", "bnVsbA"])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        PaginationUtils.decode_cursor(cursor)
+
+
+def test_keyset_filter_continues_after_the_cursor():
+    pytest.importorskip("pyodbc", exc_type=ImportError)
+    from weekend_mocktest.core.database import DatabaseManager
+
+    cursor = PaginationUtils.encode_cursor({"t": 100.0, "id": "t-5"})
+    assert DatabaseManager._keyset_filter(cursor, "timestamp", "test_id") == {"$or": [
+        {"timestamp": {"$lt": 100.0}},
+        {"timestamp": 100.0, "test_id": {"$lt": "t-5"}}
+    ]}
+    assert DatabaseManager._keyset_filter(None, "timestamp", "test_id") == {}
+    with pytest.raises(ValueError):
+        DatabaseManager._keyset_filter(PaginationUtils.encode_cursor({"t": 1}), "timestamp", "test_id")
@@ -0,0 +1,72 @@
+# tests/test_mocktest_question_generation.py
+import asyncio
+
+import pytest
+
+from weekend_mocktest.core.ai_services import AIService
+
+
+GIL_QUESTION = "Describe the GIL and how it affects CPU-bound Python threads in a web service."
+
+
+def question(text, number=1):
+    return {"question_number": number, "title": f"Question {number}", "question": text}
+
+
+def make_service(responses):
+    """AIService whose LLM call returns (or raises) the queued responses in order"""
+    service = AIService.__new__(AIService)
+    service.response_cache = None
+    queue = list(responses)
+
+    async def call_llm(prompt, max_tokens, temperature=None):
+        result = queue.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    service._call_llm_with_retries = call_llm
+    return service
+
+
+def dev_response(*texts):
+    return "\n".join(
+        f"=== QUESTION {i} ===\n## Title: Q{i}\n## Difficulty: Easy\n## Type: Practical\n## Question:\n{text}"
+        for i, text in enumerate(texts, 1)
+    )
+
+
+def test_dedupe_drops_near_duplicates_only():
+    questions = [
+        question("Explain how a Python dictionary handles hash collisions."),
+        question("Explain how a python dictionary handles hash collisions?"),
+        question("Write a SQL query that returns the second highest salary."),
+    ]
+    unique = AIService.dedupe_questions(questions)
+    assert [q["question"] for q in unique] == [questions[0]["question"], questions[2]["question"]]
+
+
+def test_dedupe_against_existing_returns_only_new_questions():
+    existing = [question("Explain how a Python dictionary handles hash collisions.")]
+    generated = [
+        question("Explain how a python dictionary handles hash collisions?"),
+        question("Write a SQL query that returns the second highest salary."),
+        question("Write a SQL query that returns the second highest salary!"),
+    ]
+    unique = AIService.dedupe_questions(generated, existing)
+    assert [q["question"] for q in unique] == [generated[1]["question"]]
+
+
+def test_shard_keeps_parsed_questions_when_retry_fails():
+    service = make_service([
+        dev_response(GIL_QUESTION),
+        RuntimeError("LLM failed after 3 attempts"),
+    ])
+    questions = asyncio.run(service._generate_shard("dev", "context", 3, 1))
+    assert [q["question"] for q in questions] == [GIL_QUESTION]
+
+
+def test_shard_without_any_questions_still_fails():
+    service = make_service([RuntimeError("LLM failed after 3 attempts")])
+    with pytest.raises(RuntimeError):
+        asyncio.run(service._generate_shard("dev", "context", 3, 1))
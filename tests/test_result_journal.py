@@ -0,0 +1,120 @@
+# tests/test_result_journal.py
+import threading
+
+import pytest
+
+from core.result_journal import (
+    HAVE_ZSTD, ResultJournal, insert_many_ignoring_duplicates, upsert_many_by_key
+)
+
+
+class FakeResults:
+    """Minimal collection: documents by _id, with insert_many / bulk_write(ReplaceOne) semantics"""
+
+    def __init__(self):
+        self.docs = {}
+
+    def insert_many(self, docs, ordered=False):
+        from pymongo.errors import BulkWriteError
+        errors = []
+        for index, doc in enumerate(docs):
+            if doc["_id"] in self.docs:
+                errors.append({"index": index, "code": 11000})
+            else:
+                self.docs[doc["_id"]] = dict(doc)
+        if errors:
+            raise BulkWriteError({"writeErrors": errors})
+
+    def bulk_write(self, operations, ordered=True):
+        for operation in operations:
+            match = next((_id for _id, doc in self.docs.items()
+                          if all(doc.get(k) == v for k, v in operation._filter.items())), None)
+            if match is None:
+                match = operation._doc.get("_id", operation._filter.get("_id", f"auto-{len(self.docs)}"))
+            self.docs[match] = {**operation._doc, "_id": match}
+
+    def find(self, **query):
+        return [doc for doc in self.docs.values() if all(doc.get(k) == v for k, v in query.items())]
+
+
+def make_journal(tmp_path, sink, **options):
+    options.setdefault("flush_interval_seconds", 0.01)
+    options.setdefault("fsync_interval_seconds", 0)
+    options.setdefault("retry_max_seconds", 0.05)
+    return ResultJournal(tmp_path, "results", sink, key_field="session_id", **options).start()
+
+
+def segments(tmp_path):
+    return sorted(path.name for path in tmp_path.glob("results-*"))
+
+
+def test_appended_records_reach_the_sink_and_segments_are_removed(tmp_path):
+    results = FakeResults()
+    journal = make_journal(tmp_path, lambda docs: upsert_many_by_key(results, docs, "session_id"))
+    for i in range(5):
+        journal.append({"session_id": f"s{i}", "score": i}).result(timeout=5)
+    journal.stop()
+    assert sorted(doc["session_id"] for doc in results.docs.values()) == [f"s{i}" for i in range(5)]
+    assert segments(tmp_path) == []
+
+
+def test_pending_serves_records_until_flushed(tmp_path):
+    release = threading.Event()
+    flushed = []
+
+    def slow_sink(docs):
+        release.wait(5)
+        flushed.extend(docs)
+
+    journal = make_journal(tmp_path, slow_sink)
+    journal.append({"session_id": "s1", "score": 7}).result(timeout=5)
+    assert journal.pending("s1") == {"session_id": "s1", "score": 7}
+    release.set()
+    journal.stop()
+    assert journal.pending("s1") is None
+    assert [doc["session_id"] for doc in flushed] == ["s1"]
+
+
+@pytest.mark.parametrize("compress", [False, pytest.param(True, marks=pytest.mark.skipif(
+    not HAVE_ZSTD, reason="zstandard not installed"))])
+def test_unflushed_records_are_replayed_on_restart(tmp_path, compress):
+    def database_down(docs):
+        raise RuntimeError("database down")
+
+    journal = make_journal(tmp_path, database_down, compress=compress)
+    journal.append({"session_id": "s1", "score": 1}).result(timeout=5)
+    journal.append({"session_id": "s2", "score": 2}).result(timeout=5)
+    journal.stop()
+    assert segments(tmp_path)
+
+    results = FakeResults()
+    replay = make_journal(tmp_path, lambda docs: upsert_many_by_key(results, docs, "session_id"), compress=compress)
+    assert replay.stats["replayed"] == 2
+    assert replay.pending("s2") == {"session_id": "s2", "score": 2}
+    replay.stop()
+    assert sorted(doc["session_id"] for doc in results.docs.values()) == ["s1", "s2"]
+    assert segments(tmp_path) == []
+
+
+def test_replay_after_partial_flush_does_not_duplicate(tmp_path):
+    results = FakeResults()
+    docs = [{"_id": "a", "test_id": "t1"}, {"_id": "b", "test_id": "t2"}]
+    assert insert_many_ignoring_duplicates(results, docs[:1]) == docs[:1]
+    # Crash before the journal recorded the flush: the whole batch is replayed
+    assert insert_many_ignoring_duplicates(results, docs) == docs[1:]
+    assert sorted(results.docs) == ["a", "b"]
+
+
+def test_repeated_saves_of_a_session_collapse_into_one_document(tmp_path):
+    results = FakeResults()
+    journal = make_journal(tmp_path, lambda docs: upsert_many_by_key(results, docs, "session_id"))
+    journal.append({"session_id": "s1", "status": "error"}).result(timeout=5)
+    journal.append({"session_id": "s1", "status": "completed"}).result(timeout=5)
+    journal.stop()
+
+    # Replaying the same records again changes nothing
+    upsert_many_by_key(results, [{"_id": "x", "session_id": "s1", "status": "completed"}], "session_id")
+
+    saved = results.find(session_id="s1")
+    assert len(saved) == 1
+    assert saved[0]["status"] == "completed"
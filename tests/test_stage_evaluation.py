@@ -0,0 +1,38 @@
+# tests/test_stage_evaluation.py
+import asyncio
+import time
+
+from core.ai_services import WI_InterviewSession, WI_InterviewStage, WI_StageEvaluator
+
+SCORES = {"technical_score": 7.0, "communication_score": 8.0, "behavioral_score": 7.0, "overall_score": 7.5}
+
+
+class FakeEngine:
+    def __init__(self):
+        self.calls = 0
+
+    async def evaluate(self, messages, text_field, transcript, max_tokens):
+        self.calls += 1
+        return "- Explained Kafka consumer groups with a real incident", dict(SCORES)
+
+
+def make_session():
+    now = time.time()
+    session = WI_InterviewSession("s-1", "t-1", 1, "Asha", "key", now, now)
+    session.current_stage = WI_InterviewStage.TECHNICAL
+    session.add_exchange("How do consumer groups rebalance?")
+    session.update_last_response("Partitions are reassigned when a consumer joins or leaves.", 0.9)
+    return session
+
+
+def test_stage_notes_double_as_round_digest():
+    engine = FakeEngine()
+    evaluator = WI_StageEvaluator(client_manager=None, engine=engine)
+    session = make_session()
+
+    result = asyncio.run(evaluator.evaluate_stage(session, WI_InterviewStage.TECHNICAL))
+
+    assert engine.calls == 1
+    assert session.stage_evaluations["technical"] == result
+    assert session.round_digests["technical"] == {"text": result["notes"], "covered": 1}
+    assert "Technical round summary: - Explained Kafka" in session.get_compact_history()
@@ -0,0 +1,71 @@
+# tests/test_summary_snapshot.py
+import asyncio
+
+from core.summary_snapshot import SummarySnapshotCache
+
+
+def make_cache(version=1, max_age_seconds=300.0):
+    state = {"version": version}
+
+    async def probe():
+        return state["version"]
+
+    cache = SummarySnapshotCache(probe, probe_interval_seconds=0.0, max_age_seconds=max_age_seconds)
+    return cache, state
+
+
+def loader_for(data):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return data["value"]
+
+    return loader, calls
+
+
+def test_age_only_reload_keeps_derived_artifacts():
+    # max_age 0: every get() reloads although the version never moves
+    cache, _ = make_cache(max_age_seconds=0.0)
+    data = {"value": [{"summary": "Docker networking"}]}
+    loader, calls = loader_for(data)
+    parsed = []
+
+    async def run():
+        first = await cache.get("latest", loader)
+        first.derive("fragments", lambda d: parsed.append(1) or d)
+        first.set_derived("base_questions", {"Docker": ["Q1"]})
+        await asyncio.sleep(0.001)
+        second = await cache.get("latest", loader)
+        second.derive("fragments", lambda d: parsed.append(1) or d)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert second is not first
+    assert len(calls) == 2
+    assert len(parsed) == 1
+    assert second.get_derived("base_questions") == {"Docker": ["Q1"]}
+    assert cache.stats["derived_kept"] == 1
+
+
+def test_changed_data_or_version_rebuilds_derived_artifacts():
+    cache, state = make_cache(max_age_seconds=0.0)
+    data = {"value": [{"summary": "Docker networking"}]}
+    loader, _ = loader_for(data)
+
+    async def run():
+        first = await cache.get("latest", loader)
+        first.set_derived("base_questions", {"Docker": ["Q1"]})
+
+        data["value"] = [{"summary": "Kafka consumers"}]
+        edited = await cache.get("latest", loader)
+        edited.set_derived("base_questions", {"Kafka": ["Q2"]})
+
+        state["version"] = 2
+        moved = await cache.get("latest", loader)
+        return edited, moved
+
+    edited, moved = asyncio.run(run())
+    assert edited.get_derived("base_questions") == {"Kafka": ["Q2"]}
+    assert moved.get_derived("base_questions") is None
+    assert cache.stats["derived_kept"] == 0
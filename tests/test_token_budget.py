@@ -0,0 +1,47 @@
+# tests/test_token_budget.py
+from core.token_budget import TokenBudgetPacker
+
+TRANSCRIPT = "Opening question.  First answer!\n\nSecond question\nSecond answer. Final round answer here."
+
+
+def make_packer():
+    packer = TokenBudgetPacker()
+    # Character estimate (4 chars/token) keeps the numbers predictable with or without tiktoken
+    packer._encoding = None
+    return packer
+
+
+def test_text_within_budget_is_unchanged():
+    assert make_packer().trim(TRANSCRIPT, 1000, "head") == TRANSCRIPT
+
+
+def test_head_keeps_beginning_with_original_separators():
+    trimmed = make_packer().trim(TRANSCRIPT, 12, "head")
+    assert trimmed == "Opening question.  First answer!..."
+
+
+def test_tail_keeps_end_with_original_separators():
+    trimmed = make_packer().trim(TRANSCRIPT, 14, "tail")
+    assert trimmed.startswith("...")
+    assert trimmed.endswith("Final round answer here.")
+    assert trimmed[3:] in TRANSCRIPT
+
+
+def test_oversized_sentence_is_hard_cut():
+    trimmed = make_packer().trim("x" * 400, 5, "tail")
+    assert trimmed.startswith("...") and len(trimmed) < 400
+
+
+def test_allocate_hands_slack_to_overflowing_section():
+    packer = make_packer()
+    budgets = packer.allocate("evaluation", {"conversation_log": "word " * 5000, "content_context": "short"})
+    assert budgets["conversation_log"] > budgets["content_context"]
+    assert sum(budgets.values()) <= 2500 + 1
+
+
+def test_evaluation_prompt_keeps_final_rounds():
+    from core import prompts
+    log = "\n".join(f"Round {i}: answer {i}." for i in range(2000))
+    prompt = prompts.build_evaluation_prompt("Student", 10.0, ["technical"], log, "context")
+    assert "Round 1999: answer 1999." in prompt
+    assert "Round 0: answer 0." not in prompt
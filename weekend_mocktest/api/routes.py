@@ -1,18 +1,23 @@
 # weekend_mocktest/api/routes.py
 import logging
+from datetime import datetime
+from typing import Optional
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 import io
 
 from ..services.test_service import get_test_service
 from ..services.pdf_service import get_pdf_service
+from ..services.exam_scheduler import get_exam_scheduler
 from ..core.utils import DateTimeUtils
+from ..models.schemas import SubmitAnswersBatchRequest
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 test_service = get_test_service()
 pdf_service = get_pdf_service()
+exam_scheduler = get_exam_scheduler()
 
 @router.get("/")
 async def home():
@@ -48,10 +53,14 @@ async def start_test(request_data: dict):
         else:
             raise ValueError(f"Invalid user_type: {user_type}")
         
+        # "full" returns every question up front for batched submission
+        delivery_mode = request_data.get("delivery_mode", request_data.get("deliveryMode", "sequential"))
+        
         logger.info(f"Starting test for user_type: {user_type}")
         
-        # Start test via service
-        test_response = await test_service.start_test(user_type)
+        # Start test via service (claims a pre-provisioned record during a scheduled exam)
+        event_id = request_data.get("event_id") or request_data.get("eventId")
+        test_response = await test_service.start_test(user_type, delivery_mode, event_id)
         
         # Create standardized response that matches frontend expectations
         response = {
@@ -90,6 +99,21 @@ async def start_test(request_data: dict):
             }
         }
         
+        if test_response.questions is not None:
+            response["deliveryMode"] = response["delivery_mode"] = delivery_mode
+            response["questions"] = [
+                {
+                    "questionNumber": q["question_number"],
+                    "questionHtml": q["question_html"],
+                    "options": q["options"],
+                    "timeLimit": q["time_limit"],
+                    "question_number": q["question_number"],
+                    "question_html": q["question_html"],
+                    "time_limit": q["time_limit"]
+                }
+                for q in test_response.questions
+            ]
+        
         logger.info(f"Test started successfully: {test_response.test_id}")
         return response
         
@@ -158,6 +182,51 @@ async def submit_answer(request_data: dict):
         logger.error(f"Answer submission failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/api/test/submit-batch")
+async def submit_answers_batch(request_data: SubmitAnswersBatchRequest):
+    """Submit all answers (or a checkpoint batch) for a test started with delivery_mode "full" """
+    try:
+        # Item types, question_number >= 1 and uniqueness are checked by the request model (400 on failure)
+        test_id = request_data.test_id
+        answers = [item.model_dump() for item in request_data.answers]
+        
+        logger.info(f"Submitting {len(answers)} answers for test {test_id}")
+        
+        response = await test_service.submit_answers_batch(test_id, answers)
+        
+        if response.test_completed:
+            return {
+                # Primary fields
+                "testCompleted": True,
+                "score": response.score,
+                "totalQuestions": response.total_questions,
+                "analytics": response.analytics,
+                
+                # Backward compatibility
+                "test_completed": True,
+                "total_questions": response.total_questions
+            }
+        
+        return {
+            # Primary fields
+            "testCompleted": False,
+            "accepted": response.accepted,
+            "nextQuestionNumber": response.next_question_number,
+            "totalQuestions": response.total_questions,
+            
+            # Backward compatibility
+            "test_completed": False,
+            "next_question_number": response.next_question_number,
+            "total_questions": response.total_questions
+        }
+        
+    except ValueError as e:
+        logger.error(f"Batch submission rejected: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch submission failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/api/test/results/{test_id}")
 async def get_test_results(test_id: str):
     """Get test results - Frontend compatible"""
@@ -213,36 +282,60 @@ async def download_pdf(test_id: str):
 # ==================== ADMIN ENDPOINTS ====================
 
 @router.get("/api/tests")
-async def get_all_tests():
-    """Get all test results"""
+async def get_all_tests(limit: int = 50, cursor: Optional[str] = None):
+    """Get one page of test results; pass next_cursor back for the following page"""
     try:
-        results = await test_service.get_all_tests()
+        results, next_cursor = await test_service.get_all_tests(limit, cursor)
         return {
             "count": len(results),
             "results": results,
+            "next_cursor": next_cursor,
             "timestamp": DateTimeUtils.get_current_timestamp()
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/tests/export")
+async def export_tests(student_id: Optional[str] = None, cursor: Optional[str] = None):
+    """Stream test results as NDJSON (one result per line, newest first)"""
+    try:
+        lines = test_service.export_tests_ndjson(student_id, cursor)
+        # Sync iterator: the response drains the MongoDB cursor in a worker thread
+        return StreamingResponse(
+            lines,
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": "attachment; filename=test_results.ndjson"}
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/students")
-async def get_students():
-    """Get students list"""
+async def get_students(limit: Optional[int] = None, cursor: Optional[str] = None):
+    """Get students list (all students, or one page when limit is given)"""
     try:
-        students = await test_service.get_students()
+        students, next_cursor = await test_service.get_students(limit, cursor)
         return {
             "count": len(students),
-            "students": students
+            "students": students,
+            "next_cursor": next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/api/students/{student_id}/tests")
-async def get_student_tests(student_id: str):
-    """Get student tests"""
+async def get_student_tests(student_id: str, limit: Optional[int] = None, cursor: Optional[str] = None):
+    """Get one page of student tests; pass next_cursor back for the following page"""
     try:
-        tests = await test_service.get_student_tests(student_id)
-        return {"count": len(tests), "tests": tests}
+        tests, next_cursor = await test_service.get_student_tests(student_id, limit, cursor)
+        return {"count": len(tests), "tests": tests, "next_cursor": next_cursor}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -253,4 +346,51 @@ async def cleanup_resources():
         result = test_service.cleanup_expired_tests()
         return result
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+# ==================== EXAM SCHEDULING ====================
+
+@router.post("/api/admin/exams")
+async def schedule_exam(request_data: dict):
+    """Schedule a cohort exam; question sets and test records are prepared before start_at"""
+    try:
+        user_type = request_data.get("user_type", "dev")
+        if user_type in ["developer", "dev"]:
+            user_type = "dev"
+        elif user_type in ["non-developer", "non_dev"]:
+            user_type = "non_dev"
+        
+        # start_at: epoch seconds or ISO 8601 (server local time when no offset is given)
+        start_at = request_data.get("start_at")
+        if isinstance(start_at, str):
+            start_at = datetime.fromisoformat(start_at).timestamp()
+        if not isinstance(start_at, (int, float)):
+            raise ValueError("start_at is required")
+        
+        event = exam_scheduler.schedule_event(user_type, int(request_data.get("headcount", 0)), float(start_at))
+        return {"event": event, "timestamp": DateTimeUtils.get_current_timestamp()}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/api/admin/exams")
+async def list_exams():
+    """List scheduled exams with provisioning status"""
+    events = exam_scheduler.list_events()
+    return {"count": len(events), "events": events}
+
+@router.get("/api/admin/exams/{event_id}")
+async def get_exam(event_id: str):
+    """Get one scheduled exam"""
+    event = exam_scheduler.get_event(event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Exam not found")
+    return event
+
+@router.delete("/api/admin/exams/{event_id}")
+async def cancel_exam(event_id: str):
+    """Cancel a scheduled exam and release its prepared tests"""
+    if not exam_scheduler.cancel_event(event_id):
+        raise HTTPException(status_code=404, detail="Exam not found")
+    return {"cancelled": event_id, "timestamp": DateTimeUtils.get_current_timestamp()}
@@ -1,63 +1,83 @@
 # weekend_mocktest/core/ai_services.py
+import asyncio
 import logging
+import random
 import time
 import re
 import json
+import copy
+import difflib
 from typing import List, Dict, Any
-from groq import Groq
+from groq import AsyncGroq
+from core.llm_cache import LLMResponseCache
 from .config import config
 from .prompts import PromptTemplates
 
 logger = logging.getLogger(__name__)
 
 class AIService:
-    """Production AI service for question generation and evaluation"""
+    """Production AI service for question generation and evaluation (async, never blocks the event loop)"""
     
     def __init__(self):
-        """Initialize Groq client"""
+        """Initialize async Groq client (connectivity is verified by health_check at startup)"""
         if not config.GROQ_API_KEY:
             raise ValueError("GROQ_API_KEY is required")
         
-        self.client = Groq(
+        self.client = AsyncGroq(
             api_key=config.GROQ_API_KEY,
             timeout=config.GROQ_TIMEOUT
         )
         
-        # Test connection
-        self._test_connection()
+        # Evaluations of identical Q/A sets (retried submissions) are served from cache
+        self.response_cache = LLMResponseCache(
+            namespace="weekend_mocktest",
+            max_entries=config.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=config.LLM_CACHE_TTL_SECONDS,
+            redis_url=config.LLM_CACHE_REDIS_URL or None
+        ) if config.LLM_CACHE_ENABLED else None
+        
         logger.info("✅ AI Service initialized successfully")
     
-    def _test_connection(self):
-        """Test AI service connection"""
-        try:
-            response = self.client.chat.completions.create(
-                model=config.GROQ_MODEL,
-                messages=[{"role": "user", "content": "Hello"}],
-                max_completion_tokens=10
-            )
-            if not response.choices:
-                raise Exception("No response from AI service")
-        except Exception as e:
-            raise Exception(f"AI service connection failed: {e}")
-    
-    def generate_questions_batch(self, user_type: str, context: str) -> List[Dict[str, Any]]:
-        """Generate questions using AI based on real context"""
-        logger.info(f"🤖 Generating {config.QUESTIONS_PER_TEST} {user_type} questions")
+    async def generate_questions_batch(self, user_type: str, context: str) -> List[Dict[str, Any]]:
+        """Generate questions using AI based on real context (concurrent shards over context slices)"""
+        total = config.QUESTIONS_PER_TEST
+        shard_count = max(1, min(config.QUESTION_SHARDS, total))
+        logger.info(f"🤖 Generating {total} {user_type} questions in {shard_count} shards")
         
         try:
-            # Create generation prompt
-            prompt = PromptTemplates.create_batch_questions_prompt(
-                user_type, context, config.QUESTIONS_PER_TEST
+            # Disjoint context slices, questions spread as evenly as possible
+            slices = self._slice_context(context, shard_count)
+            counts = [total // shard_count + (1 if i < total % shard_count else 0) for i in range(shard_count)]
+            
+            results = await asyncio.gather(
+                *[self._generate_shard(user_type, slices[i], counts[i], i + 1) for i in range(shard_count)],
+                return_exceptions=True
             )
+            shard_results = []
+            for i, result in enumerate(results, 1):
+                if isinstance(result, Exception):
+                    logger.warning(f"Shard {i}/{shard_count} failed: {result}")
+                    result = []
+                shard_results.append(result)
             
-            # Generate with retries
-            response = self._call_llm_with_retries(prompt, config.GROQ_MAX_TOKENS)
+            questions = self.dedupe_questions([q for shard in shard_results for q in shard])
             
-            # Parse questions
-            questions = self._parse_questions_response(response, user_type)
+            # Top up from the full context if shards failed or produced duplicates
+            missing = total - len(questions)
+            if missing > 0:
+                logger.info(f"Topping up {missing} questions from full context")
+                try:
+                    extra = await self._generate_shard(user_type, context, missing, 0)
+                    questions = self.dedupe_questions(questions + extra)
+                except Exception as e:
+                    logger.warning(f"Top-up generation failed: {e}")
+            
+            questions = questions[:total]
+            for number, question in enumerate(questions, 1):
+                question["question_number"] = number
             
-            if len(questions) != config.QUESTIONS_PER_TEST:
-                logger.warning(f"Generated {len(questions)}/{config.QUESTIONS_PER_TEST} questions")
+            if len(questions) != total:
+                logger.warning(f"Generated {len(questions)}/{total} questions")
             
             if not questions:
                 raise Exception("No valid questions generated")
@@ -69,7 +89,92 @@ class AIService:
             logger.error(f"❌ Question generation failed: {e}")
             raise
     
-    def evaluate_test_batch(self, user_type: str, qa_pairs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def _generate_shard(self, user_type: str, context: str, count: int, shard_number: int) -> List[Dict[str, Any]]:
+        """Generate one shard; on parse failures only the missing questions are re-requested"""
+        questions: List[Dict[str, Any]] = []
+        for attempt in range(config.SHARD_PARSE_RETRIES + 1):
+            needed = count - len(questions)
+            prompt = PromptTemplates.create_batch_questions_prompt(user_type, context, needed)
+            try:
+                response = await self._call_llm_with_retries(
+                    prompt, config.SHARD_TOKENS_PER_QUESTION * needed + 200
+                )
+                questions.extend(self._parse_questions_response(response, user_type)[:needed])
+            except Exception as e:
+                if not questions:
+                    raise
+                # Keep what earlier attempts parsed; the caller's top-up covers the shortfall
+                logger.warning(f"Shard {shard_number}: retry failed, keeping {len(questions)}/{count} questions: {e}")
+                break
+            if len(questions) >= count:
+                break
+            logger.warning(f"Shard {shard_number}: parsed {len(questions)}/{count} questions "
+                           f"(attempt {attempt + 1}/{config.SHARD_PARSE_RETRIES + 1})")
+        if not questions:
+            raise Exception(f"Shard {shard_number} produced no valid questions")
+        return questions
+    
+    @staticmethod
+    def _slice_context(context: str, slice_count: int) -> List[str]:
+        """Split context into contiguous, disjoint slices of roughly equal length"""
+        blocks = [b.strip() for b in re.split(r'\n\s*\n', context) if b.strip()]
+        if len(blocks) < slice_count:
+            # Too few paragraphs: fall back to lines
+            blocks = [l.strip() for l in context.split('\n') if l.strip()]
+        if len(blocks) < slice_count:
+            # Very short context: every shard sees all of it
+            return [context] * slice_count
+        
+        target = sum(len(b) for b in blocks) / slice_count
+        slices: List[List[str]] = [[]]
+        size = 0
+        for index, block in enumerate(blocks):
+            remaining_blocks = len(blocks) - index
+            remaining_slices = slice_count - len(slices)
+            # Close the slice when it's full, but never leave later slices empty
+            if slices[-1] and remaining_slices > 0 and (size >= target or remaining_blocks <= remaining_slices):
+                slices.append([])
+                size = 0
+            slices[-1].append(block)
+            size += len(block)
+        return ["\n\n".join(s) for s in slices]
+    
+    @staticmethod
+    def _normalize_question_text(question: Dict[str, Any]) -> str:
+        text = re.sub(r'[^a-z0-9 ]+', ' ', question["question"].lower())
+        return " ".join(text.split())
+
+    @staticmethod
+    def dedupe_questions(questions: List[Dict[str, Any]],
+                         existing: List[Dict[str, Any]] = ()) -> List[Dict[str, Any]]:
+        """
+        Drop near-duplicate questions (similar normalized question text).
+        Each question is compared against `existing` (already unique, not returned) and the
+        questions kept before it; the cheap ratio upper bounds skip most full comparisons.
+        """
+        threshold = config.DUPLICATE_SIMILARITY_THRESHOLD
+        seen = [AIService._normalize_question_text(q) for q in existing]
+        unique: List[Dict[str, Any]] = []
+        matcher = difflib.SequenceMatcher(None)
+        for question in questions:
+            text = AIService._normalize_question_text(question)
+            # seq2 is analysed once per candidate and reused across every comparison
+            matcher.set_seq2(text)
+            duplicate = False
+            for other in seen:
+                matcher.set_seq1(other)
+                if (matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold
+                        and matcher.ratio() >= threshold):
+                    duplicate = True
+                    break
+            if duplicate:
+                logger.info(f"Dropping near-duplicate question: {question['title']}")
+                continue
+            seen.append(text)
+            unique.append(question)
+        return unique
+    
+    async def evaluate_test_batch(self, user_type: str, qa_pairs: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Evaluate test answers using AI"""
         logger.info(f"🎯 Evaluating {len(qa_pairs)} {user_type} answers")
         
@@ -77,15 +182,27 @@ class AIService:
             # Create evaluation prompt
             prompt = PromptTemplates.create_evaluation_prompt(user_type, qa_pairs)
             
-            # Get evaluation
-            response = self._call_llm_with_retries(
-                prompt, 
-                config.EVALUATION_MAX_TOKENS,
-                config.EVALUATION_TEMPERATURE
-            )
+            async def _evaluate() -> Dict[str, Any]:
+                response = await self._call_llm_with_retries(
+                    prompt, 
+                    config.EVALUATION_MAX_TOKENS,
+                    config.EVALUATION_TEMPERATURE
+                )
+                return self._parse_evaluation_response(response, qa_pairs)
             
-            # Parse evaluation
-            evaluation = self._parse_evaluation_response(response, qa_pairs)
+            # Get evaluation (cached by prompt content, concurrent duplicates coalesced)
+            if self.response_cache is not None:
+                key = self.response_cache.make_key(
+                    config.GROQ_MODEL,
+                    [{"role": "user", "content": prompt}],
+                    config.EVALUATION_TEMPERATURE,
+                    config.EVALUATION_MAX_TOKENS
+                )
+                evaluation = copy.deepcopy(await self.response_cache.aget_or_call(
+                    key, _evaluate, cacheable=lambda result: not result.get("parse_fallback")
+                ))
+            else:
+                evaluation = await _evaluate()
             
             logger.info(f"✅ Evaluation completed: {evaluation['total_correct']}/{len(qa_pairs)}")
             return evaluation
@@ -94,9 +211,9 @@ class AIService:
             logger.error(f"❌ Evaluation failed: {e}")
             raise
     
-    def _call_llm_with_retries(self, prompt: str, max_tokens: int, 
-                              temperature: float = None) -> str:
-        """Call LLM with retry logic"""
+    async def _call_llm_with_retries(self, prompt: str, max_tokens: int, 
+                                    temperature: float = None) -> str:
+        """Call LLM with retry logic (exponential backoff with jitter)"""
         if temperature is None:
             temperature = config.GROQ_TEMPERATURE
         
@@ -106,7 +223,7 @@ class AIService:
             try:
                 logger.debug(f"LLM call attempt {attempt + 1}/{config.MAX_RETRIES}")
                 
-                completion = self.client.chat.completions.create(
+                completion = await self.client.chat.completions.create(
                     model=config.GROQ_MODEL,
                     messages=[{"role": "user", "content": prompt}],
                     temperature=temperature,
@@ -127,10 +244,16 @@ class AIService:
                 last_error = e
                 logger.warning(f"LLM attempt {attempt + 1} failed: {e}")
                 if attempt < config.MAX_RETRIES - 1:
-                    time.sleep(config.RETRY_DELAY * (attempt + 1))
+                    await asyncio.sleep(self._backoff_delay(attempt))
         
         raise Exception(f"LLM failed after {config.MAX_RETRIES} attempts: {last_error}")
     
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Exponential backoff with jitter so concurrent retries don't hit Groq in lockstep"""
+        delay = min(config.RETRY_MAX_DELAY, config.RETRY_DELAY * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
+    
     def _parse_questions_response(self, response: str, user_type: str) -> List[Dict[str, Any]]:
         """Parse LLM response into structured questions"""
         try:
@@ -163,7 +286,8 @@ class AIService:
             "difficulty": "Medium",
             "type": "General",
             "question": "",
-            "options": None
+            "options": None,
+            "correct_option": None
         }
         
         current_section = None
@@ -181,6 +305,11 @@ class AIService:
                 current_section = "question"
             elif line.startswith("## Options:") and user_type == "non_dev":
                 current_section = "options"
+            elif line.startswith("## Answer:") and user_type == "non_dev":
+                key_match = re.match(r'^## Answer:\s*\(?([A-Da-d])\b', line)
+                if key_match:
+                    question_data["correct_option"] = "ABCD".index(key_match.group(1).upper())
+                current_section = None
             elif current_section == "question":
                 if not line.startswith("##"):
                     question_lines.append(line)
@@ -202,6 +331,9 @@ class AIService:
         if user_type == "non_dev" and not question_data["options"]:
             raise Exception("MCQ missing options")
         
+        if user_type == "non_dev" and question_data["correct_option"] is None:
+            raise Exception("MCQ missing answer key")
+        
         return question_data
     
     def _parse_evaluation_response(self, response: str, qa_pairs: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -224,11 +356,14 @@ class AIService:
                 feedbacks = [f.strip().strip('"\'') for f in feedback_str.split('|')]
             
             # Fallback: parse line by line
+            parse_fallback = False
             if not scores or len(scores) != len(qa_pairs):
                 scores = self._extract_scores_fallback(response, len(qa_pairs))
+                parse_fallback = True
             
             if not feedbacks or len(feedbacks) != len(qa_pairs):
                 feedbacks = self._extract_feedbacks_fallback(response, len(qa_pairs))
+                parse_fallback = True
             
             # Ensure we have the right number of scores and feedbacks
             if len(scores) != len(qa_pairs):
@@ -238,12 +373,15 @@ class AIService:
                 # Generate default feedbacks if parsing failed
                 feedbacks = [f"Question {i+1}: {'Correct' if scores[i] else 'Incorrect'}" 
                            for i in range(len(qa_pairs))]
+                parse_fallback = True
             
             return {
                 "scores": scores,
                 "feedbacks": feedbacks,
                 "total_correct": sum(scores),
-                "evaluation_report": response
+                "evaluation_report": response,
+                # Heuristically recovered results are used once, never cached
+                "parse_fallback": parse_fallback
             }
             
         except Exception as e:
@@ -260,9 +398,9 @@ class AIService:
             if len(scores) == expected_count:
                 return scores
         
-        # Ultimate fallback: default scoring
-        logger.warning("Using fallback scoring")
-        return [1 if i % 2 == 0 else 0 for i in range(expected_count)]
+        # No usable scores: let the caller fail and re-evaluate rather than invent them
+        logger.warning("Could not extract scores from evaluation response")
+        return []
     
     def _extract_feedbacks_fallback(self, response: str, expected_count: int) -> List[str]:
         """Fallback method to extract feedbacks"""
@@ -281,11 +419,11 @@ class AIService:
         
         return feedbacks[:expected_count]
     
-    def health_check(self) -> Dict[str, Any]:
+    async def health_check(self) -> Dict[str, Any]:
         """Check AI service health"""
         try:
             start_time = time.time()
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=config.GROQ_MODEL,
                 messages=[{"role": "user", "content": "ping"}],
                 max_completion_tokens=5
@@ -312,4 +450,11 @@ def get_ai_service() -> AIService:
     global _ai_service
     if _ai_service is None:
         _ai_service = AIService()
-    return _ai_service
\ No newline at end of file
+    return _ai_service
+
+async def close_ai_service():
+    """Close AI service client"""
+    global _ai_service
+    if _ai_service:
+        await _ai_service.client.close()
+        _ai_service = None
@@ -35,10 +35,32 @@ class Config:
         "USER": os.getenv("MYSQL_USER", "sa"),
         "PASSWORD": os.getenv("MYSQL_PASSWORD", "Welcome@123"),
     }
+    # Shared MySQL connection pool (core/mysql_pool.py)
+    MYSQL_POOL_SIZE = int(os.getenv("MYSQL_POOL_SIZE", "10"))
+    MYSQL_POOL_TIMEOUT = float(os.getenv("MYSQL_POOL_TIMEOUT", "10"))
+    MYSQL_POOL_PING_AFTER_SECONDS = float(os.getenv("MYSQL_POOL_PING_AFTER_SECONDS", "30"))
+    MYSQL_POOL_MAX_LIFETIME_SECONDS = float(os.getenv("MYSQL_POOL_MAX_LIFETIME_SECONDS", "3600"))
+    STUDENT_DIRECTORY_TTL_SECONDS = float(os.getenv("STUDENT_DIRECTORY_TTL_SECONDS", "900"))
     
     # Collections - Updated with working collection names
     SUMMARIES_COLLECTION = "summaries"  # Updated to correct collection
+    # Summaries written without summary_len are backfilled at most this often
+    SUMMARY_LEN_BACKFILL_INTERVAL = int(os.getenv("SUMMARY_LEN_BACKFILL_INTERVAL", "60"))
     TEST_RESULTS_COLLECTION = "mock_test_results"
+    # Per-student rollups (latest test, count, best/average, score histogram), updated on every save
+    STUDENT_ROLLUPS_COLLECTION = os.getenv("STUDENT_ROLLUPS_COLLECTION", "mock_test_student_rollups")
+    STUDENT_TESTS_PAGE_SIZE = int(os.getenv("STUDENT_TESTS_PAGE_SIZE", "50"))
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
+    # NDJSON export reads results from MongoDB in batches of this size
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+    
+    # Write-behind result journal (core/result_journal.py): saves are durable locally, bulk-inserted later
+    RESULT_JOURNAL_ENABLED = os.getenv("RESULT_JOURNAL_ENABLED", "true").lower() == "true"
+    RESULT_JOURNAL_DIR = Path(os.getenv("RESULT_JOURNAL_DIR", str(Path(__file__).resolve().parent.parent.parent / "journal")))
+    RESULT_JOURNAL_COMPRESS = os.getenv("RESULT_JOURNAL_COMPRESS", "false").lower() == "true"
+    RESULT_JOURNAL_BATCH_SIZE = int(os.getenv("RESULT_JOURNAL_BATCH_SIZE", "200"))
+    RESULT_JOURNAL_FLUSH_INTERVAL = float(os.getenv("RESULT_JOURNAL_FLUSH_INTERVAL", "1.0"))
+    RESULT_JOURNAL_FSYNC_INTERVAL = float(os.getenv("RESULT_JOURNAL_FSYNC_INTERVAL", "0.005"))
     
     # ==================== Content Processing ====================
     RECENT_SUMMARIES_COUNT = int(os.getenv("RECENT_SUMMARIES_COUNT", "10"))
@@ -49,10 +71,28 @@ class Config:
     DEV_TIME_LIMIT = int(os.getenv("DEV_TIME_LIMIT", "300"))  # 5 minutes
     NON_DEV_TIME_LIMIT = int(os.getenv("NON_DEV_TIME_LIMIT", "120"))  # 2 minutes
     
+    # Whole-test delivery: answers arrive in batches and are timed from their client timestamps
+    BATCH_SUBMIT_GRACE_SECONDS = int(os.getenv("BATCH_SUBMIT_GRACE_SECONDS", "30"))
+    BATCH_CLOCK_SKEW_SECONDS = int(os.getenv("BATCH_CLOCK_SKEW_SECONDS", "5"))
+    
     # Cache and session management
     QUESTION_CACHE_DURATION_HOURS = int(os.getenv("QUESTION_CACHE_DURATION_HOURS", "6"))
     TEST_SESSION_TIMEOUT = int(os.getenv("TEST_SESSION_TIMEOUT", "3600"))  # 1 hour
     
+    # Question bank: pre-generated pool per user type, refilled in the background
+    QUESTION_BANK_TARGET_SIZE = int(os.getenv("QUESTION_BANK_TARGET_SIZE", "40"))
+    QUESTION_BANK_LOW_WATERMARK = int(os.getenv("QUESTION_BANK_LOW_WATERMARK", "20"))
+    QUESTION_BANK_MAX_USES = int(os.getenv("QUESTION_BANK_MAX_USES", "3"))
+    QUESTION_BANK_MAX_AGE_HOURS = int(os.getenv("QUESTION_BANK_MAX_AGE_HOURS", str(QUESTION_CACHE_DURATION_HOURS)))
+    QUESTION_BANK_CHECK_INTERVAL = int(os.getenv("QUESTION_BANK_CHECK_INTERVAL", "300"))
+    QUESTION_BANK_COLD_WAIT_SECONDS = int(os.getenv("QUESTION_BANK_COLD_WAIT_SECONDS", "45"))
+    
+    # Scheduled cohort exams: test records are prepared ahead of the start time
+    EXAM_PROVISION_LEAD_MINUTES = int(os.getenv("EXAM_PROVISION_LEAD_MINUTES", "30"))
+    EXAM_EARLY_JOIN_MINUTES = int(os.getenv("EXAM_EARLY_JOIN_MINUTES", "10"))
+    EXAM_JOIN_WINDOW_MINUTES = int(os.getenv("EXAM_JOIN_WINDOW_MINUTES", "30"))
+    EXAM_MAX_HEADCOUNT = int(os.getenv("EXAM_MAX_HEADCOUNT", "1000"))
+    
     # ==================== AI Service Configuration ====================
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
     GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
@@ -63,10 +103,31 @@ class Config:
     # Generation settings
     MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
     RETRY_DELAY = int(os.getenv("RETRY_DELAY", "2"))
+    RETRY_MAX_DELAY = int(os.getenv("RETRY_MAX_DELAY", "20"))
+    
+    # Sharded generation: QUESTION_SHARDS concurrent requests over disjoint context slices
+    QUESTION_SHARDS = int(os.getenv("QUESTION_SHARDS", "5"))
+    SHARD_TOKENS_PER_QUESTION = int(os.getenv("SHARD_TOKENS_PER_QUESTION", "450"))
+    SHARD_PARSE_RETRIES = int(os.getenv("SHARD_PARSE_RETRIES", "2"))
+    DUPLICATE_SIMILARITY_THRESHOLD = float(os.getenv("DUPLICATE_SIMILARITY_THRESHOLD", "0.8"))
     
     # ==================== Evaluation Configuration ====================
     EVALUATION_TEMPERATURE = float(os.getenv("EVALUATION_TEMPERATURE", "0.3"))
     EVALUATION_MAX_TOKENS = int(os.getenv("EVALUATION_MAX_TOKENS", "2000"))
+    # Answers are evaluated in the background in batches of this size while the test runs
+    EVALUATION_BATCH_SIZE = int(os.getenv("EVALUATION_BATCH_SIZE", "2"))
+    
+    # Local grading: MCQs against the generated answer key, trivially empty dev answers
+    DEV_MIN_ANSWER_CHARS = int(os.getenv("DEV_MIN_ANSWER_CHARS", "20"))
+    QUESTION_COPY_SIMILARITY = float(os.getenv("QUESTION_COPY_SIMILARITY", "0.9"))
+    LLM_MCQ_FEEDBACK = os.getenv("LLM_MCQ_FEEDBACK", "false").lower() == "true"
+    LLM_FEEDBACK_WAIT_SECONDS = float(os.getenv("LLM_FEEDBACK_WAIT_SECONDS", "2"))
+    
+    # ==================== LLM Response Cache ====================
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+    LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "21600"))
+    LLM_CACHE_REDIS_URL = os.getenv("LLM_CACHE_REDIS_URL", os.getenv("REDIS_URL", ""))
     
     # ==================== Validation ====================
     def validate(self) -> dict:
@@ -82,6 +143,18 @@ class Config:
         if self.QUESTIONS_PER_TEST < 1 or self.QUESTIONS_PER_TEST > 20:
             issues.append("QUESTIONS_PER_TEST must be between 1 and 20")
         
+        if self.EVALUATION_BATCH_SIZE < 1:
+            issues.append("EVALUATION_BATCH_SIZE must be at least 1")
+        
+        if self.QUESTION_SHARDS < 1:
+            issues.append("QUESTION_SHARDS must be at least 1")
+        
+        if self.QUESTION_BANK_LOW_WATERMARK < self.QUESTIONS_PER_TEST:
+            issues.append("QUESTION_BANK_LOW_WATERMARK must be at least QUESTIONS_PER_TEST")
+        
+        if self.QUESTION_BANK_TARGET_SIZE < self.QUESTION_BANK_LOW_WATERMARK:
+            issues.append("QUESTION_BANK_TARGET_SIZE must be at least QUESTION_BANK_LOW_WATERMARK")
+        
         if not (0.1 <= self.SUMMARY_SLICE_FRACTION <= 1.0):
             issues.append("SUMMARY_SLICE_FRACTION must be between 0.1 and 1.0")
         
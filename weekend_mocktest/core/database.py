@@ -1,14 +1,34 @@
 # weekend_mocktest/core/database.py
+import asyncio
 import logging
 import time
 import pymongo
 import pyodbc
 import random
-from typing import List, Dict, Any, Optional
+import threading
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from .config import config
+from .utils import PaginationUtils
+from core.summary_index import (
+    min_length_filter, ensure_summary_indexes, backfill_summary_len, BackfillThrottle
+)
+from core.result_journal import get_result_journal, close_result_journal, insert_many_ignoring_duplicates
 
 logger = logging.getLogger(__name__)
 
+# Summary fields for result listings and exports
+RESULT_LIST_PROJECTION = {
+    "_id": 0,
+    "test_id": 1,
+    "name": 1,
+    "score": 1,
+    "total_questions": 1,
+    "score_percentage": 1,
+    "timestamp": 1,
+    "user_type": 1,
+    "Student_ID": 1
+}
+
 class DatabaseManager:
     """Production database manager with real connections"""
     
@@ -16,10 +36,31 @@ class DatabaseManager:
         """Initialize database connections"""
         logger.info("🔗 Initializing database connections")
         
+        # MySQL pool is created on first use
+        self._mysql_pool = None
+        self._summary_backfill = BackfillThrottle(config.SUMMARY_LEN_BACKFILL_INTERVAL)
+        
+        # Serializes result inserts with rollup updates so a rebuild never races an $inc
+        self._rollup_lock = threading.Lock()
+        self._rollups_dirty = False
+        
         # Initialize MongoDB (primary database)
         self._init_mongodb()
         
-        # Initialize MySQL connection (updated for MySQL)
+        # Result saves are journaled locally and bulk-inserted in the background
+        self.result_journal = None
+        if config.RESULT_JOURNAL_ENABLED:
+            self.result_journal = get_result_journal(
+                config.RESULT_JOURNAL_DIR,
+                config.TEST_RESULTS_COLLECTION,
+                self._flush_results,
+                key_field="test_id",
+                batch_size=config.RESULT_JOURNAL_BATCH_SIZE,
+                flush_interval_seconds=config.RESULT_JOURNAL_FLUSH_INTERVAL,
+                fsync_interval_seconds=config.RESULT_JOURNAL_FSYNC_INTERVAL,
+                compress=config.RESULT_JOURNAL_COMPRESS
+            )
+        
         logger.info("✅ Database manager initialized")
     
     def _init_mongodb(self):
@@ -41,10 +82,16 @@ class DatabaseManager:
             self.db = self.mongo_client[config.MONGO_DB_NAME]  # ml_notes
             self.summaries_collection = self.db[config.SUMMARIES_COLLECTION]  # summaries
             self.test_results_collection = self.db[config.TEST_RESULTS_COLLECTION]
+            self.student_rollups_collection = self.db[config.STUDENT_ROLLUPS_COLLECTION]
             
             # Create performance indexes
             self._create_indexes()
             
+            # First run against existing results: build the rollups once
+            if (self.student_rollups_collection.estimated_document_count() == 0
+                    and self.test_results_collection.estimated_document_count() > 0):
+                self.rebuild_student_rollups()
+            
             # Verify data availability
             summary_count = self.summaries_collection.count_documents({
                 "summary": {"$exists": True, "$ne": ""}
@@ -64,12 +111,27 @@ class DatabaseManager:
         try:
             # Test results indexes
             self.test_results_collection.create_index("test_id", unique=True)
-            self.test_results_collection.create_index("timestamp")
+            self.test_results_collection.create_index([
+                ("timestamp", pymongo.DESCENDING),
+                ("test_id", pymongo.DESCENDING)
+            ])
             self.test_results_collection.create_index("Student_ID")
-            
-            # Summaries indexes
+            self.test_results_collection.create_index([
+                ("Student_ID", pymongo.ASCENDING),
+                ("timestamp", pymongo.DESCENDING),
+                ("test_id", pymongo.DESCENDING)
+            ])
+            
+            # Student rollups, listed newest-first
+            self.student_rollups_collection.create_index([
+                ("latest.timestamp", pymongo.DESCENDING),
+                ("_id", pymongo.DESCENDING)
+            ])
+            
+            # Summaries indexes, including (summary_len, timestamp) / (summary_len, date)
             self.summaries_collection.create_index("timestamp")
             self.summaries_collection.create_index("date")
+            ensure_summary_indexes(self.summaries_collection)
             
             logger.info("📊 Database indexes created")
         except Exception as e:
@@ -83,12 +145,16 @@ class DatabaseManager:
         try:
             logger.info(f"📚 Fetching {limit} recent summaries")
             
-            # Query with proper filtering and sorting
+            # Pick up summaries written without summary_len (index-backed, throttled)
+            if self._summary_backfill.due():
+                try:
+                    backfill_summary_len(self.summaries_collection)
+                except Exception as e:
+                    logger.warning(f"summary_len backfill warning: {e}")
+            
+            # Query with proper filtering and sorting (indexed length filter)
             cursor = self.summaries_collection.find(
-                {
-                    "summary": {"$exists": True, "$ne": "", "$type": "string"},
-                    "$expr": {"$gt": [{"$strLenCP": "$summary"}, 100]}  # Minimum length
-                },
+                min_length_filter(100),  # Minimum length
                 {
                     "summary": 1, 
                     "timestamp": 1, 
@@ -118,52 +184,46 @@ class DatabaseManager:
     
     def save_test_results(self, test_id: str, test_data: Dict[str, Any], 
                          evaluation_result: Dict[str, Any]) -> bool:
-        """Save test results to MongoDB"""
+        """Save test results (blocking until durable in the journal, or inserted)"""
         logger.info(f"💾 Saving test results: {test_id}")
         
         try:
-            # Get student information
-            student_info = self._get_student_info()
+            document = self._build_result_document(test_id, test_data, evaluation_result)
             
-            # Calculate score percentage
-            score_percentage = round(
-                (evaluation_result["total_correct"] / test_data["total_questions"]) * 100, 1
-            )
+            if self.result_journal:
+                try:
+                    self.result_journal.append(document).result(timeout=30)
+                    logger.info(f"✅ Test results journaled: {test_id}")
+                    return True
+                except Exception as e:
+                    logger.warning(f"⚠️ Journal write failed, inserting directly: {e}")
             
-            # Create conversation pairs
-            conversation_pairs = []
-            for i, answer_data in enumerate(test_data.get("answers", []), 1):
-                conversation_pairs.append({
-                    "question_number": i,
-                    "question": answer_data.get("question", ""),
-                    "answer": answer_data.get("answer", ""),
-                    "correct": answer_data.get("correct", False),
-                    "feedback": answer_data.get("feedback", "")
-                })
-            
-            # Create document
-            document = {
-                "test_id": test_id,
-                "timestamp": time.time(),
-                "Student_ID": student_info["student_id"],
-                "name": student_info["name"],
-                "session_id": student_info["session_id"],
-                "user_type": test_data["user_type"],
-                "score": evaluation_result["total_correct"],
-                "total_questions": test_data["total_questions"],
-                "score_percentage": score_percentage,
-                "evaluation_report": evaluation_result["evaluation_report"],
-                "conversation_pairs": conversation_pairs,
-                "test_completed": True,
-                "created_at": time.time()
-            }
-            
-            # Insert into MongoDB
-            result = self.test_results_collection.insert_one(document)
-            
-            if not result.inserted_id:
-                raise Exception("Database insert failed")
+            self._insert_result_document(document)
+            logger.info(f"✅ Test results saved: {test_id}")
+            return True
             
+        except Exception as e:
+            logger.error(f"❌ Save failed: {e}")
+            raise Exception(f"Failed to save test results: {e}")
+    
+    async def asave_test_results(self, test_id: str, test_data: Dict[str, Any],
+                                 evaluation_result: Dict[str, Any]) -> bool:
+        """Save test results without blocking the event loop on MongoDB"""
+        logger.info(f"💾 Saving test results: {test_id}")
+        
+        try:
+            # Off the event loop: a cold student directory falls back to a MySQL query
+            document = await asyncio.to_thread(self._build_result_document, test_id, test_data, evaluation_result)
+            
+            if self.result_journal:
+                try:
+                    await self.result_journal.aappend(document)
+                    logger.info(f"✅ Test results journaled: {test_id}")
+                    return True
+                except Exception as e:
+                    logger.warning(f"⚠️ Journal write failed, inserting directly: {e}")
+            
+            await asyncio.to_thread(self._insert_result_document, document)
             logger.info(f"✅ Test results saved: {test_id}")
             return True
             
@@ -171,15 +231,212 @@ class DatabaseManager:
             logger.error(f"❌ Save failed: {e}")
             raise Exception(f"Failed to save test results: {e}")
     
+    def _insert_result_document(self, document: Dict[str, Any]):
+        with self._rollup_lock:
+            result = self.test_results_collection.insert_one(document)
+            if not result.inserted_id:
+                raise Exception("Database insert failed")
+            self._update_rollups([document])
+    
+    def _flush_results(self, docs: List[Dict[str, Any]]):
+        """Journal sink: bulk-insert results, then roll up the ones that were new"""
+        with self._rollup_lock:
+            try:
+                inserted = insert_many_ignoring_duplicates(self.test_results_collection, docs)
+            except Exception:
+                # Part of the batch may be in; the retry sees those as duplicates and skips them
+                self._rollups_dirty = True
+                raise
+            self._update_rollups(inserted)
+    
+    # ==================== STUDENT ROLLUPS ====================
+    
+    @staticmethod
+    def _score_bucket(score_percentage: float) -> str:
+        """Histogram bucket: "0", "10", ... "90" (100% falls in "90")"""
+        return str(min(int((score_percentage or 0) // 10) * 10, 90))
+    
+    def _update_rollups(self, docs: List[Dict[str, Any]]):
+        """Apply newly inserted results to the per-student rollups (caller holds _rollup_lock)"""
+        if self._rollups_dirty:
+            try:
+                self.rebuild_student_rollups(locked=True)
+            except Exception as e:
+                logger.warning(f"⚠️ Student rollup rebuild failed: {e}")
+            # A successful rebuild already counted docs
+            if not self._rollups_dirty:
+                return
+        
+        if not docs:
+            return
+        
+        now = time.time()
+        operations = []
+        for doc in docs:
+            if doc.get("Student_ID") is None:
+                continue
+            score_percentage = doc.get("score_percentage", 0) or 0
+            operations.append(pymongo.UpdateOne(
+                {"_id": doc["Student_ID"]},
+                {
+                    "$inc": {
+                        "test_count": 1,
+                        "score_percentage_sum": score_percentage,
+                        f"histogram.{self._score_bucket(score_percentage)}": 1
+                    },
+                    "$max": {
+                        "best_score_percentage": score_percentage,
+                        # Embedded documents compare field by field, so timestamp must stay first
+                        "latest": {
+                            "timestamp": doc.get("timestamp", now),
+                            "test_id": doc.get("test_id"),
+                            "score_percentage": score_percentage,
+                            "user_type": doc.get("user_type")
+                        }
+                    },
+                    "$set": {"Student_ID": doc["Student_ID"], "name": doc.get("name"), "updated_at": now}
+                },
+                upsert=True
+            ))
+        
+        if not operations:
+            return
+        try:
+            self.student_rollups_collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            # Results are saved; rebuild the rollups from them on the next write
+            self._rollups_dirty = True
+            logger.warning(f"⚠️ Student rollup update failed, scheduling rebuild: {e}")
+    
+    def rebuild_student_rollups(self, locked: bool = False) -> int:
+        """Recompute every student rollup from the results collection; returns the student count"""
+        if not locked:
+            with self._rollup_lock:
+                return self.rebuild_student_rollups(locked=True)
+        
+        logger.info("🔄 Rebuilding student rollups")
+        bucket = {"$toString": {"$min": [90, {"$multiply": [
+            {"$toInt": {"$floor": {"$divide": [{"$ifNull": ["$score_percentage", 0]}, 10]}}}, 10
+        ]}]}}
+        pipeline = [
+            {"$match": {"Student_ID": {"$ne": None}}},
+            {
+                "$group": {
+                    "_id": {"student": "$Student_ID", "bucket": bucket},
+                    "count": {"$sum": 1},
+                    "score_percentage_sum": {"$sum": {"$ifNull": ["$score_percentage", 0]}},
+                    "best_score_percentage": {"$max": {"$ifNull": ["$score_percentage", 0]}},
+                    "latest": {"$max": {
+                        "timestamp": "$timestamp",
+                        "test_id": "$test_id",
+                        "score_percentage": {"$ifNull": ["$score_percentage", 0]},
+                        "user_type": "$user_type",
+                        "name": "$name"
+                    }}
+                }
+            },
+            {
+                "$group": {
+                    "_id": "$_id.student",
+                    "test_count": {"$sum": "$count"},
+                    "score_percentage_sum": {"$sum": "$score_percentage_sum"},
+                    "best_score_percentage": {"$max": "$best_score_percentage"},
+                    "latest": {"$max": "$latest"},
+                    "histogram": {"$push": {"k": "$_id.bucket", "v": "$count"}}
+                }
+            },
+            {
+                "$set": {
+                    "Student_ID": "$_id",
+                    "name": "$latest.name",
+                    "histogram": {"$arrayToObject": "$histogram"},
+                    "updated_at": time.time()
+                }
+            },
+            {"$unset": "latest.name"},
+            {
+                "$merge": {
+                    "into": config.STUDENT_ROLLUPS_COLLECTION,
+                    "on": "_id",
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert"
+                }
+            }
+        ]
+        
+        try:
+            self.test_results_collection.aggregate(pipeline, allowDiskUse=True)
+            self._rollups_dirty = False
+            count = self.student_rollups_collection.estimated_document_count()
+            logger.info(f"✅ Student rollups rebuilt: {count} students")
+            return count
+        except Exception as e:
+            logger.error(f"❌ Student rollup rebuild failed: {e}")
+            raise Exception(f"Student rollup rebuild failed: {e}")
+    
+    @staticmethod
+    def _page_size(limit: Optional[int], default: Optional[int]) -> Optional[int]:
+        if limit is None:
+            return default
+        return max(1, min(int(limit), config.MAX_PAGE_SIZE))
+    
+    @staticmethod
+    def _keyset_filter(cursor: Optional[str], sort_field: str, tie_field: str) -> Dict[str, Any]:
+        """Items strictly after the cursor position in (sort_field desc, tie_field desc) order"""
+        if not cursor:
+            return {}
+        position = PaginationUtils.decode_cursor(cursor)
+        if "t" not in position or "id" not in position:
+            raise ValueError("Invalid cursor")
+        return {"$or": [
+            {sort_field: {"$lt": position["t"]}},
+            {sort_field: position["t"], tie_field: {"$lt": position["id"]}}
+        ]}
+    
+    def _build_result_document(self, test_id: str, test_data: Dict[str, Any],
+                               evaluation_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Result document as stored in the test results collection"""
+        # Get student information
+        student_info = self._get_student_info()
+        
+        # Calculate score percentage
+        score_percentage = round(
+            (evaluation_result["total_correct"] / test_data["total_questions"]) * 100, 1
+        )
+        
+        # Create conversation pairs
+        conversation_pairs = []
+        for i, answer_data in enumerate(test_data.get("answers", []), 1):
+            conversation_pairs.append({
+                "question_number": i,
+                "question": answer_data.get("question", ""),
+                "answer": answer_data.get("answer", ""),
+                "correct": answer_data.get("correct", False),
+                "feedback": answer_data.get("feedback", "")
+            })
+        
+        return {
+            "test_id": test_id,
+            "timestamp": time.time(),
+            "Student_ID": student_info["student_id"],
+            "name": student_info["name"],
+            "session_id": student_info["session_id"],
+            "user_type": test_data["user_type"],
+            "score": evaluation_result["total_correct"],
+            "total_questions": test_data["total_questions"],
+            "score_percentage": score_percentage,
+            "evaluation_report": evaluation_result["evaluation_report"],
+            "conversation_pairs": conversation_pairs,
+            "test_completed": True,
+            "created_at": time.time()
+        }
+    
     def get_test_results(self, test_id: str) -> Optional[Dict[str, Any]]:
         """Get test results by ID"""
         try:
             logger.info(f"🔍 Fetching results: {test_id}")
             
-            doc = self.test_results_collection.find_one(
-                {"test_id": test_id}, 
-                {"_id": 0}
-            )
+            doc = self.get_result_document(test_id)
             
             if not doc:
                 return None
@@ -201,119 +458,178 @@ class DatabaseManager:
             logger.error(f"❌ Failed to get results: {e}")
             raise Exception(f"Test results retrieval failed: {e}")
     
-    def get_all_test_results(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get all test results with pagination"""
+    def get_result_document(self, test_id: str) -> Optional[Dict[str, Any]]:
+        """Full result document; a journaled save that is not flushed yet is served from the journal"""
+        if self.result_journal:
+            doc = self.result_journal.pending(test_id)
+            if doc:
+                return doc
+        return self.test_results_collection.find_one({"test_id": test_id}, {"_id": 0})
+    
+    def get_all_test_results(self, limit: int = 50,
+                             cursor: str = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of test results, newest-first; returns (results, next_cursor)"""
         try:
             logger.info(f"📋 Fetching all test results (limit: {limit})")
             
-            results = list(self.test_results_collection.find(
-                {},
-                {
-                    "_id": 0, 
-                    "test_id": 1, 
-                    "name": 1, 
-                    "score": 1, 
-                    "total_questions": 1,
-                    "score_percentage": 1, 
-                    "timestamp": 1, 
-                    "user_type": 1,
-                    "Student_ID": 1
-                }
-            ).sort("timestamp", pymongo.DESCENDING).limit(limit))
+            results, next_cursor = self._page_test_results({}, limit, cursor, RESULT_LIST_PROJECTION)
             
             logger.info(f"✅ Retrieved {len(results)} test results")
-            return results
+            return results, next_cursor
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"❌ Failed to get all results: {e}")
             raise Exception(f"All test results retrieval failed: {e}")
     
-    def get_student_list(self) -> List[Dict[str, Any]]:
-        """Get unique students from test results"""
+    def iter_test_results(self, student_id: str = None, cursor: str = None) -> Iterator[Dict[str, Any]]:
+        """Stream test results newest-first in batches, without materializing the list
+        
+        The query is built here, so a bad cursor or student_id raises ValueError
+        before the caller starts a response.
+        """
+        query = self._keyset_filter(cursor, "timestamp", "test_id")
+        if student_id is not None:
+            query["Student_ID"] = int(student_id)
+        
+        find = self.test_results_collection.find(query, RESULT_LIST_PROJECTION).sort([
+            ("timestamp", pymongo.DESCENDING),
+            ("test_id", pymongo.DESCENDING)
+        ]).batch_size(config.EXPORT_BATCH_SIZE)
+        return self._drain(find)
+    
+    @staticmethod
+    def _drain(find) -> Iterator[Dict[str, Any]]:
+        try:
+            yield from find
+        finally:
+            find.close()
+    
+    def _page_test_results(self, query: Dict[str, Any], limit: Optional[int], cursor: Optional[str],
+                           projection: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Keyset page on (timestamp desc, test_id desc); the cursor encodes the last item"""
+        limit = self._page_size(limit, config.STUDENT_TESTS_PAGE_SIZE)
+        query = {**query, **self._keyset_filter(cursor, "timestamp", "test_id")}
+        
+        results = list(self.test_results_collection.find(query, projection).sort([
+            ("timestamp", pymongo.DESCENDING),
+            ("test_id", pymongo.DESCENDING)
+        ]).limit(limit))
+        
+        next_cursor = None
+        if len(results) == limit:
+            last = results[-1]
+            next_cursor = PaginationUtils.encode_cursor({"t": last.get("timestamp"), "id": last.get("test_id")})
+        return results, next_cursor
+    
+    def get_student_list(self, limit: int = None,
+                         cursor: str = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get students newest-first from the rollups; returns (students, next_cursor)"""
         try:
             logger.info("👥 Fetching student list")
             
-            pipeline = [
-                {
-                    "$group": {
-                        "_id": "$Student_ID",
-                        "name": {"$first": "$name"},
-                        "latest_test": {"$max": "$timestamp"}
-                    }
-                },
-                {
-                    "$project": {
-                        "_id": 0,
-                        "Student_ID": "$_id",
-                        "name": 1,
-                        "latest_test": 1
-                    }
-                },
-                {"$sort": {"latest_test": -1}}
-            ]
+            limit = self._page_size(limit, None)
+            query = self._keyset_filter(cursor, "latest.timestamp", "_id")
+            find = self.student_rollups_collection.find(query).sort([
+                ("latest.timestamp", pymongo.DESCENDING),
+                ("_id", pymongo.DESCENDING)
+            ])
+            if limit:
+                find = find.limit(limit)
+            
+            rollups = list(find)
+            students = []
+            for rollup in rollups:
+                latest = rollup.get("latest") or {}
+                test_count = rollup.get("test_count", 0)
+                students.append({
+                    "Student_ID": rollup["_id"],
+                    "name": rollup.get("name"),
+                    "latest_test": latest.get("timestamp"),
+                    "latest_test_id": latest.get("test_id"),
+                    "test_count": test_count,
+                    "best_score_percentage": rollup.get("best_score_percentage", 0),
+                    "average_score_percentage": round(
+                        rollup.get("score_percentage_sum", 0) / test_count, 1
+                    ) if test_count else 0,
+                    "histogram": rollup.get("histogram", {})
+                })
             
-            students = list(self.test_results_collection.aggregate(pipeline))
+            next_cursor = None
+            if limit and len(rollups) == limit:
+                last = rollups[-1]
+                next_cursor = PaginationUtils.encode_cursor(
+                    {"t": (last.get("latest") or {}).get("timestamp"), "id": last["_id"]}
+                )
             
             logger.info(f"✅ Retrieved {len(students)} students")
-            return students
+            return students, next_cursor
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"❌ Failed to get students: {e}")
             raise Exception(f"Student list retrieval failed: {e}")
     
-    def get_student_tests(self, student_id: str) -> List[Dict[str, Any]]:
-        """Get tests for specific student"""
+    def get_student_tests(self, student_id: str, limit: int = None,
+                          cursor: str = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of tests for a student, newest-first; returns (tests, next_cursor)"""
         try:
             logger.info(f"📝 Fetching tests for student: {student_id}")
             
-            results = list(self.test_results_collection.find(
+            results, next_cursor = self._page_test_results(
                 {"Student_ID": int(student_id)},
+                limit,
+                cursor,
                 {
                     "_id": 0,
                     "conversation_pairs": 0  # Exclude large fields
                 }
-            ).sort("timestamp", pymongo.DESCENDING))
+            )
             
             logger.info(f"✅ Retrieved {len(results)} tests for student {student_id}")
-            return results
+            return results, next_cursor
             
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"❌ Failed to get student tests: {e}")
             raise Exception(f"Student tests retrieval failed: {e}")
     
-    def _get_student_info(self) -> Dict[str, Any]:
-        """Get student information from MySQL or generate fallback"""
-        try:
-            # Try MySQL first (updated connection)
-            logger.info("🔍 Fetching student info from MySQL")
-            
-            import mysql.connector
-            
-            conn = mysql.connector.connect(
+    @property
+    def mysql_pool(self):
+        """Process-wide MySQL pool shared with the other sub-apps"""
+        if self._mysql_pool is None:
+            from core.mysql_pool import get_mysql_pool
+            self._mysql_pool = get_mysql_pool(
+                host=config.DB_CONFIG['HOST'],
+                port=config.DB_CONFIG['PORT'],
                 user=config.DB_CONFIG['USER'],
                 password=config.DB_CONFIG['PASSWORD'],
-                host=config.DB_CONFIG['HOST'],
                 database=config.DB_CONFIG['DATABASE'],
-                port=config.DB_CONFIG['PORT'],
-                connection_timeout=15
+                connection_timeout=15,
+                pool_size=config.MYSQL_POOL_SIZE,
+                checkout_timeout=config.MYSQL_POOL_TIMEOUT,
+                ping_after_seconds=config.MYSQL_POOL_PING_AFTER_SECONDS,
+                max_lifetime_seconds=config.MYSQL_POOL_MAX_LIFETIME_SECONDS
             )
+        return self._mysql_pool
+    
+    @property
+    def student_directory(self):
+        """Cached tbl_Student IDs/names (shared with the other sub-apps)"""
+        from core.student_directory import get_student_directory
+        return get_student_directory(self.mysql_pool, config.STUDENT_DIRECTORY_TTL_SECONDS)
+    
+    def _get_student_info(self) -> Dict[str, Any]:
+        """Get student information from MySQL or generate fallback"""
+        try:
+            # Try MySQL first (student directory over the pooled connection)
+            logger.info("🔍 Fetching student info from student directory")
             
-            cursor = conn.cursor(dictionary=True)
-            
-            # Get random student
-            cursor.execute("""
-                SELECT ID, First_Name, Last_Name
-                FROM tbl_Student 
-                WHERE ID IS NOT NULL 
-                  AND First_Name IS NOT NULL 
-                  AND Last_Name IS NOT NULL
-                ORDER BY RAND()
-                LIMIT 1
-            """)
-            
-            result = cursor.fetchone()
-            cursor.close()
-            conn.close()
+            # Get random student (O(1) from the directory once loaded)
+            result = self.student_directory.random_student()
             
             if result:
                 student_id = result['ID']
@@ -381,33 +697,40 @@ class DatabaseManager:
             logger.error(f"❌ MongoDB validation failed: {e}")
         
         try:
-            # Test MySQL
-            import mysql.connector
-            conn = mysql.connector.connect(
-                user=config.DB_CONFIG['USER'],
-                password=config.DB_CONFIG['PASSWORD'],
-                host=config.DB_CONFIG['HOST'],
-                database=config.DB_CONFIG['DATABASE'],
-                port=config.DB_CONFIG['PORT'],
-                connection_timeout=10
-            )
-            conn.close()
-            status["sql_server"] = True
-            logger.info("✅ MySQL validation passed")
+            # Test MySQL (ping on a pooled connection)
+            status["sql_server"] = self.mysql_pool.health_check()
+            status["mysql_pool"] = self.mysql_pool.get_stats()
+            if status["sql_server"]:
+                logger.info("✅ MySQL validation passed")
             
         except Exception as e:
             logger.warning(f"⚠️ MySQL validation failed: {e}")
         
+        if self.result_journal:
+            status["result_journal"] = self.result_journal.get_stats()
+        
         # Overall status - MongoDB is critical
         status["overall"] = status["mongodb"] and status["summaries_available"]
         
         return status
     
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """MySQL pool checkout/wait metrics"""
+        if not self._mysql_pool:
+            return {}
+        return {**self._mysql_pool.get_stats(), "student_directory": self.student_directory.get_stats()}
+    
     def close(self):
         """Close database connections"""
         try:
+            # Flush journaled results before the client goes away
+            if self.result_journal:
+                close_result_journal(config.RESULT_JOURNAL_DIR, config.TEST_RESULTS_COLLECTION)
+                self.result_journal = None
             if hasattr(self, 'mongo_client'):
                 self.mongo_client.close()
+            if self._mysql_pool:
+                self._mysql_pool.close_idle()
             logger.info("✅ Database connections closed")
         except Exception as e:
             logger.warning(f"Close connection warning: {e}")
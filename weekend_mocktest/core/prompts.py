@@ -88,6 +88,7 @@ A) [First option - could be correct or plausible distractor]
 B) [Second option - could be correct or plausible distractor]
 C) [Third option - could be correct or plausible distractor]
 D) [Fourth option - could be correct or plausible distractor]
+## Answer: [Letter of the single correct option: A, B, C or D]
 
 === QUESTION 2 ===
 ## Title: [Clear, descriptive title]
@@ -100,11 +101,13 @@ A) [Option A]
 B) [Option B]
 C) [Option C]
 D) [Option D]
+## Answer: [A/B/C/D]
 
 Continue this exact pattern for all {question_count} questions.
 
 IMPORTANT:
 - Only one option should be clearly correct for each question
+- Every question MUST end with its "## Answer:" line giving the correct option letter
 - Distractors should be plausible but clearly wrong to someone who understands the concept
 - Questions should test understanding, not just recall
 - Relate all questions to concepts mentioned in the provided context
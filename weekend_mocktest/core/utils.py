@@ -1,101 +1,188 @@
 # weekend_mocktest/core/utils.py
+import base64
+import heapq
+import itertools
+import json
 import logging
 import time
-import gc
 import threading
 import uuid
+import markdown
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from .config import config
 
 logger = logging.getLogger(__name__)
 
+class TestRecord:
+    """Slot-based record for one active test; supports dict-style access for existing callers"""
+    
+    __slots__ = (
+        "test_id", "user_type", "delivery_mode", "total_questions", "current_question",
+        "questions", "answers", "created_at", "started_at", "expires_at", "lock",
+        # Pipelined evaluation: question_number -> {"correct", "feedback"}, plus running batch tasks
+        "evaluations", "evaluation_queue", "evaluation_tasks",
+        # Optional LLM narrative for locally graded answers
+        "feedback_queue", "feedback_tasks"
+    )
+    
+    def __init__(self, test_id: str, user_type: str, questions: List[Dict[str, Any]], delivery_mode: str):
+        now = time.time()
+        self.test_id = test_id
+        self.user_type = user_type
+        self.delivery_mode = delivery_mode
+        self.total_questions = len(questions)
+        self.current_question = 1
+        self.questions = questions
+        self.answers: List[Dict[str, Any]] = []
+        self.created_at = now
+        self.started_at = now
+        self.expires_at = now + config.TEST_SESSION_TIMEOUT
+        self.lock = threading.Lock()
+        self.evaluations: Dict[int, Dict[str, Any]] = {}
+        self.evaluation_queue: List[Dict[str, Any]] = []
+        self.evaluation_tasks: list = []
+        self.feedback_queue: List[Dict[str, Any]] = []
+        self.feedback_tasks: list = []
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any):
+        setattr(self, key, value)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
 class MemoryManager:
-    """Streamlined memory management for active tests"""
+    """
+    In-process store for active tests and cached question sets.
+    
+    Each test is a slotted TestRecord with its own lock, so answer submission is an
+    atomic check-and-advance. Expiry is driven by a min-heap of deadlines: the
+    cleanup thread sleeps until the earliest one and only touches entries that are
+    due, instead of scanning every test. Rescheduled entries leave stale heap items
+    behind, which are skipped when popped.
+    """
     
     def __init__(self):
-        self.tests = {}  # Active test sessions
-        self.answers = {}  # Test answers
-        self.question_cache = {}  # Generated questions cache
+        self.tests: Dict[str, TestRecord] = {}  # Active test sessions
+        self.question_cache: Dict[str, Dict[str, Any]] = {}  # Generated questions cache
+        self._lock = threading.Lock()  # Guards the indexes and the heap, not record contents
+        self._expiry_heap: List[tuple] = []  # (expires_at, seq, kind, key)
+        self._seq = itertools.count()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self.stats = {"tests_created": 0, "tests_expired": 0, "cache_expired": 0, "answers_submitted": 0}
         self._cleanup_thread = None
         self._start_cleanup_thread()
     
     def _start_cleanup_thread(self):
-        """Start background cleanup thread"""
+        """Start background expiry thread"""
         if self._cleanup_thread and self._cleanup_thread.is_alive():
             return
         
         self._cleanup_thread = threading.Thread(
-            target=self._periodic_cleanup, 
+            target=self._expiry_loop, 
             daemon=True
         )
         self._cleanup_thread.start()
         logger.info("🧹 Cleanup thread started")
     
-    def _periodic_cleanup(self):
-        """Periodic cleanup of expired data"""
-        while True:
+    def _expiry_loop(self):
+        """Sleep until the earliest deadline (or a new, earlier one is scheduled), then expire what is due"""
+        while not self._stopped:
             try:
-                time.sleep(1800)  # 30 minutes
+                with self._lock:
+                    next_deadline = self._expiry_heap[0][0] if self._expiry_heap else None
+                timeout = None if next_deadline is None else max(next_deadline - time.time(), 0)
+                if self._wakeup.wait(timeout):
+                    self._wakeup.clear()
+                    continue
                 self.cleanup_expired_data()
             except Exception as e:
                 logger.error(f"Cleanup thread error: {e}")
+                time.sleep(1)
+    
+    def _schedule_expiry(self, kind: str, key: str, expires_at: float):
+        """Push a deadline; wakes the expiry thread if it is now the earliest. Caller holds self._lock."""
+        earliest = not self._expiry_heap or expires_at < self._expiry_heap[0][0]
+        heapq.heappush(self._expiry_heap, (expires_at, next(self._seq), kind, key))
+        if earliest:
+            self._wakeup.set()
+    
+    def stop(self):
+        """Stop the expiry thread"""
+        self._stopped = True
+        self._wakeup.set()
     
     def cleanup_expired_data(self):
-        """Clean up expired tests and cache"""
+        """Expire tests and cache entries whose deadline has passed (pops only due heap entries)"""
         try:
-            current_time = time.time()
-            
-            # Clean expired tests
-            expired_tests = []
-            for test_id, test_data in list(self.tests.items()):
-                age = current_time - test_data.get("created_at", 0)
-                if age > config.TEST_SESSION_TIMEOUT:
-                    expired_tests.append(test_id)
-            
-            for test_id in expired_tests:
-                self.cleanup_test(test_id)
-            
-            # Clean expired cache
-            cache_expiry = config.QUESTION_CACHE_DURATION_HOURS * 3600
-            expired_cache = []
-            for cache_key, cache_data in list(self.question_cache.items()):
-                age = current_time - cache_data.get("created_at", 0)
-                if age > cache_expiry:
-                    expired_cache.append(cache_key)
-            
-            for cache_key in expired_cache:
-                self.question_cache.pop(cache_key, None)
+            now = time.time()
+            expired_tests = 0
+            expired_cache = 0
             
-            # Force garbage collection
-            gc.collect()
+            with self._lock:
+                while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                    _, _, kind, key = heapq.heappop(self._expiry_heap)
+                    if kind == "test":
+                        record = self.tests.get(key)
+                        # Stale entry: the test was rescheduled or already removed
+                        if record is None or record.expires_at > now:
+                            continue
+                        del self.tests[key]
+                        expired_tests += 1
+                    else:
+                        entry = self.question_cache.get(key)
+                        if entry is None or entry["expires_at"] > now:
+                            continue
+                        del self.question_cache[key]
+                        expired_cache += 1
+                
+                self.stats["tests_expired"] += expired_tests
+                self.stats["cache_expired"] += expired_cache
             
             if expired_tests or expired_cache:
-                logger.info(f"🧹 Cleaned: {len(expired_tests)} tests, {len(expired_cache)} cache entries")
+                logger.info(f"🧹 Cleaned: {expired_tests} tests, {expired_cache} cache entries")
         
         except Exception as e:
             logger.error(f"Cleanup failed: {e}")
     
-    def create_test(self, user_type: str, questions: List[Dict[str, Any]]) -> str:
+    def create_test(self, user_type: str, questions: List[Dict[str, Any]], delivery_mode: str = "sequential") -> str:
         """Create new test session"""
         test_id = str(uuid.uuid4())
+        record = TestRecord(test_id, user_type, questions, delivery_mode)
         
-        self.tests[test_id] = {
-            "user_type": user_type,
-            "total_questions": len(questions),
-            "current_question": 1,
-            "questions": questions,
-            "created_at": time.time(),
-            "started_at": time.time()
-        }
-        
-        self.answers[test_id] = []
+        with self._lock:
+            self.tests[test_id] = record
+            self._schedule_expiry("test", test_id, record.expires_at)
+            self.stats["tests_created"] += 1
         
         logger.info(f"📝 Test created: {test_id} ({len(questions)} questions)")
         return test_id
     
-    def get_test(self, test_id: str) -> Optional[Dict[str, Any]]:
-        """Get test data"""
+    def reset_clock(self, test_id: str, started_at: float) -> bool:
+        """Move a test's start (and its expiry) to started_at, e.g. for pre-provisioned exam records"""
+        record = self.tests.get(test_id)
+        if not record:
+            return False
+        
+        with record.lock:
+            record.created_at = record.started_at = started_at
+            record.expires_at = started_at + config.TEST_SESSION_TIMEOUT
+        with self._lock:
+            self._schedule_expiry("test", test_id, record.expires_at)
+        return True
+    
+    def get_test(self, test_id: str) -> Optional[TestRecord]:
+        """Get test record"""
         return self.tests.get(test_id)
     
     def get_current_question(self, test_id: str) -> Optional[Dict[str, Any]]:
@@ -104,15 +191,16 @@ class MemoryManager:
         if not test:
             return None
         
-        current_q_num = test["current_question"]
-        questions = test["questions"]
+        with test.lock:
+            current_q_num = test.current_question
+        questions = test.questions
         
         if 1 <= current_q_num <= len(questions):
             question_data = questions[current_q_num - 1]
             return {
                 "question_number": current_q_num,
                 "total_questions": len(questions),
-                "question_html": question_data["question"],
+                "question_html": question_data.get("question_html") or render_question_html(question_data["question"]),
                 "options": question_data.get("options"),
                 "difficulty": question_data.get("difficulty", "Medium"),
                 "type": question_data.get("type", "General")
@@ -120,34 +208,36 @@ class MemoryManager:
         
         return None
     
-    def submit_answer(self, test_id: str, question_number: int, answer: str) -> bool:
-        """Submit answer for test question"""
+    def submit_answer(self, test_id: str, question_number: int, answer: str,
+                      submitted_at: Optional[float] = None) -> bool:
+        """Submit answer for test question (atomic check-and-advance under the test's lock)"""
         test = self.tests.get(test_id)
-        if not test or question_number != test["current_question"]:
+        if not test:
             return False
         
-        questions = test["questions"]
-        if 1 <= question_number <= len(questions):
-            question_data = questions[question_number - 1]
+        with test.lock:
+            if question_number != test.current_question or not (1 <= question_number <= len(test.questions)):
+                return False
+            
+            question_data = test.questions[question_number - 1]
             
             # Store answer
-            answer_data = {
+            test.answers.append({
                 "question_number": question_number,
                 "question": question_data["question"],
                 "answer": answer,
                 "options": question_data.get("options", []),
-                "submitted_at": time.time()
-            }
-            
-            self.answers[test_id].append(answer_data)
+                "correct_option": question_data.get("correct_option"),
+                "submitted_at": submitted_at or time.time()
+            })
             
             # Move to next question
-            test["current_question"] += 1
-            
-            logger.info(f"✅ Answer submitted: {test_id} Q{question_number}")
-            return True
+            test.current_question += 1
         
-        return False
+        with self._lock:
+            self.stats["answers_submitted"] += 1
+        logger.info(f"✅ Answer submitted: {test_id} Q{question_number}")
+        return True
     
     def is_test_complete(self, test_id: str) -> bool:
         """Check if test is completed"""
@@ -155,48 +245,52 @@ class MemoryManager:
         if not test:
             return False
         
-        return test["current_question"] > test["total_questions"]
+        return test.current_question > test.total_questions
     
     def get_test_answers(self, test_id: str) -> List[Dict[str, Any]]:
         """Get all answers for test"""
-        return self.answers.get(test_id, [])
+        test = self.tests.get(test_id)
+        return test.answers if test else []
     
     def cache_questions(self, cache_key: str, questions: List[Dict[str, Any]]):
         """Cache generated questions"""
-        self.question_cache[cache_key] = {
-            "questions": questions,
-            "created_at": time.time()
-        }
+        now = time.time()
+        expires_at = now + config.QUESTION_CACHE_DURATION_HOURS * 3600
+        with self._lock:
+            self.question_cache[cache_key] = {
+                "questions": questions,
+                "created_at": now,
+                "expires_at": expires_at
+            }
+            self._schedule_expiry("cache", cache_key, expires_at)
         logger.info(f"💾 Questions cached: {cache_key}")
     
     def get_cached_questions(self, cache_key: str) -> Optional[List[Dict[str, Any]]]:
         """Get cached questions if not expired"""
         cache_data = self.question_cache.get(cache_key)
-        if not cache_data:
-            return None
-        
-        # Check expiry
-        age = time.time() - cache_data["created_at"]
-        max_age = config.QUESTION_CACHE_DURATION_HOURS * 3600
-        
-        if age > max_age:
-            self.question_cache.pop(cache_key, None)
+        if not cache_data or cache_data["expires_at"] <= time.time():
             return None
         
         return cache_data["questions"]
     
     def cleanup_test(self, test_id: str):
-        """Clean up specific test"""
-        self.tests.pop(test_id, None)
-        self.answers.pop(test_id, None)
+        """Clean up specific test (its heap entry is dropped lazily)"""
+        with self._lock:
+            self.tests.pop(test_id, None)
         logger.info(f"🗑️ Test cleaned: {test_id}")
     
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get memory usage statistics"""
+        with self._lock:
+            next_expiry = self._expiry_heap[0][0] - time.time() if self._expiry_heap else None
+            heap_size = len(self._expiry_heap)
         return {
+            **self.stats,
             "active_tests": len(self.tests),
             "cached_questions": len(self.question_cache),
-            "total_answers": sum(len(answers) for answers in self.answers.values()),
+            "total_answers": sum(len(test.answers) for test in list(self.tests.values())),
+            "expiry_heap_size": heap_size,
+            "next_expiry_seconds": round(next_expiry, 1) if next_expiry is not None else None,
             "cleanup_thread_alive": self._cleanup_thread.is_alive() if self._cleanup_thread else False
         }
 
@@ -282,10 +376,35 @@ class DateTimeUtils:
         except (ValueError, OSError):
             return False
 
+class PaginationUtils:
+    """Opaque keyset-pagination cursors"""
+    
+    @staticmethod
+    def encode_cursor(position: Dict[str, Any]) -> str:
+        """Encode the sort key of the last returned item"""
+        raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Dict[str, Any]:
+        """Decode a cursor from encode_cursor; raises ValueError if it is malformed"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        except Exception:
+            raise ValueError("Invalid cursor")
+        if not isinstance(position, dict):
+            raise ValueError("Invalid cursor")
+        return position
+
 # Global instances
 memory_manager = MemoryManager()
 
 # Helper functions
+def render_question_html(question_markdown: str) -> str:
+    """Render question markdown to HTML (done once when questions are generated)"""
+    return markdown.markdown(question_markdown, extensions=['codehilite', 'fenced_code'])
+
 def generate_test_id() -> str:
     """Generate unique test ID"""
     return str(uuid.uuid4())
@@ -313,6 +432,7 @@ def cleanup_all():
     """Clean up all resources"""
     try:
         memory_manager.cleanup_expired_data()
+        memory_manager.stop()
         logger.info("✅ All resources cleaned")
     except Exception as e:
         logger.error(f"❌ Cleanup failed: {e}")
\ No newline at end of file
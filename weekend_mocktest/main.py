@@ -4,12 +4,14 @@ import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.exception_handlers import request_validation_exception_handler
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from .core.config import config
 from .core.database import get_db_manager, close_db_manager
-from .core.ai_services import get_ai_service
+from .core.ai_services import get_ai_service, close_ai_service
 from .core.utils import cleanup_all
 from .api.routes import router
 
@@ -36,17 +38,28 @@ async def lifespan(app: FastAPI):
             raise Exception(f"Database validation failed: {db_health}")
         logger.info("Database connected and validated")
 
+        # Load the student directory now so test saves never wait on MySQL
+        try:
+            students = await db_manager.student_directory.arefresh()
+            logger.info("Student directory loaded: %s students", students)
+        except Exception as e:
+            logger.warning("Student directory warm-up failed (will retry on demand): %s", e)
+
         logger.info("Initializing AI service...")
         ai_service = get_ai_service()
-        ai_health = ai_service.health_check()
+        ai_health = await ai_service.health_check()
         if ai_health["status"] != "healthy":
             raise Exception(f"AI service validation failed: {ai_health}")
         logger.info("AI service connected and validated")
 
+        logger.info("Starting question bank refill worker...")
+        from .services.question_bank import get_question_bank
+        get_question_bank().start()
+
         logger.info("Testing core functionality...")
         from .services.test_service import get_test_service
         test_service = get_test_service()
-        service_health = test_service.health_check()
+        service_health = await test_service.health_check()
         if service_health["status"] != "healthy":
             logger.warning("Test service health warning: %s", service_health)
 
@@ -59,8 +72,13 @@ async def lifespan(app: FastAPI):
 
     logger.info("Shutting down...")
     try:
+        from .services.question_bank import get_question_bank
+        from .services.exam_scheduler import get_exam_scheduler
+        await get_exam_scheduler().stop()
+        await get_question_bank().stop()
         cleanup_all()
         close_db_manager()
+        await close_ai_service()
         logger.info("Graceful shutdown completed")
     except Exception as e:
         logger.error("Shutdown error: %s", e)
@@ -98,6 +116,24 @@ async def value_error_handler(request: Request, exc: ValueError):
         "type": "validation_error",
     })
 
+# Batch submissions report malformed items as 400; every other endpoint keeps FastAPI's 422
+BATCH_SUBMIT_PATH = "/api/test/submit-batch"
+
+@app.exception_handler(RequestValidationError)
+async def request_validation_handler(request: Request, exc: RequestValidationError):
+    # endswith: the sub-app may be mounted under a prefix
+    if not request.url.path.endswith(BATCH_SUBMIT_PATH):
+        return await request_validation_exception_handler(request, exc)
+    message = "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'][1:])}: {error['msg']}" for error in exc.errors()
+    )
+    logger.warning("Request validation error: %s", message)
+    return JSONResponse(status_code=400, content={
+        "error": "Validation Error",
+        "message": message,
+        "type": "validation_error",
+    })
+
 @app.exception_handler(FileNotFoundError)
 async def file_not_found_handler(request: Request, exc: FileNotFoundError):
     logger.warning("File not found: %s", exc)
@@ -127,7 +163,7 @@ async def health_check():
         try:
             from .services.test_service import get_test_service
             test_service = get_test_service()
-            test_health = test_service.health_check()
+            test_health = await test_service.health_check()
             health_status["test_service"] = test_health["status"]
             health_status["active_tests"] = test_health.get("active_tests", 0)
         except Exception as e:
@@ -136,7 +172,7 @@ async def health_check():
 
         try:
             ai_service = get_ai_service()
-            ai_health = ai_service.health_check()
+            ai_health = await ai_service.health_check()
             health_status["ai_service"] = ai_health["status"]
         except Exception as e:
             health_status["ai_service"] = "error"
@@ -183,6 +219,7 @@ async def api_info():
             "submit_answer": "POST /api/test/submit",
             "get_results": "GET /api/test/results/{test_id}",
             "download_pdf": "GET /api/test/pdf/{test_id}",
+            "schedule_exam": "POST /api/admin/exams",
             "health": "GET /health",
             "docs": "GET /docs",
         },
@@ -1,6 +1,6 @@
 # weekend_mocktest/models/schemas.py
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, validator
+from pydantic import AliasChoices, BaseModel, Field, validator
 import uuid
 
 class StartTestRequest(BaseModel):
@@ -33,6 +33,26 @@ class SubmitAnswerRequest(BaseModel):
             raise ValueError("Answer cannot be empty")
         return v.strip()
 
+class BatchAnswerItem(BaseModel):
+    """One answer in a batched submission (frontend camelCase keys accepted)"""
+    question_number: int = Field(..., ge=1, description="Question number (1-based)",
+                                 validation_alias=AliasChoices("question_number", "questionNumber"))
+    answer: str = Field(..., min_length=1, description="Answer text or option index")
+    submitted_at: float = Field(..., description="Client timestamp when the answer was given",
+                                validation_alias=AliasChoices("submitted_at", "submittedAt"))
+
+class SubmitAnswersBatchRequest(BaseModel):
+    """Request model for submitting all answers (or a checkpoint) of a full-delivery test"""
+    test_id: str = Field(..., description="Test ID", validation_alias=AliasChoices("test_id", "testId"))
+    answers: List[BatchAnswerItem] = Field(..., min_length=1, description="Answers in question order")
+    
+    @validator('answers')
+    def validate_unique_question_numbers(cls, v):
+        numbers = [item.question_number for item in v]
+        if len(set(numbers)) != len(numbers):
+            raise ValueError("Duplicate question numbers in batch")
+        return v
+
 class NextQuestionResponse(BaseModel):
     """Response model for next question"""
     question_number: int = Field(..., description="Current question number")
@@ -50,6 +70,7 @@ class TestResponse(BaseModel):
     question_html: str = Field(..., description="Question content in HTML")
     options: Optional[List[str]] = Field(None, description="Options for MCQ")
     time_limit: int = Field(..., description="Time limit per question in seconds")
+    questions: Optional[List[NextQuestionResponse]] = Field(None, description="All questions (full delivery mode)")
 
 class SubmitAnswerResponse(BaseModel):
     """Response model for answer submission"""
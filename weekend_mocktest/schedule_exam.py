@@ -0,0 +1,78 @@
+# weekend_mocktest/schedule_exam.py
+"""
+Schedule cohort exams on a running Mock Test API.
+
+Provisioning runs inside the API process, so this CLI only talks to the admin endpoints:
+
+    python weekend_mocktest/schedule_exam.py create --user-type dev --headcount 120 --start 2026-10-24T10:00
+    python weekend_mocktest/schedule_exam.py list
+    python weekend_mocktest/schedule_exam.py status <event_id>
+    python weekend_mocktest/schedule_exam.py cancel <event_id>
+"""
+import argparse
+import json
+import os
+import ssl
+import sys
+import urllib.error
+import urllib.request
+
+DEFAULT_API_URL = os.getenv("MOCKTEST_API_URL", "https://localhost:8070/weekend_mocktest")
+
+def call_api(base_url: str, method: str, path: str, payload: dict = None, insecure: bool = False) -> dict:
+    """Send a JSON request to the admin API and return the decoded response"""
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(
+        base_url.rstrip("/") + path,
+        data=data,
+        method=method,
+        headers={"Content-Type": "application/json"}
+    )
+    # The dev server runs with a self-signed certificate
+    context = ssl._create_unverified_context() if insecure else None
+    try:
+        with urllib.request.urlopen(request, timeout=30, context=context) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        detail = e.read().decode("utf-8", errors="replace")
+        raise SystemExit(f"❌ {method} {path} failed ({e.code}): {detail}")
+    except urllib.error.URLError as e:
+        raise SystemExit(f"❌ Cannot reach {base_url}: {e.reason}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule pre-provisioned cohort exams")
+    parser.add_argument("--api-url", default=DEFAULT_API_URL, help="Mock Test API base URL")
+    parser.add_argument("--insecure", action="store_true", help="Skip TLS certificate verification")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create", help="Schedule an exam")
+    create.add_argument("--user-type", choices=["dev", "non_dev"], required=True)
+    create.add_argument("--headcount", type=int, required=True, help="Expected number of candidates")
+    create.add_argument("--start", required=True, help="Start time, ISO 8601 (server local time without offset)")
+
+    commands.add_parser("list", help="List scheduled exams")
+    status = commands.add_parser("status", help="Show one exam")
+    status.add_argument("event_id")
+    cancel = commands.add_parser("cancel", help="Cancel an exam")
+    cancel.add_argument("event_id")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "create":
+        result = call_api(args.api_url, "POST", "/api/admin/exams", {
+            "user_type": args.user_type,
+            "headcount": args.headcount,
+            "start_at": args.start
+        }, args.insecure)
+    elif args.command == "list":
+        result = call_api(args.api_url, "GET", "/api/admin/exams", insecure=args.insecure)
+    elif args.command == "status":
+        result = call_api(args.api_url, "GET", f"/api/admin/exams/{args.event_id}", insecure=args.insecure)
+    else:
+        result = call_api(args.api_url, "DELETE", f"/api/admin/exams/{args.event_id}", insecure=args.insecure)
+
+    print(json.dumps(result, indent=2, default=str))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+# weekend_mocktest/services/exam_scheduler.py
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Dict, Any, List, Optional
+from ..core.config import config
+from ..core.utils import memory_manager, DateTimeUtils
+from .question_bank import get_question_bank
+
+logger = logging.getLogger(__name__)
+
+class ExamScheduler:
+    """Scheduled cohort exams: question sets and test records are provisioned before the start time"""
+
+    def __init__(self):
+        self.question_bank = get_question_bank()
+        # event_id -> event record; prepared test ids are claimed FIFO by start_test
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        logger.info("📅 Exam scheduler initialized")
+
+    # ==================== Scheduling ====================
+
+    def schedule_event(self, user_type: str, headcount: int, start_at: float) -> Dict[str, Any]:
+        """Schedule an exam; provisioning starts EXAM_PROVISION_LEAD_MINUTES before start_at"""
+        if user_type not in ("dev", "non_dev"):
+            raise ValueError("Invalid user type")
+        if not (1 <= headcount <= config.EXAM_MAX_HEADCOUNT):
+            raise ValueError(f"headcount must be between 1 and {config.EXAM_MAX_HEADCOUNT}")
+        if start_at <= time.time():
+            raise ValueError("start_at must be in the future")
+
+        event_id = str(uuid.uuid4())
+        self.events[event_id] = {
+            "event_id": event_id,
+            "user_type": user_type,
+            "headcount": headcount,
+            "start_at": start_at,
+            "provision_at": start_at - config.EXAM_PROVISION_LEAD_MINUTES * 60,
+            "status": "scheduled",
+            "prepared": deque(),
+            "provisioned": 0,
+            "claimed": 0,
+            "error": None,
+            "created_at": time.time()
+        }
+        self._tasks[event_id] = asyncio.create_task(self._run_event(event_id))
+        logger.info(f"📅 Exam scheduled: {event_id} ({user_type} x{headcount} at {start_at})")
+        return self.get_event(event_id)
+
+    def cancel_event(self, event_id: str) -> bool:
+        """Cancel an event and release its unclaimed test records"""
+        event = self.events.pop(event_id, None)
+        if not event:
+            return False
+
+        task = self._tasks.pop(event_id, None)
+        if task and not task.done():
+            task.cancel()
+        for test_id in event["prepared"]:
+            memory_manager.cleanup_test(test_id)
+        logger.info(f"🗑️ Exam cancelled: {event_id} ({len(event['prepared'])} records released)")
+        return True
+
+    async def stop(self):
+        """Cancel pending provisioning tasks"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run_event(self, event_id: str):
+        """Sleep until the provisioning window, then prepare every test record"""
+        event = self.events[event_id]
+        try:
+            delay = event["provision_at"] - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            event["status"] = "provisioning"
+            await self._provision(event)
+            event["status"] = "ready"
+            logger.info(f"✅ Exam ready: {event_id} ({event['provisioned']} tests prepared)")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            event["status"] = "failed"
+            event["error"] = str(e)
+            logger.error(f"❌ Exam provisioning failed for {event_id}: {e}")
+
+    async def _provision(self, event: Dict[str, Any]):
+        """Draw question sets from the bank and preallocate a test record for each candidate"""
+        from .test_service import get_test_service
+        test_service = get_test_service()
+        user_type = event["user_type"]
+        # Unclaimed records expire TEST_SESSION_TIMEOUT after the join window closes
+        expires_from = event["start_at"] + config.EXAM_JOIN_WINDOW_MINUTES * 60
+        failures = 0
+
+        while event["provisioned"] < event["headcount"]:
+            try:
+                # Wait for real refills rather than the bank's cold-start fallback set
+                if len(self.question_bank.pools[user_type]) < config.QUESTIONS_PER_TEST:
+                    await self.question_bank.refill(user_type)
+                questions_data = await self.question_bank.get_question_set(user_type, config.QUESTIONS_PER_TEST)
+            except Exception as e:
+                failures += 1
+                if failures > config.MAX_RETRIES:
+                    raise Exception(f"Question sets unavailable after {event['provisioned']} tests: {e}")
+                logger.warning(f"⚠️ Provisioning retry {failures} for {event['event_id']}: {e}")
+                await asyncio.sleep(config.RETRY_DELAY * failures)
+                continue
+
+            questions = test_service._standardize_questions(questions_data)
+            test_id = memory_manager.create_test(user_type, questions)
+            memory_manager.reset_clock(test_id, expires_from)
+            event["prepared"].append(test_id)
+            event["provisioned"] += 1
+
+            # Let regular traffic interleave with a large provisioning run
+            await asyncio.sleep(0)
+
+    # ==================== Claiming ====================
+
+    def claim_test(self, user_type: str, event_id: Optional[str] = None) -> Optional[str]:
+        """Hand out a prepared test record for an open event, or None to fall back to the bank"""
+        now = time.time()
+        for event in self._open_events(user_type, now, event_id):
+            while event["prepared"]:
+                test_id = event["prepared"].popleft()
+                if not memory_manager.reset_clock(test_id, now):
+                    continue
+                event["claimed"] += 1
+                return test_id
+        return None
+
+    def _open_events(self, user_type: str, now: float, event_id: Optional[str]) -> List[Dict[str, Any]]:
+        """Ready events for the user type whose join window contains now"""
+        early = config.EXAM_EARLY_JOIN_MINUTES * 60
+        window = config.EXAM_JOIN_WINDOW_MINUTES * 60
+        events = [self.events[event_id]] if event_id in self.events else (
+            [] if event_id else list(self.events.values())
+        )
+        return sorted(
+            (e for e in events
+             if e["user_type"] == user_type and e["status"] == "ready"
+             and e["start_at"] - early <= now <= e["start_at"] + window),
+            key=lambda e: e["start_at"]
+        )
+
+    # ==================== Status ====================
+
+    def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Event status without the prepared id queue"""
+        event = self.events.get(event_id)
+        if not event:
+            return None
+        return {
+            **{k: v for k, v in event.items() if k != "prepared"},
+            "available": len(event["prepared"]),
+            "start_time": DateTimeUtils.format_timestamp(event["start_at"])
+        }
+
+    def list_events(self) -> List[Dict[str, Any]]:
+        return sorted((self.get_event(event_id) for event_id in self.events), key=lambda e: e["start_at"])
+
+# Singleton instance
+_exam_scheduler = None
+
+def get_exam_scheduler() -> ExamScheduler:
+    """Get exam scheduler singleton"""
+    global _exam_scheduler
+    if _exam_scheduler is None:
+        _exam_scheduler = ExamScheduler()
+    return _exam_scheduler
@@ -24,10 +24,7 @@ class PDFService:
         
         try:
             # Get test results from database
-            doc = self.db_manager.test_results_collection.find_one(
-                {"test_id": test_id}, 
-                {"_id": 0}
-            )
+            doc = self.db_manager.get_result_document(test_id)
             
             if not doc:
                 raise Exception("Test results not found")
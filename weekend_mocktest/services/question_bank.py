@@ -0,0 +1,202 @@
+# weekend_mocktest/services/question_bank.py
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Any, List, Optional
+from ..core.config import config
+from ..core.ai_services import get_ai_service
+from ..core.content_service import get_content_service
+from ..core.utils import memory_manager, DateTimeUtils, render_question_html
+
+logger = logging.getLogger(__name__)
+
+USER_TYPES = ("dev", "non_dev")
+
+class QuestionBank:
+    """Pools of pre-generated, validated questions per user type, refilled in the background"""
+
+    def __init__(self):
+        self.ai_service = get_ai_service()
+        self.content_service = get_content_service()
+        # user_type -> [{"question": {...}, "created_at": float, "uses": int}]
+        self.pools: Dict[str, List[Dict[str, Any]]] = {user_type: [] for user_type in USER_TYPES}
+        # Single-flight refills: user_type -> running refill task shared by every caller
+        self._refills: Dict[str, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self.stats = {"sets_served": 0, "refills": 0, "refill_failures": 0, "cold_starts": 0,
+                      "coalesced_waits": 0, "fallback_sets": 0}
+        logger.info("🏦 Question bank initialized")
+
+    # ==================== Background refill ====================
+
+    def start(self):
+        """Start background refill worker (fills the pools right away)"""
+        if self._worker and not self._worker.done():
+            return
+        self._worker = asyncio.create_task(self._refill_worker())
+        logger.info("🔄 Question bank refill worker started")
+
+    async def stop(self):
+        """Stop background refill worker"""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            logger.info("🛑 Question bank refill worker stopped")
+
+    async def _refill_worker(self):
+        """Top up any pool below the low watermark, then sleep until woken or the check interval passes"""
+        while True:
+            try:
+                for user_type in USER_TYPES:
+                    if self._needs_refill(user_type):
+                        await self.refill(user_type)
+
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=config.QUESTION_BANK_CHECK_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Question bank worker error: {e}")
+                await asyncio.sleep(config.RETRY_DELAY)
+
+    def _needs_refill(self, user_type: str) -> bool:
+        self._expire(user_type)
+        return len(self.pools[user_type]) < config.QUESTION_BANK_LOW_WATERMARK
+
+    def _expire(self, user_type: str):
+        """Retire questions generated from stale summaries"""
+        max_age = config.QUESTION_BANK_MAX_AGE_HOURS * 3600
+        now = time.time()
+        pool = self.pools[user_type]
+        fresh = [entry for entry in pool if now - entry["created_at"] <= max_age]
+        if len(fresh) != len(pool):
+            logger.info(f"🗑️ Retired {len(pool) - len(fresh)} stale {user_type} questions")
+            # In place: a running refill holds a reference to this list
+            pool[:] = fresh
+
+    def refill(self, user_type: str) -> asyncio.Task:
+        """Start a refill, or join the one already running for this user type (single-flight)"""
+        task = self._refills.get(user_type)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refill(user_type))
+            self._refills[user_type] = task
+        else:
+            self.stats["coalesced_waits"] += 1
+        return task
+
+    async def _refill(self, user_type: str):
+        """Generate batches until the pool reaches its target size"""
+        pool = self.pools[user_type]
+        max_batches = -(-config.QUESTION_BANK_TARGET_SIZE // config.QUESTIONS_PER_TEST) + 1
+
+        for _ in range(max_batches):
+            if len(pool) >= config.QUESTION_BANK_TARGET_SIZE:
+                break
+            try:
+                # Summaries are read with the sync driver; keep it off the event loop
+                context = await asyncio.to_thread(self.content_service.get_context_for_questions, user_type)
+
+                context_quality = self.content_service.validate_context_quality(context)
+                if not context_quality["is_high_quality"]:
+                    logger.warning(f"Low quality context: {context_quality}")
+
+                generated = await self.ai_service.generate_questions_batch(user_type, context)
+                
+                # Render once here so serving never runs markdown on the event loop
+                await asyncio.to_thread(self._render_html, generated)
+            except Exception as e:
+                self.stats["refill_failures"] += 1
+                logger.error(f"❌ Question bank refill failed for {user_type}: {e}")
+                break
+
+            # Last complete batch is kept as today's fallback set
+            memory_manager.cache_questions(self._fallback_key(user_type), generated)
+
+            # Only the new questions are compared (against the pool and each other), off the event loop
+            existing = [entry["question"] for entry in pool]
+            fresh = await asyncio.to_thread(self.ai_service.dedupe_questions, generated, existing)
+            created_at = time.time()
+            pool.extend({"question": q, "created_at": created_at, "uses": 0} for q in fresh)
+            self.stats["refills"] += 1
+            logger.info(f"🏦 Added {len(fresh)} {user_type} questions (pool: {len(pool)})")
+
+    @staticmethod
+    def _render_html(questions: List[Dict[str, Any]]):
+        for question in questions:
+            question["question_html"] = render_question_html(question["question"])
+
+    @staticmethod
+    def _fallback_key(user_type: str) -> str:
+        return f"questions_{user_type}_{DateTimeUtils.get_cache_key_date()}"
+
+    # ==================== Serving ====================
+
+    async def get_question_set(self, user_type: str, count: int = None) -> List[Dict[str, Any]]:
+        """Random, non-repeating question set from the pool; generation only happens on a cold pool"""
+        count = count or config.QUESTIONS_PER_TEST
+        self._expire(user_type)
+
+        if len(self.pools[user_type]) < count:
+            # Every concurrent cold start awaits the same refill, for a bounded time
+            self.stats["cold_starts"] += 1
+            logger.warning(f"⚠️ {user_type} question bank cold ({len(self.pools[user_type])}/{count}); awaiting refill")
+            try:
+                await asyncio.wait_for(asyncio.shield(self.refill(user_type)),
+                                       timeout=config.QUESTION_BANK_COLD_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning(f"⏱️ {user_type} refill still running after {config.QUESTION_BANK_COLD_WAIT_SECONDS}s")
+            except Exception as e:
+                logger.error(f"❌ {user_type} refill failed: {e}")
+
+        pool = self.pools[user_type]
+        if len(pool) < count:
+            fallback = memory_manager.get_cached_questions(self._fallback_key(user_type))
+            if fallback:
+                self.stats["fallback_sets"] += 1
+                logger.warning(f"📋 Serving today's cached {user_type} set as fallback")
+                return [dict(q) for q in fallback[:count]]
+            raise Exception(f"Question bank has only {len(pool)} {user_type} questions available")
+
+        indices = random.sample(range(len(pool)), count)
+        question_set = [dict(pool[i]["question"]) for i in indices]
+
+        # Count uses and swap-remove questions that reached their reuse limit
+        for i in sorted(indices, reverse=True):
+            pool[i]["uses"] += 1
+            if pool[i]["uses"] >= config.QUESTION_BANK_MAX_USES:
+                pool[i] = pool[-1]
+                pool.pop()
+
+        self.stats["sets_served"] += 1
+        if len(pool) < config.QUESTION_BANK_LOW_WATERMARK:
+            self._wakeup.set()
+
+        return question_set
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool sizes and refill counters"""
+        return {
+            **self.stats,
+            "pool_sizes": {user_type: len(pool) for user_type, pool in self.pools.items()},
+            "refilling": [user_type for user_type, task in self._refills.items() if not task.done()],
+            "worker_alive": bool(self._worker and not self._worker.done())
+        }
+
+# Singleton instance
+_question_bank = None
+
+def get_question_bank() -> QuestionBank:
+    """Get question bank singleton"""
+    global _question_bank
+    if _question_bank is None:
+        _question_bank = QuestionBank()
+    return _question_bank
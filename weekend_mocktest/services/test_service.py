@@ -1,13 +1,18 @@
 # weekend_mocktest/services/test_service.py
+import asyncio
+import difflib
+import json
 import logging
-import markdown
+import re
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from ..core.config import config
 from ..core.database import get_db_manager
 from ..core.ai_services import get_ai_service
 from ..core.content_service import get_content_service
-from ..core.utils import memory_manager, generate_test_id, ValidationUtils, DateTimeUtils
+from ..core.utils import memory_manager, generate_test_id, ValidationUtils, DateTimeUtils, render_question_html
+from .question_bank import get_question_bank
+from .exam_scheduler import get_exam_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -18,59 +23,40 @@ class TestService:
         self.db_manager = get_db_manager()
         self.ai_service = get_ai_service()
         self.content_service = get_content_service()
+        self.question_bank = get_question_bank()
+        self.exam_scheduler = get_exam_scheduler()
         logger.info("🚀 Test service initialized")
     
-    async def start_test(self, user_type: str):
-        """Start new test with AI-generated questions"""
-        logger.info(f"🎯 Starting {user_type} test")
+    async def start_test(self, user_type: str, delivery_mode: str = "sequential", event_id: Optional[str] = None):
+        """Start new test with a question set sampled from the pre-generated bank"""
+        logger.info(f"🎯 Starting {user_type} test ({delivery_mode})")
         
         if not ValidationUtils.validate_user_type(user_type):
             raise ValueError("Invalid user type")
+        if delivery_mode not in ("sequential", "full"):
+            raise ValueError("Invalid delivery mode")
         
         try:
-            # Check cache first
-            cache_key = f"questions_{user_type}_{DateTimeUtils.get_cache_key_date()}"
-            cached_questions = memory_manager.get_cached_questions(cache_key)
-            
-            if cached_questions:
-                logger.info(f"📋 Using cached questions: {len(cached_questions)}")
-                questions = cached_questions
+            # During a scheduled exam the test record is already prepared
+            test_id = self.exam_scheduler.claim_test(user_type, event_id)
+            if test_id:
+                memory_manager.get_test(test_id)["delivery_mode"] = delivery_mode
+                questions = memory_manager.get_test(test_id)["questions"]
+                logger.info(f"📅 Claimed pre-provisioned test {test_id}")
             else:
-                # Generate fresh questions
-                logger.info("🤖 Generating new questions with AI")
-                
-                # Get context from summaries
-                context = self.content_service.get_context_for_questions(user_type)
-                
-                # Validate context quality
-                context_quality = self.content_service.validate_context_quality(context)
-                if not context_quality["is_high_quality"]:
-                    logger.warning(f"Low quality context: {context_quality}")
-                
-                # Generate questions using AI
-                questions_data = self.ai_service.generate_questions_batch(user_type, context)
-                
-                # Convert to standardized format
+                # Sample a fresh set from the question bank (refilled in the background)
+                questions_data = await self.question_bank.get_question_set(user_type, config.QUESTIONS_PER_TEST)
                 questions = self._standardize_questions(questions_data)
+                logger.info(f"📋 Sampled {len(questions)} questions from bank")
                 
-                # Cache for future use
-                memory_manager.cache_questions(cache_key, questions)
-                logger.info(f"💾 Cached {len(questions)} questions")
-            
-            # Create test session
-            test_id = memory_manager.create_test(user_type, questions)
+                # Create test session
+                test_id = memory_manager.create_test(user_type, questions, delivery_mode)
             
             # Get first question
             current_question = memory_manager.get_current_question(test_id)
             if not current_question:
                 raise Exception("Failed to retrieve first question")
             
-            # Convert markdown to HTML
-            current_question["question_html"] = markdown.markdown(
-                current_question["question_html"], 
-                extensions=['codehilite', 'fenced_code']
-            )
-            
             # Create response
             test_data = memory_manager.get_test(test_id)
             time_limit = config.DEV_TIME_LIMIT if user_type == "dev" else config.NON_DEV_TIME_LIMIT
@@ -79,6 +65,18 @@ class TestService:
                 test_id, test_data, current_question, time_limit
             )
             
+            # Whole-test delivery: the client gets every question now and submits in batches
+            response.questions = [
+                {
+                    "question_number": q["question_number"],
+                    "total_questions": len(questions),
+                    "question_html": q["question_html"],
+                    "options": q.get("options"),
+                    "time_limit": time_limit
+                }
+                for q in questions
+            ] if delivery_mode == "full" else None
+            
             logger.info(f"✅ Test started: {test_id}")
             return response
             
@@ -97,7 +95,10 @@ class TestService:
                 "difficulty": q_data.get("difficulty", "Medium"),
                 "type": q_data.get("type", "General"),
                 "question": q_data["question"],
-                "options": q_data.get("options")
+                # Pre-rendered by the question bank; render here only for questions that bypassed it
+                "question_html": q_data.get("question_html") or render_question_html(q_data["question"]),
+                "options": q_data.get("options"),
+                "correct_option": q_data.get("correct_option")
             }
             standardized.append(question)
         
@@ -142,8 +143,13 @@ class TestService:
             if not success:
                 raise Exception("Failed to submit answer to memory")
             
+            # Grade locally when possible, otherwise queue for background LLM evaluation
+            self._grade_submitted_answer(test_id, test_data)
+            test_complete = memory_manager.is_test_complete(test_id)
+            self._schedule_evaluation(test_id, test_data, final=test_complete)
+            
             # Check if test complete
-            if memory_manager.is_test_complete(test_id):
+            if test_complete:
                 logger.info(f"🏁 Test completed: {test_id}")
                 return await self._complete_test(test_id, test_data)
             
@@ -152,12 +158,6 @@ class TestService:
             if not next_question:
                 raise Exception("Failed to get next question")
             
-            # Convert markdown to HTML
-            next_question["question_html"] = markdown.markdown(
-                next_question["question_html"],
-                extensions=['codehilite', 'fenced_code']
-            )
-            
             # Create response
             time_limit = config.DEV_TIME_LIMIT if test_data["user_type"] == "dev" else config.NON_DEV_TIME_LIMIT
             
@@ -170,6 +170,118 @@ class TestService:
             logger.error(f"❌ Answer submission failed: {e}")
             raise
     
+    async def submit_answers_batch(self, test_id: str, answers: List[Dict[str, Any]]):
+        """Submit a batch of answers (whole test or a checkpoint) for a test started in full delivery mode"""
+        logger.info(f"📦 Submitting {len(answers)} answers: {test_id}")
+        
+        try:
+            test_data = memory_manager.get_test(test_id)
+            if not test_data:
+                raise ValueError("Test not found or expired")
+            if test_data.get("delivery_mode") != "full":
+                raise ValueError("Batch submission requires a test started in full delivery mode")
+            if not answers:
+                raise ValueError("No answers submitted")
+            
+            # Validate the whole batch before recording any of it
+            numbers = []
+            for item in answers:
+                if not ValidationUtils.validate_question_number(item.get("question_number"), test_data["total_questions"]):
+                    raise ValueError(f"Invalid question number: {item.get('question_number')!r}")
+                numbers.append(int(item["question_number"]))
+            if len(set(numbers)) != len(numbers):
+                raise ValueError("Duplicate question numbers in batch")
+            
+            answers = sorted(answers, key=lambda a: int(a["question_number"]))
+            self._validate_batch_timing(test_id, test_data, answers)
+            expected = test_data["current_question"]
+            for item in answers:
+                question_number = int(item.get("question_number", 0))
+                if question_number != expected:
+                    raise ValueError(f"Expected answer for question {expected}, got {question_number}")
+                if not ValidationUtils.validate_question_number(question_number, test_data["total_questions"]):
+                    raise ValueError("Invalid question number")
+                if not ValidationUtils.validate_answer(str(item.get("answer", "")), test_data["user_type"]):
+                    raise ValueError(f"Invalid answer format for question {question_number}")
+                expected += 1
+            
+            for item in answers:
+                question_number = int(item["question_number"])
+                processed_answer = self._process_answer(str(item["answer"]), test_data["user_type"], test_id, question_number)
+                if not memory_manager.submit_answer(test_id, question_number, processed_answer,
+                                                    submitted_at=float(item["submitted_at"])):
+                    raise Exception("Failed to submit answer to memory")
+                self._grade_submitted_answer(test_id, test_data)
+            
+            test_complete = memory_manager.is_test_complete(test_id)
+            self._schedule_evaluation(test_id, test_data, final=test_complete)
+            
+            if test_complete:
+                logger.info(f"🏁 Test completed: {test_id}")
+                return await self._complete_test(test_id, test_data)
+            
+            logger.info(f"✅ Checkpoint saved: {test_id} up to Q{test_data['current_question'] - 1}")
+            return self._create_checkpoint_response(test_data, len(answers))
+            
+        except Exception as e:
+            logger.error(f"❌ Batch submission failed: {e}")
+            raise
+    
+    def _validate_batch_timing(self, test_id: str, test_data: Dict[str, Any], answers: List[Dict[str, Any]]):
+        """
+        Check the batch against the server clock, then the client timestamps.
+        
+        The batch itself must arrive within the cumulative time budget of its
+        last question; client timestamps can be backdated, so this bound is the
+        one that counts. Each answer's submitted_at is then sanity-checked: in
+        order, after the test started, not in the future, and within the
+        cumulative budget for its question (time saved on earlier questions
+        carries over).
+        """
+        now = time.time()
+        started_at = test_data["started_at"]
+        time_limit = config.DEV_TIME_LIMIT if test_data["user_type"] == "dev" else config.NON_DEV_TIME_LIMIT
+        skew = config.BATCH_CLOCK_SKEW_SECONDS
+        
+        last_question = max(int(item["question_number"]) for item in answers)
+        server_deadline = started_at + last_question * time_limit + config.BATCH_SUBMIT_GRACE_SECONDS + skew
+        if now > server_deadline:
+            raise ValueError(f"Batch received after the time limit for question {last_question}")
+        
+        # Earlier checkpoints already fixed the time of the last answered question
+        answered = memory_manager.get_test_answers(test_id)
+        previous = answered[-1]["submitted_at"] if answered else started_at
+        
+        for item in answers:
+            question_number = int(item["question_number"])
+            try:
+                submitted_at = float(item["submitted_at"])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"submitted_at is required for question {question_number}")
+            
+            if submitted_at < previous - skew:
+                raise ValueError(f"Submission time for question {question_number} is out of order")
+            if submitted_at > now + skew:
+                raise ValueError(f"Submission time for question {question_number} is in the future")
+            deadline = started_at + question_number * time_limit + config.BATCH_SUBMIT_GRACE_SECONDS
+            if submitted_at > deadline:
+                raise ValueError(f"Question {question_number} was answered after its time limit")
+            previous = submitted_at
+    
+    def _create_checkpoint_response(self, test_data: Dict[str, Any], accepted: int):
+        """Create response for a checkpoint batch that did not finish the test"""
+        class CheckpointResponse:
+            def __init__(self, **kwargs):
+                for k, v in kwargs.items():
+                    setattr(self, k, v)
+        
+        return CheckpointResponse(
+            test_completed=False,
+            accepted=accepted,
+            next_question_number=test_data["current_question"],
+            total_questions=test_data["total_questions"]
+        )
+    
     def _validate_submission(self, test_id: str, question_number: int, answer: str, test_data: Dict[str, Any]):
         """Validate answer submission"""
         if not ValidationUtils.validate_test_id(test_id):
@@ -228,8 +340,140 @@ class TestService:
             next_question=next_q
         )
     
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        return " ".join(re.sub(r'[^a-z0-9 ]+', ' ', (text or "").lower()).split())
+    
+    def _grade_locally(self, user_type: str, answer_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Deterministic grade for MCQs with an answer key and trivially empty dev answers; None if the LLM is needed"""
+        answer = (answer_data.get("answer") or "").strip()
+        
+        if user_type == "non_dev":
+            options = answer_data.get("options") or []
+            key = answer_data.get("correct_option")
+            if key is None or not (0 <= key < len(options)):
+                return None
+            correct_text = options[key]
+            if len(answer) == 1 and answer.upper() in "ABCD":
+                chosen = "ABCD".index(answer.upper())
+                correct = chosen == key
+            else:
+                correct = self._normalize_text(answer) == self._normalize_text(correct_text)
+            label = f"{'ABCD'[key]}) {correct_text}"
+            return {
+                "correct": correct,
+                "feedback": f"Correct. The answer is {label}." if correct else f"Incorrect. The correct answer is {label}."
+            }
+        
+        if not answer:
+            return {"correct": False, "feedback": "No answer was submitted."}
+        if len(answer) < config.DEV_MIN_ANSWER_CHARS:
+            return {"correct": False, "feedback": "The answer is too short to demonstrate a working solution."}
+        normalized_answer = self._normalize_text(answer)
+        normalized_question = self._normalize_text(answer_data.get("question", ""))
+        if normalized_answer and (
+            normalized_answer in normalized_question
+            or difflib.SequenceMatcher(None, normalized_answer, normalized_question).ratio() >= config.QUESTION_COPY_SIMILARITY
+        ):
+            return {"correct": False, "feedback": "The answer repeats the question instead of solving it."}
+        return None
+    
+    def _grade_submitted_answer(self, test_id: str, test_data: Dict[str, Any]):
+        """Record a local grade for the answer just submitted, or queue it for the LLM"""
+        answer_data = memory_manager.get_test_answers(test_id)[-1]
+        local = self._grade_locally(test_data["user_type"], answer_data)
+        if local is None:
+            test_data["evaluation_queue"].append(answer_data)
+            return
+        
+        test_data["evaluations"][answer_data["question_number"]] = local
+        if config.LLM_MCQ_FEEDBACK and test_data["user_type"] == "non_dev":
+            test_data["feedback_queue"].append(answer_data)
+    
+    def _schedule_evaluation(self, test_id: str, test_data: Dict[str, Any], final: bool = False):
+        """Dispatch queued answers in the background (a full batch, or the remainder on the last answer)"""
+        for queue_key, tasks_key, worker in (
+            ("evaluation_queue", "evaluation_tasks", self._evaluate_answers),
+            ("feedback_queue", "feedback_tasks", self._explain_answers),
+        ):
+            queue = test_data[queue_key]
+            if not queue or (len(queue) < config.EVALUATION_BATCH_SIZE and not final):
+                continue
+            batch = list(queue)
+            queue.clear()
+            test_data[tasks_key].append(asyncio.create_task(worker(test_data, batch)))
+            logger.info(f"🤖 {worker.__name__.strip('_')} Q{batch[0]['question_number']}-Q{batch[-1]['question_number']} "
+                        f"in background: {test_id}")
+    
+    async def _explain_answers(self, test_data: Dict[str, Any], answers: List[Dict[str, Any]]):
+        """Optional LLM narrative for locally graded answers; the local grade is kept"""
+        try:
+            qa_pairs = [
+                {
+                    "question": answer_data["question"],
+                    "answer": answer_data["answer"],
+                    "options": answer_data.get("options", [])
+                }
+                for answer_data in answers
+            ]
+            result = await self.ai_service.evaluate_test_batch(test_data["user_type"], qa_pairs)
+            for answer_data, feedback in zip(answers, result["feedbacks"]):
+                evaluation = test_data["evaluations"].get(answer_data["question_number"])
+                if evaluation and feedback:
+                    evaluation["feedback"] = feedback
+        except Exception as e:
+            logger.warning(f"⚠️ Narrative feedback failed for {len(answers)} answers: {e}")
+    
+    async def _evaluate_answers(self, test_data: Dict[str, Any], answers: List[Dict[str, Any]]) -> bool:
+        """Evaluate a batch of answers and record the results on the test record"""
+        try:
+            qa_pairs = [
+                {
+                    "question": answer_data["question"],
+                    "answer": answer_data["answer"],
+                    "options": answer_data.get("options", [])
+                }
+                for answer_data in answers
+            ]
+            result = await self.ai_service.evaluate_test_batch(test_data["user_type"], qa_pairs)
+            for answer_data, score, feedback in zip(answers, result["scores"], result["feedbacks"]):
+                test_data["evaluations"][answer_data["question_number"]] = {
+                    "correct": bool(score),
+                    "feedback": feedback
+                }
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️ Background evaluation failed for {len(answers)} answers: {e}")
+            return False
+    
+    def _build_evaluation_result(self, test_data: Dict[str, Any], answers: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate per-answer evaluations into the batch evaluation format"""
+        evaluations = test_data["evaluations"]
+        scores = [1 if evaluations[a["question_number"]]["correct"] else 0 for a in answers]
+        feedbacks = [evaluations[a["question_number"]]["feedback"] for a in answers]
+        total_correct = sum(scores)
+        
+        report_lines = [
+            f"SCORES: [{','.join(str(s) for s in scores)}]",
+            "",
+            f"Overall: {total_correct}/{len(answers)} correct "
+            f"({round(total_correct / len(answers) * 100, 1)}%)",
+            "",
+            "QUESTION FEEDBACK:"
+        ]
+        for answer_data, score, feedback in zip(answers, scores, feedbacks):
+            mark = "✅" if score else "❌"
+            report_lines.append(f"Q{answer_data['question_number']} {mark} {feedback}")
+        
+        return {
+            "scores": scores,
+            "feedbacks": feedbacks,
+            "total_correct": total_correct,
+            "evaluation_report": "\n".join(report_lines)
+        }
+    
     async def _complete_test(self, test_id: str, test_data: Dict[str, Any]):
-        """Complete test and generate evaluation using AI"""
+        """Complete test from the evaluations gathered while it ran"""
         logger.info(f"🎯 Completing test: {test_id}")
         
         try:
@@ -238,18 +482,21 @@ class TestService:
             if not answers:
                 raise Exception("No answers found")
             
-            # Prepare QA pairs for AI evaluation
-            qa_pairs = []
-            for answer_data in answers:
-                qa_pairs.append({
-                    "question": answer_data["question"],
-                    "answer": answer_data["answer"],
-                    "options": answer_data.get("options", [])
-                })
+            # Only the last batch is usually still running
+            await asyncio.gather(*test_data["evaluation_tasks"])
+            
+            # Narrative feedback is optional: use what is ready within a short wait
+            if test_data["feedback_tasks"]:
+                await asyncio.wait(test_data["feedback_tasks"], timeout=config.LLM_FEEDBACK_WAIT_SECONDS)
+            
+            # Re-evaluate anything a background batch failed on
+            missing = [a for a in answers if a["question_number"] not in test_data["evaluations"]]
+            if missing:
+                logger.info(f"🤖 Evaluating {len(missing)} remaining answers with AI")
+                if not await self._evaluate_answers(test_data, missing):
+                    raise Exception(f"Evaluation failed for {len(missing)} answers")
             
-            # Evaluate using AI
-            logger.info(f"🤖 Evaluating {len(qa_pairs)} answers with AI")
-            evaluation_result = self.ai_service.evaluate_test_batch(test_data["user_type"], qa_pairs)
+            evaluation_result = self._build_evaluation_result(test_data, answers)
             
             # Save results to database
             await self._save_test_results(test_id, test_data, evaluation_result, answers)
@@ -299,8 +546,8 @@ class TestService:
                 "answers": answers
             }
             
-            # Save to database
-            self.db_manager.save_test_results(test_id, save_data, evaluation_result)
+            # Journaled write-behind: returns once the result is durable locally
+            await self.db_manager.asave_test_results(test_id, save_data, evaluation_result)
             logger.info(f"💾 Results saved: {test_id}")
             
         except Exception as e:
@@ -324,29 +571,42 @@ class TestService:
             logger.error(f"❌ Failed to get results: {e}")
             raise
     
-    async def get_all_tests(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get all test results"""
+    async def get_all_tests(self, limit: int = 50,
+                            cursor: str = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get one page of test results; returns (results, next_cursor)"""
         try:
-            results = self.db_manager.get_all_test_results(limit)
-            return results
+            return self.db_manager.get_all_test_results(limit, cursor)
         except Exception as e:
             logger.error(f"❌ Failed to get all tests: {e}")
             raise
     
-    async def get_students(self) -> List[Dict[str, Any]]:
-        """Get student list"""
+    def export_tests_ndjson(self, student_id: str = None, cursor: str = None) -> Iterator[str]:
+        """Test results as NDJSON lines, read from MongoDB in batches"""
+        results = self.db_manager.iter_test_results(student_id, cursor)
+        
+        def lines():
+            count = 0
+            for result in results:
+                count += 1
+                yield json.dumps(result, default=str) + "\n"
+            logger.info(f"📤 Exported {count} test results")
+        
+        return lines()
+    
+    async def get_students(self, limit: int = None,
+                           cursor: str = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get student list; returns (students, next_cursor)"""
         try:
-            students = self.db_manager.get_student_list()
-            return students
+            return self.db_manager.get_student_list(limit, cursor)
         except Exception as e:
             logger.error(f"❌ Failed to get students: {e}")
             raise
     
-    async def get_student_tests(self, student_id: str) -> List[Dict[str, Any]]:
-        """Get tests for specific student"""
+    async def get_student_tests(self, student_id: str, limit: int = None,
+                                cursor: str = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Get tests for specific student; returns (tests, next_cursor)"""
         try:
-            tests = self.db_manager.get_student_tests(student_id)
-            return tests
+            return self.db_manager.get_student_tests(student_id, limit, cursor)
         except Exception as e:
             logger.error(f"❌ Failed to get student tests: {e}")
             raise
@@ -367,17 +627,19 @@ class TestService:
             logger.error(f"❌ Cleanup failed: {e}")
             raise
     
-    def health_check(self) -> Dict[str, Any]:
+    async def health_check(self) -> Dict[str, Any]:
         """Service health check"""
         try:
             stats = memory_manager.get_memory_stats()
-            ai_health = self.ai_service.health_check()
+            ai_health = await self.ai_service.health_check()
             
             return {
                 "status": "healthy",
                 "active_tests": stats["active_tests"],
                 "cached_questions": stats["cached_questions"],
                 "ai_service": ai_health["status"],
+                "question_bank": self.question_bank.get_stats(),
+                "mysql_pool": self.db_manager.get_pool_stats(),
                 "timestamp": DateTimeUtils.get_current_timestamp()
             }
         except Exception as e:
@@ -32,7 +32,7 @@ from core.database import DatabaseManager
 from core.ai_services import (
         wi_shared_clients as shared_clients, WI_InterviewSession as InterviewSession, WI_InterviewStage as InterviewStage,
         WI_EnhancedInterviewFragmentManager as EnhancedInterviewFragmentManager, WI_OptimizedAudioProcessor as OptimizedAudioProcessor,
-        WI_OptimizedConversationManager as OptimizedConversationManager,
+        WI_OptimizedConversationManager as OptimizedConversationManager, WI_RoundSummarizer as RoundSummarizer,
     )
 # ⬇️ Unified Chatterbox TTS
 from core.tts_processor import UnifiedTTSProcessor as UltraFastTTSProcessor
@@ -56,6 +56,7 @@ class UltraFastInterviewManager:
             encode=getattr(config, "TTS_STREAM_ENCODING", "wav"),
         )
         self.conversation_manager = OptimizedConversationManager(shared_clients)
+        self.round_summarizer = RoundSummarizer(shared_clients)
 
     async def create_session_fast(self, websocket: Optional[Any] = None) -> InterviewSession:
         session_id = str(uuid.uuid4())
@@ -64,12 +65,13 @@ class UltraFastInterviewManager:
             logger.info("Creating ultra-fast interview session: %s", session_id)
 
             student_info_task = asyncio.create_task(self.db_manager.get_student_info_fast())
-            summaries_task = asyncio.create_task(self.db_manager.get_recent_summaries_fast(
+            summaries_task = asyncio.create_task(self.db_manager.get_recent_summaries_snapshot(
                 days=config.RECENT_SUMMARIES_DAYS,
                 limit=config.SUMMARIES_LIMIT,
             ))
             student_id, first_name, last_name, session_key = await student_info_task
-            summaries = await summaries_task
+            summaries_snapshot = await summaries_task
+            summaries = summaries_snapshot.data
 
             if not summaries or len(summaries) == 0:
                 logger.warning("No recent summaries found - using fallback summaries")
@@ -98,7 +100,11 @@ class UltraFastInterviewManager:
             )
 
             fragment_manager = EnhancedInterviewFragmentManager(shared_clients, session_data)
-            if not fragment_manager.initialize_fragments(summaries):
+            # Fallback summaries are not part of the shared snapshot
+            initialized = (fragment_manager.initialize_from_snapshot(summaries_snapshot)
+                           if summaries is summaries_snapshot.data
+                           else fragment_manager.initialize_fragments(summaries))
+            if not initialized:
                 raise Exception("Failed to initialize fragments from 7-day summaries")
 
             session_data.fragment_manager = fragment_manager
@@ -148,6 +154,10 @@ class UltraFastInterviewManager:
 
             if session_data.exchanges:
                 session_data.update_last_response(transcript, quality)
+                closed_stage = session_data.exchanges[-1].stage
+                if closed_stage != session_data.current_stage:
+                    # Answer to a round's closing question: that round is now final
+                    self._on_round_closed(session_data, closed_stage)
 
             logger.info("Generating AI response for session %s", session_id)
             ai_response = await self.conversation_manager.generate_fast_response(session_data, transcript)
@@ -198,6 +208,17 @@ class UltraFastInterviewManager:
                     logger.info("Session %s interview completed", session_data.session_id)
                     asyncio.create_task(self._finalize_session_fast(session_data))
 
+    def _on_round_closed(self, session_data: InterviewSession, stage: InterviewStage):
+        """
+        One background call per finished round (the final round is handled at finalize):
+        scored rounds get a partial evaluation whose notes double as the round digest,
+        other rounds just a digest.
+        """
+        if stage.value in config.STAGE_SCORE_WEIGHTS:
+            self.conversation_manager.stage_evaluator.schedule(session_data, stage)
+        else:
+            self.round_summarizer.schedule(session_data, stage)
+
     def _get_next_stage(self, current_stage: InterviewStage) -> InterviewStage:
         order = {
             InterviewStage.TECHNICAL: InterviewStage.COMMUNICATION,
@@ -389,12 +410,16 @@ async def startup_event():
             conn = db_manager.get_mysql_connection()
             conn.close()
             logger.info("MySQL connection test successful")
+            students = await db_manager.student_directory.arefresh()
+            logger.info("Student directory loaded: %s students", students)
         except Exception as e:
             logger.error("MySQL connection test failed: %s", e)
             raise Exception(f"MySQL connection failed: {e}")
         try:
             await db_manager.get_mongo_client()
             logger.info("MongoDB connection test successful")
+            # Replays results a previous run journaled but never flushed
+            interview_manager.db_manager.start_result_journals()
         except Exception as e:
             logger.error("MongoDB connection test failed: %s", e)
             raise Exception(f"MongoDB connection failed: {e}")